@@ -182,6 +182,7 @@ TRANSLATIONS = {
     "Salvar como HTML": "حفظ بصيغة HTML",
     "Impressão": "طباعة",
     "Nenhum card para visualizar.": "لا توجد بطاقات لعرضها.",
+    "Card {}": "البطاقة {}",
     "Conteúdo copiado para a área de transferência!": "تم نسخ المحتوى إلى الحافظة!",
     "Salvar Arquivo HTML": "حفظ ملف HTML",
     "Arquivo HTML salvo em: {}": "تم حفظ ملف HTML في: {}",
@@ -200,4 +201,82 @@ TRANSLATIONS = {
     "beginner_instructions_line2": "<b>٢. افصل الوجه عن الظهر بفاصلة منقوطة ( ؛ ).</b>",
     "beginner_instructions_example_title": "مثال:",
     "beginner_instructions_example_text": "عاصمة المملكة العربية السعودية؛ الرياض",
+
+    # Importação de arquivo
+    "Importar Arquivo...": "استيراد ملف...",
+    "Importar Arquivo": "استيراد ملف",
+    "Importar arquivo": "استيراد ملف",
+    "Importa um arquivo de texto grande direto para o deck, sem carregá-lo no editor": "يستورد ملفًا نصيًا كبيرًا مباشرة إلى المجموعة دون تحميله في المحرر",
+    "Importando arquivo...": "جارٍ استيراد الملف...",
+    "Importando: {} cards - restante {}": "جارٍ الاستيراد: {} بطاقة - المتبقي {}",
+    "Erro ao importar o arquivo: {}": "خطأ أثناء استيراد الملف: {}",
+    "Importação cancelada. {} cards adicionados.": "تم إلغاء الاستيراد. أُضيفت {} بطاقة.",
+    "{} cards importados em {:.1f}s.": "تم استيراد {} بطاقة في {:.1f} ثانية.",
+
+    # Adicionar cards em lotes
+    "Adicionar Cards": "إضافة بطاقات",
+    "Adicionando cards...": "جارٍ إضافة البطاقات...",
+    "Adicionando cards... {}/{}": "جارٍ إضافة البطاقات... {}/{}",
+    "Erro ao adicionar cards: {}": "خطأ أثناء إضافة البطاقات: {}",
+    "Linhas não adicionadas (erro ao criar a nota): {}": "أسطر لم تُضَف (خطأ في إنشاء الملاحظة): {}",
+    "{} linha(s) do arquivo não importada(s) por erro ao criar a nota.": "لم يتم استيراد {} سطر من الملف بسبب خطأ في إنشاء الملاحظة.",
+    "Operação cancelada. {} cards adicionados.": "تم إلغاء العملية. أُضيفت {} بطاقة.",
+
+    # Operações em segundo plano
+    "Carregando cards do deck...": "جارٍ تحميل بطاقات المجموعة...",
+    "Calculando estatísticas...": "جارٍ حساب الإحصائيات...",
+    "Cancelar": "إلغاء",
+    "Cancelando...": "جارٍ الإلغاء...",
+    "Aguarde o fim da operação em andamento: {}": "يرجى انتظار انتهاء العملية الجارية: {}",
+    "Ocorreu um erro: {}": "حدث خطأ: {}",
+
+    # Duplicatas
+    "Verificando duplicatas...": "جارٍ التحقق من التكرارات...",
+    "Duplicatas encontradas": "تم العثور على تكرارات",
+    "{} linha(s) já existem neste deck (marcadas na numeração). O que deseja fazer?": "{} سطر/أسطر موجودة بالفعل في هذه المجموعة (مُعلَّمة في الترقيم). ماذا تريد أن تفعل؟",
+    "Pular duplicatas": "تخطي التكرارات",
+    "Adicionar mesmo assim": "إضافة على أي حال",
+    "Atualizar existentes": "تحديث الموجودة",
+    "{} cards adicionados e {} atualizados.": "أُضيفت {} بطاقة وحُدّثت {}.",
+
+    # Visualizador de cards
+    "Erro ao renderizar card {}:": "خطأ أثناء عرض البطاقة {}:",
+
+    # Exportação retomável
+    "Existe uma exportação interrompida destes cards ({} de {}). Deseja continuar de onde parou?": "يوجد تصدير متوقف لهذه البطاقات ({} من {}). هل تريد المتابعة من حيث توقف؟",
+    "Exportação interrompida. Ela pode ser continuada na próxima vez que você exportar estes cards.": "توقف التصدير. يمكن متابعته في المرة القادمة التي تصدّر فيها هذه البطاقات.",
+
+    # Exportação ZIP
+    "Exportar ZIP": "تصدير ZIP",
+    "Exportar cards para um ZIP com HTML, pasta de mídia e MathJax, para uso offline": "تصدير البطاقات إلى ملف ZIP يحتوي على HTML ومجلد الوسائط وMathJax للاستخدام دون اتصال",
+    "Copiando mídia...": "جارٍ نسخ الوسائط...",
+    "Exportação cancelada.": "تم إلغاء التصدير.",
+
+    # Paginação
+    "Página": "صفحة",
+    "de {}": "من {}",
+
+    # Ordenar por estatísticas de revisão
+    "Organizar os cards mostrados por uma estatística de revisão": "ترتيب البطاقات المعروضة حسب إحصائية مراجعة",
+    "Lapsos": "الإخفاقات",
+    "Revisões": "المراجعات",
+    "Intervalo": "الفاصل",
+    "Facilidade": "السهولة",
+    "Vencimento": "الاستحقاق",
+    "Última Revisão": "آخر مراجعة",
+
+    # Modo de edição
+    "Salvando edições...": "جارٍ حفظ التعديلات...",
+    "{} card(s) atualizado(s)!": "تم تحديث {} بطاقة!",
+    "Alterações pendentes: {}": "تغييرات معلقة: {}",
+    "{} nota(s) foram alteradas ou excluídas fora deste editor depois de mostradas e não foram sobrescritas (linhas: {}). Use 'Mostrar' novamente para carregar a versão atual.": "{} ملاحظة/ملاحظات عُدّلت أو حُذفت خارج هذا المحرر بعد عرضها ولم يُكتب فوقها (الأسطر: {}). استخدم 'إظهار' مرة أخرى لتحميل النسخة الحالية.",
+
+    # Índice de mídia
+    "Indexando mídia...": "جارٍ فهرسة الوسائط...",
+
+    # Cópia de mídia
+    "Copiando mídia ({}/{})...": "جارٍ نسخ الوسائط ({}/{})...",
+    "Não foi possível copiar: {}": "تعذّر النسخ: {}",
+    "[copiando {}: {}]": "[جارٍ نسخ {}: {}]",
+    "Ocorreu um erro ao copiar a mídia: {}": "حدث خطأ أثناء نسخ الوسائط: {}",
 }
\ No newline at end of file
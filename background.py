@@ -0,0 +1,128 @@
+# background.py
+#
+# Operações demoradas na coleção rodando em segundo plano (QueryOp do Anki
+# para leituras; alterações rodam pelo taskman, sem a janela de progresso
+# modal do CollectionOp). O progresso e o botão "Cancelar" ficam na barra de
+# status do diálogo, que continua responsivo, e só uma operação roda por vez.
+
+import logging
+import time
+from aqt import mw
+from aqt.operations import QueryOp, on_op_finished
+from aqt.utils import showInfo, showWarning
+
+PROGRESS_INTERVAL = 0.1  # segundos entre atualizações da barra de progresso
+
+
+class BackgroundTasks:
+    """
+    Executa uma operação por vez fora da thread principal.
+
+    A função `op(col)` roda em segundo plano e não deve tocar em widgets;
+    o resultado é entregue a `on_success` já na thread principal. Dentro de
+    `op`, use progress() para informar o andamento e want_cancel() para
+    interromper quando o usuário clicar em "Cancelar".
+    """
+
+    def __init__(self, parent, progress_bar, cancel_button, translator):
+        self.parent = parent
+        self.progress_bar = progress_bar
+        self.cancel_button = cancel_button
+        self._t = translator
+        self.current = None  # Nome da operação em andamento
+        self._cancel_requested = False
+        self._last_progress = 0.0
+        self.cancel_button.clicked.connect(self.cancel)
+        self._set_running(False)
+
+    @property
+    def busy(self):
+        return self.current is not None
+
+    def check_idle(self):
+        """Avisa e retorna False se já existe uma operação em andamento."""
+        if self.busy:
+            showInfo(self._t("Aguarde o fim da operação em andamento: {}").format(self.current))
+            return False
+        return True
+
+    def want_cancel(self):
+        return self._cancel_requested
+
+    def cancel(self):
+        self._cancel_requested = True
+        self.cancel_button.setEnabled(False)
+        self.progress_bar.setFormat(self._t("Cancelando..."))
+
+    def progress(self, value, maximum, label=None):
+        """Pode ser chamado da thread de fundo; as atualizações são espaçadas."""
+        now = time.monotonic()
+        if value < maximum and now - self._last_progress < PROGRESS_INTERVAL:
+            return
+        self._last_progress = now
+        mw.taskman.run_on_main(lambda: self._show_progress(value, maximum, label))
+
+    def _show_progress(self, value, maximum, label):
+        if not self.busy or self._cancel_requested:
+            return
+        self.progress_bar.setRange(0, max(1, maximum))
+        self.progress_bar.setValue(min(value, maximum))
+        self.progress_bar.setFormat(f"{label or self.current} %p%")
+
+    def _set_running(self, running):
+        self.progress_bar.setVisible(running)
+        self.cancel_button.setVisible(running)
+        self.cancel_button.setEnabled(running)
+
+    def _finish(self):
+        self.current = None
+        self._set_running(False)
+
+    def run(self, label, op, on_success, on_failure=None, mutates=False):
+        """
+        Inicia `op` em segundo plano. Com mutates=True, op deve retornar
+        OpChanges (cada op cria o próprio passo de desfazer) e, ao terminar,
+        o Anki atualiza as telas afetadas e o menu desfazer como num
+        CollectionOp; senão usa QueryOp. Retorna False se outra operação já
+        estiver rodando.
+        """
+        if not self.check_idle():
+            return False
+        self.current = label
+        self._cancel_requested = False
+        self._last_progress = 0.0
+        self.progress_bar.setRange(0, 0)  # Indeterminado até o primeiro progress()
+        self.progress_bar.setFormat(label)
+        self._set_running(True)
+
+        def success(result):
+            self._finish()
+            on_success(result)
+
+        def failure(error):
+            self._finish()
+            if on_failure:
+                on_failure(error)
+            else:
+                logging.error(f"Erro em '{label}': {error}")
+                showWarning(self._t("Ocorreu um erro: {}").format(str(error)))
+
+        if mutates:
+            # CollectionOp abriria a janela de progresso modal do Anki, que
+            # bloqueia a barra e o "Cancelar" do diálogo
+            mw._increase_background_ops()
+
+            def on_done(future):
+                mw._decrease_background_ops()
+                try:
+                    changes = future.result()
+                except Exception as error:
+                    failure(error)
+                    return
+                on_op_finished(mw, changes, self.parent)
+                success(changes)
+
+            mw.taskman.run_in_background(lambda: op(mw.col), on_done)
+        else:
+            QueryOp(parent=self.parent, op=op, success=success).failure(failure).run_in_background()
+        return True
@@ -0,0 +1,110 @@
+# benchmark.py
+#
+# Mede a vazão das partes do add-on que não dependem do Anki.
+# Uso: python benchmark.py [numero_de_linhas]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from tokenizer import DelimiterTokenizer
+
+
+def legacy_split(line_text, delimiter=';'):
+    """Cópia do antigo CustomDialog._get_split_parts (caractere por caractere)."""
+    if delimiter not in line_text:
+        return [line_text]
+    parts = []
+    current_part = ""
+    tag_level = 0
+    for char in line_text:
+        if char == '<':
+            tag_level += 1
+        if char == delimiter and tag_level == 0:
+            parts.append(current_part.strip())
+            current_part = ""
+        else:
+            current_part += char
+        if char == '>':
+            tag_level = max(0, tag_level - 1)
+    parts.append(current_part.strip())
+    return parts
+
+
+TEMPLATES = [
+    "{a} {b} {d} {c}",
+    '<span style="color:red;">{a}</span> {b} {d} <b>{c}</b>',
+    '{a} <img src="img{n}.png"> {d} {b} {c}',
+    '<div style="font-size:12px; color:blue;">{a} {b}</div> {d} {{{{c1::{c}}}}}',
+]
+# '<' e '>' soltos, sem fechamento ou aninhados
+STRAY_TEMPLATES = [
+    '{a} {d} x > 0 {d} x < 1',
+    '{a} < {b} {d} {c}',
+    '{a} {d} {b} > {c} <',
+    '<<b>{a}>{d}{b} {d} {c}',
+]
+
+
+def make_corpus(num_lines, delimiter=';', seed=42, templates=TEMPLATES):
+    rng = random.Random(seed)
+    words = ["casa", "gato", "livro", "capital", "Brasil", "Brasília", "verbo", "memória"]
+    lines = []
+    for n in range(num_lines):
+        template = rng.choice(templates)
+        lines.append(template.format(a=rng.choice(words), b=rng.choice(words),
+                                     c=rng.choice(words), d=delimiter, n=n))
+    return lines
+
+
+def make_fuzz_corpus(num_lines, seed=7):
+    """Linhas aleatórias com '<', '>' e ';' em qualquer posição."""
+    rng = random.Random(seed)
+    alphabet = "ab <>;;\"="
+    return ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 24))) for _ in range(num_lines)]
+
+
+def check_equivalence(tokenizer, lines):
+    for line in lines:
+        assert tokenizer.split(line) == legacy_split(line), line
+        if tokenizer.has_delimiter(line):  # sem delimitador, split devolve a linha sem aparar
+            assert [line[a:b].strip() for a, b in tokenizer.spans(line)] == legacy_split(line), line
+
+
+def run(label, func, lines):
+    start = time.perf_counter()
+    for line in lines:
+        func(line)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:8.3f}s  {len(lines) / elapsed:12,.0f} linhas/s")
+    return elapsed
+
+
+def main():
+    num_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"Corpus: {num_lines:,} linhas")
+
+    lines = make_corpus(num_lines)
+    tokenizer = DelimiterTokenizer([';'])
+    stray_lines = make_corpus(num_lines, templates=STRAY_TEMPLATES)
+    check_equivalence(tokenizer, lines)
+    check_equivalence(tokenizer, stray_lines)
+    check_equivalence(tokenizer, make_fuzz_corpus(num_lines))
+    print("Equivalência com o parser antigo: ok")
+    base = run("legado (caractere a caractere)", legacy_split, lines)
+    new = run("DelimiterTokenizer.split ';'", tokenizer.split, lines)
+    run("DelimiterTokenizer.spans ';'", tokenizer.spans, lines)
+    print(f"{'ganho':<40} {base / new:8.1f}x")
+    run("legado ('<'/'>' soltos)", legacy_split, stray_lines)
+    run("DelimiterTokenizer.split ('<'/'>' soltos)", tokenizer.split, stray_lines)
+
+    multi_lines = make_corpus(num_lines, delimiter=' :: ')
+    multi = DelimiterTokenizer([' :: ', '->', '|'])
+    run("DelimiterTokenizer.split ' :: ', '->', '|'", multi.split, multi_lines)
+
+
+if __name__ == '__main__':
+    main()
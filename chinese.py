@@ -182,6 +182,7 @@ TRANSLATIONS = {
     "Salvar como HTML": "另存为HTML",
     "Impressão": "打印",
     "Nenhum card para visualizar.": "没有可供查看的卡片。",
+    "Card {}": "卡片 {}",
     "Conteúdo copiado para a área de transferência!": "内容已复制到剪贴板！",
     "Salvar Arquivo HTML": "保存HTML文件",
     "Arquivo HTML salvo em: {}": "HTML文件已保存至: {}",
@@ -200,4 +201,82 @@ TRANSLATIONS = {
     "beginner_instructions_line2": "<b>2. 使用分号 ( ; ) 分隔正面和背面。</b>",
     "beginner_instructions_example_title": "例如:",
     "beginner_instructions_example_text": "中国首都 ; 北京",
+
+    # Importação de arquivo
+    "Importar Arquivo...": "导入文件...",
+    "Importar Arquivo": "导入文件",
+    "Importar arquivo": "导入文件",
+    "Importa um arquivo de texto grande direto para o deck, sem carregá-lo no editor": "将大型文本文件直接导入牌组，而不加载到编辑器中",
+    "Importando arquivo...": "正在导入文件...",
+    "Importando: {} cards - restante {}": "正在导入：{} 张卡片 - 剩余 {}",
+    "Erro ao importar o arquivo: {}": "导入文件时出错：{}",
+    "Importação cancelada. {} cards adicionados.": "导入已取消。已添加 {} 张卡片。",
+    "{} cards importados em {:.1f}s.": "已导入 {} 张卡片，用时 {:.1f} 秒。",
+
+    # Adicionar cards em lotes
+    "Adicionar Cards": "添加卡片",
+    "Adicionando cards...": "正在添加卡片...",
+    "Adicionando cards... {}/{}": "正在添加卡片... {}/{}",
+    "Erro ao adicionar cards: {}": "添加卡片时出错：{}",
+    "Linhas não adicionadas (erro ao criar a nota): {}": "未添加的行（创建笔记时出错）：{}",
+    "{} linha(s) do arquivo não importada(s) por erro ao criar a nota.": "文件中有 {} 行因创建笔记出错而未导入。",
+    "Operação cancelada. {} cards adicionados.": "操作已取消。已添加 {} 张卡片。",
+
+    # Operações em segundo plano
+    "Carregando cards do deck...": "正在加载牌组卡片...",
+    "Calculando estatísticas...": "正在计算统计...",
+    "Cancelar": "取消",
+    "Cancelando...": "正在取消...",
+    "Aguarde o fim da operação em andamento: {}": "请等待当前操作完成：{}",
+    "Ocorreu um erro: {}": "发生错误：{}",
+
+    # Duplicatas
+    "Verificando duplicatas...": "正在检查重复...",
+    "Duplicatas encontradas": "发现重复",
+    "{} linha(s) já existem neste deck (marcadas na numeração). O que deseja fazer?": "{} 行已存在于此牌组中（已在行号中标记）。您想怎么做？",
+    "Pular duplicatas": "跳过重复",
+    "Adicionar mesmo assim": "仍然添加",
+    "Atualizar existentes": "更新现有",
+    "{} cards adicionados e {} atualizados.": "已添加 {} 张卡片，更新 {} 张。",
+
+    # Visualizador de cards
+    "Erro ao renderizar card {}:": "渲染卡片 {} 时出错：",
+
+    # Exportação retomável
+    "Existe uma exportação interrompida destes cards ({} de {}). Deseja continuar de onde parou?": "这些卡片有一次中断的导出（{} / {}）。要从中断处继续吗？",
+    "Exportação interrompida. Ela pode ser continuada na próxima vez que você exportar estes cards.": "导出已中断。下次导出这些卡片时可以继续。",
+
+    # Exportação ZIP
+    "Exportar ZIP": "导出 ZIP",
+    "Exportar cards para um ZIP com HTML, pasta de mídia e MathJax, para uso offline": "将卡片导出为包含 HTML、媒体文件夹和 MathJax 的 ZIP，供离线使用",
+    "Copiando mídia...": "正在复制媒体...",
+    "Exportação cancelada.": "导出已取消。",
+
+    # Paginação
+    "Página": "页",
+    "de {}": "共 {}",
+
+    # Ordenar por estatísticas de revisão
+    "Organizar os cards mostrados por uma estatística de revisão": "按复习统计对显示的卡片排序",
+    "Lapsos": "遗忘次数",
+    "Revisões": "复习次数",
+    "Intervalo": "间隔",
+    "Facilidade": "难易度",
+    "Vencimento": "到期",
+    "Última Revisão": "上次复习",
+
+    # Modo de edição
+    "Salvando edições...": "正在保存编辑...",
+    "{} card(s) atualizado(s)!": "已更新 {} 张卡片！",
+    "Alterações pendentes: {}": "待保存的更改：{}",
+    "{} nota(s) foram alteradas ou excluídas fora deste editor depois de mostradas e não foram sobrescritas (linhas: {}). Use 'Mostrar' novamente para carregar a versão atual.": "{} 条笔记在显示后于此编辑器外被修改或删除，未被覆盖（行：{}）。请再次使用“显示”加载当前版本。",
+
+    # Índice de mídia
+    "Indexando mídia...": "正在索引媒体...",
+
+    # Cópia de mídia
+    "Copiando mídia ({}/{})...": "正在复制媒体 ({}/{})...",
+    "Não foi possível copiar: {}": "无法复制：{}",
+    "[copiando {}: {}]": "[正在复制 {}：{}]",
+    "Ocorreu um erro ao copiar a mídia: {}": "复制媒体时出错：{}",
 }
\ No newline at end of file
@@ -0,0 +1,128 @@
+# cli.py
+#
+# Conversor de linha de comando: transforma um arquivo de texto delimitado
+# em um TSV importável pelo Anki, sem abrir o Anki.
+#
+# Exemplo:
+#   python cli.py cards.txt cards.tsv --delimiter ";" --fields Frente,Verso \
+#       --notetype Básico --tags-file etiquetas.txt --workers 8
+
+import argparse
+import csv
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, zip_longest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core import DelimitadoresConfig, process_chunk
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Converte um arquivo delimitado em TSV para importação no Anki.")
+    parser.add_argument("input", help="arquivo de entrada, um card por linha")
+    parser.add_argument("output", help="arquivo TSV de saída ('-' para a saída padrão)")
+    parser.add_argument("-d", "--delimiter", action="append", dest="delimiters",
+                        help="delimitador (pode repetir; padrão ';'). Use '\\t' para tab.")
+    parser.add_argument("--fields", default="Front,Back",
+                        help="campos do tipo de nota, separados por vírgula (padrão: Front,Back)")
+    parser.add_argument("--map", action="append", default=[], metavar="PARTE=CAMPO",
+                        help="mapeia a parte N (a partir de 0) para um campo; pode repetir")
+    parser.add_argument("--notetype", default="Basic", help="tipo de nota das linhas comuns")
+    parser.add_argument("--cloze-notetype", default="Cloze", help="tipo de nota das linhas com cloze")
+    parser.add_argument("--no-cloze", action="store_true", help="não detectar linhas com cloze")
+    parser.add_argument("--tags-file", help="arquivo com as etiquetas, uma linha por card")
+    parser.add_argument("--number-tags", action="store_true", help="acrescenta o número da linha às etiquetas")
+    parser.add_argument("--encoding", default="utf-8")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    return parser.parse_args(argv)
+
+
+def build_config(args):
+    delimiters = [d.replace('\\t', '\t') for d in (args.delimiters or [';'])]
+    field_mappings = {}
+    for item in args.map:
+        part, _, field_name = item.partition('=')
+        if not part.isdigit() or not field_name:
+            raise SystemExit(f"Mapeamento inválido: '{item}' (use PARTE=CAMPO)")
+        field_mappings[part] = field_name
+    return DelimitadoresConfig(
+        delimiters=delimiters,
+        field_mappings=field_mappings,
+        field_names=[f.strip() for f in args.fields.split(',') if f.strip()],
+        detect_cloze=not args.no_cloze,
+        number_tags=args.number_tags,
+    )
+
+
+def iter_chunks(input_file, tags_file, chunk_size):
+    """Lê a entrada em lotes de (índice, linha, etiquetas) sem carregar o arquivo inteiro."""
+    tag_lines = tags_file if tags_file is not None else ()
+    rows = ((index, line.rstrip('\r\n'), (tags or '').rstrip('\r\n'))
+            for index, (line, tags) in enumerate(zip_longest(input_file, tag_lines))
+            if line is not None)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def convert(args):
+    config = build_config(args)
+    num_columns = max(len(config.field_names), config.cloze_field_count)
+    tags_column = num_columns + 2  # 1 = tipo de nota, depois os campos
+
+    input_file = open(args.input, 'r', encoding=args.encoding, errors='replace')
+    tags_file = open(args.tags_file, 'r', encoding=args.encoding, errors='replace') if args.tags_file else None
+    output_file = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8', newline='')
+    written = 0
+    try:
+        output_file.write("#separator:tab\n#html:true\n#notetype column:1\n")
+        output_file.write(f"#tags column:{tags_column}\n")
+        writer = csv.writer(output_file, delimiter='\t', lineterminator='\n')
+
+        def write_results(results):
+            nonlocal written
+            for _, fields, tags, is_cloze in results:
+                notetype = args.cloze_notetype if is_cloze else args.notetype
+                row = [notetype] + fields + [""] * (num_columns - len(fields)) + [" ".join(tags)]
+                writer.writerow(row)
+            written += len(results)
+
+        chunks = iter_chunks(input_file, tags_file, args.chunk_size)
+        if args.workers <= 1:
+            for chunk in chunks:
+                write_results(process_chunk(config, chunk))
+        else:
+            # Mantém poucos lotes em andamento para a memória ficar limitada,
+            # e escreve os resultados na ordem original do arquivo.
+            max_in_flight = args.workers * 2
+            pending = deque()
+            with ProcessPoolExecutor(max_workers=args.workers) as pool:
+                for chunk in chunks:
+                    pending.append(pool.submit(process_chunk, config, chunk))
+                    if len(pending) >= max_in_flight:
+                        write_results(pending.popleft().result())
+                while pending:
+                    write_results(pending.popleft().result())
+    finally:
+        input_file.close()
+        if tags_file is not None:
+            tags_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+    return written
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    written = convert(args)
+    print(f"{written} cards convertidos.", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+# core.py
+#
+# Lógica de conversão de linhas em notas, sem dependência do Anki ou do Qt.
+# Usada pelo diálogo, pela importação de arquivos e pelo conversor de linha
+# de comando (cli.py).
+
+import html
+import re
+from dataclasses import dataclass, field
+
+try:
+    from .tokenizer import DelimiterTokenizer
+except ImportError:  # Executado fora do pacote do add-on (ex.: python cli.py)
+    from tokenizer import DelimiterTokenizer
+
+CLOZE_PATTERN = re.compile(r'{{c\d+::.*?}}')
+SOUND_PATTERN = re.compile(r'\[sound:([^\]]+)\]')
+IMG_ALT_PATTERN = re.compile(r'(<img[^>]*)alt="[^"]*"([^>]*>)')
+
+
+@dataclass
+class DelimitadoresConfig:
+    """Configuração de conversão, equivalente às opções do diálogo."""
+    delimiters: list = field(default_factory=lambda: [';'])
+    # Mapeamento "índice da parte" -> nome do campo, como em CustomDialog.field_mappings
+    field_mappings: dict = field(default_factory=dict)
+    # Campos do tipo de nota padrão, na ordem do modelo
+    field_names: list = field(default_factory=lambda: ['Front', 'Back'])
+    # Linhas com {{c1::...}} vão para o tipo Cloze (campos Texto e Extra)
+    detect_cloze: bool = True
+    cloze_field_count: int = 2
+    # Modo das etiquetas: acrescenta o número da linha a cada etiqueta ("Numerar Tags")
+    number_tags: bool = False
+
+    def make_tokenizer(self):
+        return DelimiterTokenizer(self.delimiters)
+
+
+def is_cloze_line(line: str) -> bool:
+    return CLOZE_PATTERN.search(line) is not None
+
+
+class CompiledMapper:
+    """
+    Converte uma linha (ou suas partes) na lista de valores dos campos da
+    nota em uma única passada. O destino de cada parte é resolvido uma vez
+    na construção, em vez de um field_names.index() por parte.
+
+    Sem mapeamento, a parte N vai para o campo N; com mapeamento, cada parte
+    vai para o campo escolhido e as partes sem campo são ignoradas.
+    """
+
+    def __init__(self, field_names, field_mappings, tokenizer=None):
+        self.field_names = list(field_names)
+        self.num_fields = len(self.field_names)
+        self.tokenizer = tokenizer
+        self.mapped = bool(field_mappings)
+        # targets[i] = índice do campo que recebe a parte i (None = ignorar)
+        self.targets = []
+        if self.mapped:
+            positions = {name: idx for idx, name in enumerate(self.field_names)}
+            max_part = max((int(k) for k in field_mappings if str(k).isdigit()), default=-1)
+            self.targets = [positions.get(field_mappings.get(str(i))) for i in range(max_part + 1)]
+
+    def map_parts(self, parts) -> list[str]:
+        fields = [""] * self.num_fields
+        if not self.mapped:
+            for idx, field_content in enumerate(parts[:self.num_fields]):
+                fields[idx] = field_content.strip()
+        else:
+            for field_idx, field_content in zip(self.targets, parts):
+                if field_idx is not None:
+                    fields[field_idx] = field_content.strip()
+        return fields
+
+    def map_line(self, line) -> list[str]:
+        return self.map_parts(self.tokenizer.split(line))
+
+
+_mapper_cache = {}
+_MAPPER_CACHE_SIZE = 32
+
+
+def get_compiled_mapper(model, field_mappings, delimiters) -> CompiledMapper:
+    """
+    Mapeador compilado para um tipo de nota (dict do modelo), reaproveitado
+    enquanto o modelo (id e data de modificação), o mapeamento e os
+    delimitadores não mudarem.
+    """
+    key = (
+        model.get('id'), model.get('mod'),
+        tuple(sorted((str(k), v) for k, v in (field_mappings or {}).items())),
+        tuple(delimiters or ()),
+    )
+    mapper = _mapper_cache.get(key)
+    if mapper is None:
+        if len(_mapper_cache) >= _MAPPER_CACHE_SIZE:
+            _mapper_cache.pop(next(iter(_mapper_cache)))
+        field_names = [f['name'] for f in model['flds']]
+        mapper = CompiledMapper(field_names, field_mappings, DelimiterTokenizer(delimiters))
+        _mapper_cache[key] = mapper
+    return mapper
+
+
+def map_parts_to_fields(parts, field_names, field_mappings) -> list[str]:
+    """Atalho para mapear uma única linha sem guardar o mapeador."""
+    return CompiledMapper(field_names, field_mappings).map_parts(parts)
+
+
+def map_cloze_parts(parts, field_count=2) -> list[str]:
+    """Texto com o cloze no primeiro campo e a segunda parte no campo Extra."""
+    fields = [""] * field_count
+    fields[0] = parts[0]
+    if len(parts) > 1 and parts[1] and field_count > 1:
+        fields[1] = parts[1]
+    return fields
+
+
+def field_to_line_text(value) -> str:
+    """
+    Campo de uma nota como texto de uma linha do editor: entidades HTML
+    decodificadas, [sound:x] como <audio>, sem alt nas imagens e sem
+    quebras de linha nem espaços repetidos. Cada passo só roda quando o
+    campo tem o que ele procura.
+    """
+    if '&' in value:
+        value = html.unescape(value)
+    if '[sound:' in value:
+        value = SOUND_PATTERN.sub(r'<audio controls=""><source src="\1" type="audio/mpeg"></audio>', value)
+    if 'alt="' in value:
+        value = IMG_ALT_PATTERN.sub(r'\1\2', value)
+    # split() sem argumento já trata \n, NBSP e espaços repetidos
+    return ' '.join(value.split())
+
+
+def tags_for_line(tag_line, line_index, number_tags=False) -> list[str]:
+    """Etiquetas de uma linha de 'Etiquetas' (separadas por vírgula)."""
+    if not tag_line:
+        return []
+    tags = [tag.strip() for tag in tag_line.split(',') if tag.strip()]
+    if number_tags:
+        return [f"{tag}{line_index + 1}" for tag in tags]
+    return tags
+
+
+class ParsedLine:
+    """Uma linha já convertida: campos da nota, etiquetas e se é cloze."""
+    __slots__ = ('index', 'fields', 'tags', 'is_cloze')
+
+    def __init__(self, index, fields, tags, is_cloze):
+        self.index = index
+        self.fields = fields
+        self.tags = tags
+        self.is_cloze = is_cloze
+
+
+class LineProcessor:
+    """Converte linhas de texto em ParsedLine segundo uma DelimitadoresConfig."""
+
+    def __init__(self, config: DelimitadoresConfig, tokenizer=None):
+        self.config = config
+        self.tokenizer = tokenizer or config.make_tokenizer()
+        self.mapper = CompiledMapper(config.field_names, config.field_mappings, self.tokenizer)
+
+    def process(self, line, index, tag_line=None):
+        """Retorna None quando a linha não gera card (vazia ou sem delimitador)."""
+        line = line.strip()
+        if not line or not self.tokenizer.has_delimiter(line):
+            return None
+        config = self.config
+        parts = self.tokenizer.split(line)
+        is_cloze = config.detect_cloze and is_cloze_line(line)
+        if is_cloze:
+            fields = map_cloze_parts(parts, config.cloze_field_count)
+        else:
+            fields = self.mapper.map_parts(parts)
+        return ParsedLine(index, fields, tags_for_line(tag_line, index, config.number_tags), is_cloze)
+
+
+def process_chunk(config, chunk):
+    """
+    Processa um lote de (índice, linha, linha_de_etiquetas). Fica no nível
+    do módulo para poder ser enviado a um pool de processos.
+    """
+    processor = LineProcessor(config)
+    results = []
+    for index, line, tag_line in chunk:
+        parsed = processor.process(line, index, tag_line)
+        if parsed is not None:
+            results.append((parsed.index, parsed.fields, parsed.tags, parsed.is_cloze))
+    return results
@@ -0,0 +1,49 @@
+# deck_notes.py
+#
+# Leitura das notas de um deck para o botão "Mostrar". Uma única consulta
+# SQL traz id, tipo de nota, campos e etiquetas de todas as notas, em vez de
+# um get_note() e um models.get() por nota; os nomes e a quantidade de
+# campos de cada tipo de nota são consultados uma vez só.
+
+from anki.utils import ids2str, split_fields
+from .core import field_to_line_text
+
+PROGRESS_EVERY = 1000  # notas entre atualizações de progresso e cancelamento
+
+
+def read_deck_lines(col, deck_id, delimiter, on_progress=None, should_cancel=None):
+    """
+    Linhas do editor para as notas do deck e seus subdecks (incluindo cards
+    que estão num deck filtrado), na ordem em que foram criadas. Retorna
+    [(id_da_nota, linha, etiquetas, nome_do_tipo_de_nota, mod)], sem as notas
+    com todos os campos vazios, ou None se cancelado.
+    """
+    dids = ids2str(col.decks.deck_and_child_ids(deck_id))
+    rows = col.db.all(
+        "select id, mid, flds, tags, mod from notes where id in "
+        f"(select nid from cards where did in {dids} or odid in {dids}) order by id"
+    )
+
+    separator = f" {delimiter} "
+    note_types = {}  # mid -> (nome, quantidade de campos)
+    lines = []
+    total = len(rows)
+    for n, (nid, mid, flds, tags, mod) in enumerate(rows):
+        if n % PROGRESS_EVERY == 0:
+            if should_cancel and should_cancel():
+                return None
+            if on_progress:
+                on_progress(n, total)
+        note_type = note_types.get(mid)
+        if note_type is None:
+            model = col.models.get(mid)
+            note_type = note_types[mid] = (model['name'], len(model['flds']))
+        name, field_count = note_type
+        values = split_fields(flds)[:field_count]
+        values += [""] * (field_count - len(values))
+        card_line = separator.join([field_to_line_text(value) for value in values])
+        if card_line.strip():
+            lines.append((nid, card_line, tags.strip(), name, mod))
+    if on_progress:
+        on_progress(total, total)
+    return lines
@@ -10,15 +10,33 @@ import urllib.parse
 import base64
 import logging
 import random
+import time
+import threading
 from datetime import datetime
 from PyQt6.QtCore import QTimer
-from aqt import mw, gui_hooks
+from aqt import mw
 from aqt.qt import *
-from aqt.utils import showInfo, showWarning
+from aqt.utils import showInfo, showWarning, openFolder
 from aqt.webview import AnkiWebView
+from anki.collection import OpChanges
 from anki.utils import strip_html, pointVersion
 from aqt.theme import theme_manager
 from .highlighter import HtmlTagHighlighter
+from .tokenizer import DelimiterTokenizer
+from .parse_cache import LineParseCache
+from .editor_pipeline import EditorPipeline, EditRange
+from .core import DelimitadoresConfig, get_compiled_mapper, is_cloze_line, map_cloze_parts, tags_for_line
+from .importfile import FileImporter
+from .preview_page import PreviewPage
+from .render_cache import render_cache
+from .background import BackgroundTasks
+from .note_batch import add_notes_in_batches, make_request
+from .duplicates import find_duplicates
+from .deck_notes import read_deck_lines
+from .note_stats import note_stats_cache, SORT_KEYS, GUTTER_SAMPLE
+from .edit_journal import EditJournal, align_lines
+from .media_index import media_index
+from .media_ingest import media_store, media_tag, expand_media_paths, TARGET_EDITOR, TARGET_CELL, TARGET_FIELD
 from .media_manager import MediaManagerDialog
 from .visualizar import VisualizarCards
 from .utils import CONFIG_FILE
@@ -46,6 +64,15 @@ logging.basicConfig(filename="delimitadores.log", level=logging.DEBUG)
 addon_path = os.path.dirname(__file__)
 icons_path = os.path.join(addon_path, 'icons')
 
+# Pré-renderização da pré-visualização: linhas acima/abaixo do cursor e
+# tempo sem edição antes de começar
+PREFETCH_RADIUS = 2
+PREFETCH_IDLE_MS = 300
+# Notas por página ao "Mostrar" um deck
+SHOW_PAGE_SIZE = 2000
+# Tempo sem edição antes de gravar as alterações do modo de edição
+EDIT_IDLE_MS = 750
+
 PT_TRANSLATIONS = {
     "instructions_button": "Instruções",
     "instructions_title": "Instruções (Modo Iniciante)",
@@ -89,8 +116,13 @@ class LineNumberArea(QWidget):
         super().__init__(editor)
         self.editor = editor
         self.line_numbers = []
+        self.markers = set()  # Linhas destacadas (ex.: duplicatas encontradas ao adicionar)
         self.setStyleSheet("background-color: #ffffff; color: #555;")
 
+    def set_markers(self, block_numbers):
+        self.markers = set(block_numbers)
+        self.update()
+
     def sizeHint(self):
         return QSize(self.editor.line_number_area_width(), 0)
 
@@ -109,6 +141,8 @@ class LineNumberArea(QWidget):
         block_number = first_visible_block_number
         while block.isValid() and top <= event.rect().bottom():
             if block.isVisible():
+                if block_number in self.markers:
+                    painter.fillRect(0, int(top), self.width(), line_height, QColor("#ffd8a8"))
                 if block_number < len(self.line_numbers) and self.line_numbers[block_number]:
                     painter.setPen(QColor("#555"))
                     painter.drawText(
@@ -141,6 +175,8 @@ class CustomDialog(QDialog):
         self.initial_tags_set = False
         self.initial_numbering_set = False
         self.media_files = []
+        self._media_placeholder_seq = 0 # Marcadores das cópias de mídia em andamento
+        self._pending_media_copies = 0 # Marcadores ainda no texto (suspendem diário e salvamento)
         self.current_line = 0
         self.previous_text = ""
         self.pre_show_state_file = os.path.join(os.path.dirname(CONFIG_FILE), "pre_show_state.json")
@@ -154,16 +190,26 @@ class CustomDialog(QDialog):
         self.card_notetypes = []
         self.real_text = ""
         self.last_preview_html = ""
-        self.card_creation_info = [] # Para armazenar info dos cards mostrados (id, texto, tags)
+        self.card_creation_info = [] # Para armazenar info dos cards mostrados (id, texto, tags), de todas as páginas
         self.current_view_mode = 'simple' # 'simple', 'date', 'stats'
+        self.shown_stats = {} # id da nota -> NoteStats, para a visualização 'stats'
+        self.shown_page = 0 # Página de card_creation_info exibida no editor
+        self._shown_range = (0, 0) # Intervalo [início, fim) dessa página em card_creation_info
+        self._page_starts = [0] # Início de cada página em card_creation_info (mudam quando linhas entram ou saem)
         self.is_beginner_mode = False 
         self.tags_visible_before_beginner_mode = False 
         self.is_first_show = True
+        self._tokenizer = DelimiterTokenizer()
+        self._card_line_numbers = []
+        self._card_count = 0
 
 
         # --- ATRIBUTOS PARA EDIÇÃO EM TEMPO REAL ---
         self.edit_mode = False
         self.shown_note_ids = []
+        self.edit_journal = None # Alterações do modo de edição ainda não gravadas
+        self.shown_deck_id = None # Deck das notas mostradas (recebe as linhas inseridas no modo de edição)
+        self._tags_edited = False
         self.edit_timer = QTimer(self)
         self.edit_timer.setSingleShot(True)
         self.edit_timer.timeout.connect(self._apply_real_time_edit)
@@ -172,6 +218,8 @@ class CustomDialog(QDialog):
         self.load_settings()
         self.retranslate_ui() # Aplica o idioma carregado
         self.setWindowState(Qt.WindowState.WindowMaximized)
+        # Índice de mídia pronto antes de alguém excluir um deck
+        media_index.warm_up()
 
     def _t(self, key):
         """Função auxiliar para obter a tradução."""
@@ -258,7 +306,40 @@ class CustomDialog(QDialog):
         self.card_count_label = QLabel(self._t("Cards: {}").format(0), self)
         self.card_count_label.setStyleSheet("color: gray;")
         status_layout.addWidget(self.card_count_label)
+
+        # Paginação do "Mostrar": só aparece quando o deck tem mais de uma página
+        self.page_widget = QWidget(self)
+        page_layout = QHBoxLayout(self.page_widget)
+        page_layout.setContentsMargins(10, 0, 0, 0)
+        self.prev_page_button = QPushButton("◀", self)
+        self.prev_page_button.setFixedWidth(30)
+        self.prev_page_button.clicked.connect(lambda: self.go_to_page(self.shown_page - 1))
+        page_layout.addWidget(self.prev_page_button)
+        self.page_label = QLabel(self._t("Página"), self)
+        page_layout.addWidget(self.page_label)
+        self.page_spin = QSpinBox(self)
+        self.page_spin.setMinimum(1)
+        self.page_spin.setKeyboardTracking(False)
+        self.page_spin.valueChanged.connect(lambda value: self.go_to_page(value - 1))
+        page_layout.addWidget(self.page_spin)
+        self.page_count_label = QLabel(self)
+        page_layout.addWidget(self.page_count_label)
+        self.next_page_button = QPushButton("▶", self)
+        self.next_page_button.setFixedWidth(30)
+        self.next_page_button.clicked.connect(lambda: self.go_to_page(self.shown_page + 1))
+        page_layout.addWidget(self.next_page_button)
+        self.page_widget.setVisible(False)
+        status_layout.addWidget(self.page_widget)
         status_layout.addStretch()
+
+        # Progresso das operações em segundo plano (Mostrar, Adicionar, Exportar...)
+        self.task_progress_bar = QProgressBar(self)
+        self.task_progress_bar.setMaximumWidth(300)
+        self.task_progress_bar.setTextVisible(True)
+        status_layout.addWidget(self.task_progress_bar)
+        self.task_cancel_button = QPushButton(self._t("Cancelar"), self)
+        status_layout.addWidget(self.task_cancel_button)
+        self.tasks = BackgroundTasks(self, self.task_progress_bar, self.task_cancel_button, self._t)
         top_layout.addLayout(status_layout)
         
         self.fields_splitter = QSplitter(Qt.Orientation.Horizontal)
@@ -282,31 +363,20 @@ class CustomDialog(QDialog):
         self.txt_entrada.setPlaceholderText(self._t("Digite seus cards aqui..."))
         
         self.highlighter = HtmlTagHighlighter(self.txt_entrada.document())
+        self.parse_cache = LineParseCache(self.txt_entrada.document(), self._tokenizer)
         
         self.txt_entrada.line_number_area = LineNumberArea(self.txt_entrada)
         self.txt_entrada.line_number_area_width = self.line_number_area_width
-        self.txt_entrada.textChanged.connect(self.update_line_number_area_width)
         self.txt_entrada.verticalScrollBar().valueChanged.connect(lambda: self.txt_entrada.line_number_area.update())
         self.txt_entrada.cursorPositionChanged.connect(self.highlight_current_line)
         self.txt_entrada.resizeEvent = lambda event: self.custom_resize_event(event)
-        self.txt_entrada.textChanged.connect(self.schedule_save)
-        self.txt_entrada.textChanged.connect(self.update_tags_lines)
-        self.txt_entrada.textChanged.connect(self.update_preview)
-        self.txt_entrada.textChanged.connect(self.update_card_count)
-        self.txt_entrada.textChanged.connect(self.update_line_numbers)
-        self.txt_entrada.textChanged.connect(self.clear_creation_info_on_edit)
+        self._setup_editor_pipeline()
         self.txt_entrada.cursorPositionChanged.connect(self.check_line_change)
         self.txt_entrada.installEventFilter(self)
         self.txt_entrada.setLineWrapMode(QTextEdit.LineWrapMode.WidgetWidth)
         self.txt_entrada.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.txt_entrada.setAcceptDrops(True)
         self.txt_entrada.dropEvent = self.drop_event
-
-        self.txt_entrada.textChanged.connect(self.schedule_real_time_edit)
-        self.txt_entrada.textChanged.connect(self._check_for_state_reset)
-        # <<< INÍCIO DA MODIFICAÇÃO PRINCIPAL >>>
-        self.txt_entrada.textChanged.connect(self._force_semicolon_on_cloze_lines)
-        # <<< FIM DA MODIFICAÇÃO PRINCIPAL >>>
        
         self.stacked_editor.addWidget(self.txt_entrada)
 
@@ -333,7 +403,7 @@ class CustomDialog(QDialog):
         self.txt_tags.textChanged.connect(self.schedule_save)
         self.txt_tags.textChanged.connect(self.update_preview)
         self.txt_tags.installEventFilter(self)
-        self.txt_tags.textChanged.connect(self.schedule_real_time_edit) 
+        self.txt_tags.textChanged.connect(self._on_tags_edited)
 
         etiquetas_layout.addWidget(self.txt_tags)
         self.etiquetas_group.setVisible(False)
@@ -371,6 +441,16 @@ class CustomDialog(QDialog):
         settings.setAttribute(QWebEngineSettings.WebAttribute.PlaybackRequiresUserGesture, False)
         self.preview_widget.setMinimumWidth(0)
         preview_layout.addWidget(self.preview_widget)
+        self.preview_page = PreviewPage(self.preview_widget, self, self._get_reviewer_scripts())
+        # Várias mudanças seguidas (texto, cursor, etiquetas) viram uma única
+        # atualização; a espera cresce com o tempo de renderização do modelo.
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.timeout.connect(self._render_preview)
+        self._prefetch_lines = []
+        self.preview_prefetch_timer = QTimer(self)
+        self.preview_prefetch_timer.setSingleShot(True)
+        self.preview_prefetch_timer.timeout.connect(self._prefetch_next_preview)
         
         self.fields_splitter.addWidget(self.preview_group)
         self.fields_splitter.setSizes([700, 300])
@@ -454,6 +534,16 @@ class CustomDialog(QDialog):
         self.export_html_button.clicked.connect(self.export_to_html)
         self.export_html_button.setToolTip(self._t("Exportar cards para arquivo HTML"))
         cards_media_row2_layout.addWidget(self.export_html_button)
+
+        self.export_zip_button = QPushButton(self._t("Exportar ZIP"), self)
+        self.export_zip_button.clicked.connect(self.export_to_zip)
+        self.export_zip_button.setToolTip(self._t("Exportar cards para um ZIP com HTML, pasta de mídia e MathJax, para uso offline"))
+        cards_media_row2_layout.addWidget(self.export_zip_button)
+
+        self.import_file_button = QPushButton(self._t("Importar Arquivo..."), self)
+        self.import_file_button.clicked.connect(self.import_file)
+        self.import_file_button.setToolTip(self._t("Importa um arquivo de texto grande direto para o deck, sem carregá-lo no editor"))
+        cards_media_row2_layout.addWidget(self.import_file_button)
         cards_media_layout.addLayout(cards_media_row2_layout)
         self.tool_tabs.addTab(cards_media_tab, self._t("Cards e Mídia"))
 
@@ -551,6 +641,13 @@ class CustomDialog(QDialog):
             sort_layout.addWidget(btn)
             self.botoes_organizacao_widgets[texto] = btn
             if texto == "Mais Errados": self.mais_errados_button = btn
+        # Outras estatísticas de revisão (clicar de novo inverte a ordem)
+        self.stat_sort_combo = QComboBox(self)
+        self.stat_sort_combo.setToolTip(self._t("Organizar os cards mostrados por uma estatística de revisão"))
+        for key, label in SORT_KEYS:
+            self.stat_sort_combo.addItem(self._t(label), key)
+        self.stat_sort_combo.activated.connect(lambda index: self.sort_cards_by_stat(self.stat_sort_combo.itemData(index)))
+        sort_layout.addWidget(self.stat_sort_combo)
         organize_actions_layout.addLayout(sort_layout)
 
         general_actions_layout = QHBoxLayout()
@@ -677,6 +774,7 @@ class CustomDialog(QDialog):
         for i, (nome, simbolo) in enumerate(delimitadores):
             chk = QCheckBox(self._t(nome))
             chk.simbolo = simbolo
+            chk.stateChanged.connect(self._rebuild_tokenizer)
             chk.stateChanged.connect(self.update_preview)
             chk.stateChanged.connect(self.schedule_save)
             grid.addWidget(chk, i // 4, i % 4)
@@ -729,7 +827,8 @@ class CustomDialog(QDialog):
             ("Ctrl+B", "apply_bold"), ("Ctrl+I", "apply_italic"), ("Ctrl+U", "apply_underline"),
             ("Ctrl+M", "destaque_texto"), ("Ctrl+P", "search_text"), ("Ctrl+Shift+R", "replace_text"),
             ("Ctrl+=", "zoom_in"), ("Ctrl+-", "zoom_out"), ("Ctrl+Shift+D", "add_cloze_1"),
-            ("Ctrl+Shift+F", "add_cloze_2"), ("Ctrl+R", "add_cards"), ("Ctrl+Z", "restore_pre_show_state"), ("Ctrl+Y", "redo")
+            ("Ctrl+Shift+F", "add_cloze_2"), ("Ctrl+R", "add_cards"), ("Ctrl+Z", "restore_pre_show_state"), ("Ctrl+Y", "redo"),
+            ("Ctrl+S", "commit_edits")
         ]:
             QShortcut(QKeySequence(key), self).activated.connect(lambda f=func: self.log_shortcut(f))
         
@@ -738,53 +837,81 @@ class CustomDialog(QDialog):
         self.txt_entrada.setAcceptDrops(True)
         self.txt_entrada.focusInEvent = self.create_focus_handler(self.txt_entrada, "cards")
         self.txt_tags.focusInEvent = self.create_focus_handler(self.txt_tags, "tags")
-        self.txt_entrada.textChanged.connect(self.update_line_numbers)
         
         # Aplica o tema inicial
         self.toggle_theme()
         self.toggle_theme()
 
-    # <<< INÍCIO DA NOVA FUNÇÃO >>>
-    def _force_semicolon_on_cloze_lines(self):
+    def _setup_editor_pipeline(self):
         """
-        Verifica o texto em tempo real e força a adição de um ponto e vírgula
-        no final das linhas que contêm a sintaxe de cloze.
+        Todas as atualizações derivadas do texto de 'Digite seus cards' passam
+        por um único despachante, que roda os estágios em ordem apenas sobre
+        as linhas alteradas.
         """
-        # Armazena a posição original do cursor para restaurá-la depois
-        cursor = self.txt_entrada.textCursor()
-        original_pos = cursor.position()
+        self.editor_pipeline = EditorPipeline(self.txt_entrada, self)
+        self._last_block_count = self.txt_entrada.document().blockCount()
+        stages = [
+            ("cloze", self._force_semicolon_on_cloze_lines),
+            ("reset", lambda change: self._check_for_state_reset()),
+            ("creation_info", self._sync_creation_info),
+            ("duplicates", lambda change: self._clear_duplicate_markers()),
+            ("tags", self._sync_tags_lines),
+            ("line_numbers", lambda change: self.update_line_numbers(0 if change.full else change.first_block)),
+            ("card_count", lambda change: self._update_card_count_label()),
+            ("preview", self._update_preview_for_change),
+            ("real_time_edit", self._journal_edits),
+            ("save", lambda change: self.schedule_save()),
+        ]
+        for name, callback in stages:
+            self.editor_pipeline.add_stage(name, callback)
 
-        full_text = self.txt_entrada.toPlainText()
-        lines = full_text.split('\n')
-        new_lines = []
-        text_was_modified = False
-
-        for line in lines:
-            # Verifica se a linha contém um padrão cloze
-            if re.search(r'{{c\d+::.*?}}', line):
-                # Verifica se a linha (ignorando espaços em branco no final) já termina com ;
-                if not line.rstrip().endswith(';'):
-                    new_lines.append(line + ';')
-                    text_was_modified = True
-                else:
-                    new_lines.append(line)
-            else:
-                new_lines.append(line)
+    def _sync_tags_lines(self, change):
+        block_count = self.txt_entrada.document().blockCount()
+        if change.full or block_count != self._last_block_count:
+            self._last_block_count = block_count
+            self.update_tags_lines()
 
-        # Apenas atualiza o texto se uma alteração foi realmente feita
-        # Isso evita um loop infinito de sinais textChanged
-        if text_was_modified:
-            updated_text = '\n'.join(new_lines)
-            
-            # Bloqueia os sinais para evitar que esta função seja chamada novamente ao definir o texto
-            self.txt_entrada.blockSignals(True)
-            self.txt_entrada.setPlainText(updated_text)
+    def _update_preview_for_change(self, change):
+        if change.contains(self.txt_entrada.textCursor().blockNumber()):
+            self.update_preview()
+
+    def _force_semicolon_on_cloze_lines(self, change):
+        """
+        Força a adição de um ponto e vírgula no final das linhas alteradas
+        que contêm a sintaxe de cloze.
+        """
+        lines_to_fix = []
+        for block in change.blocks(self.txt_entrada.document()):
+            data = self.parse_cache.get(block)
+            if data.is_cloze and not block.text().rstrip().endswith(';'):
+                lines_to_fix.append(block)
+
+        if not lines_to_fix:
+            return
+
+        # Edita só os blocos necessários, juntando ao último passo de desfazer
+        # do usuário, com os sinais bloqueados para não reentrar no despachante.
+        # O cursor do editor volta para onde estava (antes do ';' inserido).
+        original_pos = self.txt_entrada.textCursor().position()
+        shift = 0
+        self.txt_entrada.blockSignals(True)
+        try:
+            cursor = QTextCursor(self.txt_entrada.document())
+            cursor.joinPreviousEditBlock()
+            for block in lines_to_fix:
+                insert_pos = block.position() + block.length() - 1
+                if insert_pos < original_pos + shift:
+                    shift += 1
+                cursor.setPosition(insert_pos)
+                cursor.insertText(';')
+            cursor.endEditBlock()
+        finally:
             self.txt_entrada.blockSignals(False)
-            
-            # Restaura a posição do cursor para não interromper a digitação do usuário
-            cursor.setPosition(original_pos)
-            self.txt_entrada.setTextCursor(cursor)
-    # <<< FIM DA NOVA FUNÇÃO >>>
+        editor_cursor = self.txt_entrada.textCursor()
+        editor_cursor.setPosition(original_pos + shift)
+        self.txt_entrada.setTextCursor(editor_cursor)
+        self.txt_entrada.line_number_area.update()
+
 
     def toggle_beginner_mode(self):
         """Alterna a visibilidade da interface entre o modo completo e o iniciante."""
@@ -888,7 +1015,7 @@ class CustomDialog(QDialog):
                     self.field_images = dados.get('field_images', {})
                     self.last_preview_html = dados.get('last_preview_html', '')
                     if self.last_preview_html:
-                        self.preview_widget.setHtml(self.last_preview_html)
+                        self.preview_page.show_message(self.last_preview_html, self.is_dark_theme)
                     self.update_field_mappings()
                     self.update_line_numbers()
                     self.update_card_count()
@@ -908,6 +1035,9 @@ class CustomDialog(QDialog):
         self.setWindowTitle(self._t("Adicionar Cards com Delimitadores"))
         self.lang_label.setText(self._t("Idioma:"))
         self.save_status_label.setText(self._t("Pronto"))
+        self.task_cancel_button.setText(self._t("Cancelar"))
+        self.page_label.setText(self._t("Página"))
+        self._update_pager()
         self.update_card_count()
         
         # Aba 1: Cards e Mídia
@@ -916,6 +1046,10 @@ class CustomDialog(QDialog):
         self.manage_media_button.setText(self._t("Gerenciar Mídia"))
         self.export_html_button.setText(self._t("Exportar para HTML"))
         self.export_html_button.setToolTip(self._t("Exportar cards para arquivo HTML"))
+        self.export_zip_button.setText(self._t("Exportar ZIP"))
+        self.export_zip_button.setToolTip(self._t("Exportar cards para um ZIP com HTML, pasta de mídia e MathJax, para uso offline"))
+        self.import_file_button.setText(self._t("Importar Arquivo..."))
+        self.import_file_button.setToolTip(self._t("Importa um arquivo de texto grande direto para o deck, sem carregá-lo no editor"))
         self.view_cards_button.setText(self._t("Visualizar Cards"))
         self.show_button.setText(self._t("Mostrar"))
         self.show_button.setToolTip(self._t("Mostra todos os cards do deck em 'Digite seus cards'"))
@@ -946,6 +1080,9 @@ class CustomDialog(QDialog):
             btn.setText(self._t(texto))
         for texto, btn in self.botoes_acoes_widgets.items():
             btn.setText(self._t(texto))
+        self.stat_sort_combo.setToolTip(self._t("Organizar os cards mostrados por uma estatística de revisão"))
+        for index, (_, label) in enumerate(SORT_KEYS):
+            self.stat_sort_combo.setItemText(index, self._t(label))
         if hasattr(self, 'lapses_sort_descending') and not self.lapses_sort_descending:
             self.mais_errados_button.setText(self._t("Mais Certos"))
             self.mais_errados_button.setToolTip(self._t("Organizar por cards mais certos (com menos lapsos)"))
@@ -1037,63 +1174,196 @@ class CustomDialog(QDialog):
             getattr(self, func_name)()
 
     def schedule_save(self):
+        if self._pending_media_copies:
+            return  # Salva quando os marcadores de cópia de mídia saírem do texto
         self.save_status_label.setText(self._t("Salvando..."))
         self.save_status_label.setStyleSheet("color: orange;")
         self.save_timer.start(500)
 
     def update_card_count(self):
-        text = self.txt_entrada.toPlainText()
-        lines = text.splitlines()
-        
-        active_delimiters = [chk.simbolo for chk in self.chk_delimitadores.values() if chk.isChecked()]
-        if not active_delimiters:
-            active_delimiters = [';']
-        
-        card_count = 0
-        for line in lines:
-            line = line.strip()
-            if line and any(d in line for d in active_delimiters):
-                card_count += 1
-        
-        self.card_count_label.setText(self._t("Cards: {}").format(card_count))
+        self._card_count = sum(1 for _, data in self.parse_cache.iter_blocks() if data.is_card)
+        self._update_card_count_label()
 
-    def clear_creation_info_on_edit(self):
-        if self.card_creation_info:
-            self.card_creation_info = []
-            self.current_view_mode = 'simple'
+    def _update_card_count_label(self):
+        self.card_count_label.setText(self._t("Cards: {}").format(self._card_count))
 
-    def update_line_numbers(self):
-        if self.card_creation_info:
+    def _sync_creation_info(self, change):
+        """
+        Leva as linhas editadas da página para card_creation_info. Se linhas
+        foram inseridas ou removidas, no modo de edição a página é realinhada
+        às notas; fora dele, a página não corresponde mais às notas e a lista
+        é descartada.
+        """
+        if not self.card_creation_info:
             return
-
+        start, end = self._page_bounds()
         document = self.txt_entrada.document()
-        block = document.firstBlock()
-        line_numbers = []
+        if document.blockCount() != end - start:
+            if self.edit_mode and self.edit_journal is not None:
+                self._realign_page()
+            else:
+                self.clear_creation_info()
+                self.shown_note_ids = []
+            return
+        for block in change.blocks(document):
+            self.card_creation_info[start + block.blockNumber()][1] = block.text()
+
+    def _realign_page(self):
+        """
+        Alinha as linhas da página às notas mostradas depois de inserções ou
+        remoções: linhas mantidas ou movidas continuam com o id da nota,
+        linhas novas recebem um id provisório (nota nova ao gravar) e as
+        notas cujas linhas sumiram ficam marcadas para exclusão. Uma linha
+        nova igual à de uma nota removida (recortar e colar, desfazer)
+        recupera essa nota em vez de criar outra.
+        """
+        start, end = self._page_bounds()
+        old_entries = self.card_creation_info[start:end]
+        new_lines = self.txt_entrada.toPlainText().split('\n')
+        old_tags = self.txt_tags.toPlainText().split('\n')
+        old_tags += [""] * (len(old_entries) - len(old_tags))
+
+        alignment = align_lines([entry[1] for entry in old_entries], new_lines)
+        kept = {old_index for old_index in alignment if old_index is not None}
+        # Remove antes de inserir, para que uma linha movida entre páginas ou
+        # restaurada pelo desfazer encontre a nota de origem
+        for old_index, entry in enumerate(old_entries):
+            if old_index not in kept:
+                self.edit_journal.remove(entry[0], entry[1], old_tags[old_index].strip())
+        new_entries = []
+        for line, old_index in zip(new_lines, alignment):
+            if old_index is None:
+                nid, tags = self.edit_journal.reclaim(line) or (self.edit_journal.new_id(), "")
+            else:
+                nid, tags = old_entries[old_index][0], old_tags[old_index].strip()
+            new_entries.append([nid, line, tags])
+            if old_index is None or line != old_entries[old_index][1]:
+                self.edit_journal.record(nid, line, tags)
+
+        self.card_creation_info[start:end] = new_entries
+        self._shown_range = (start, start + len(new_entries))
+        # As páginas seguintes começam mais cedo ou mais tarde na lista
+        delta = len(new_entries) - len(old_entries)
+        for page in range(self.shown_page + 1, len(self._page_starts)):
+            self._page_starts[page] += delta
+        self.shown_note_ids = [entry[0] for entry in new_entries]
+        # As etiquetas acompanham as linhas inseridas, removidas ou movidas
+        self.txt_tags.blockSignals(True)
+        self.txt_tags.setPlainText('\n'.join(entry[2] for entry in new_entries))
+        self.txt_tags.blockSignals(False)
+        self._update_shown_gutter()
+        self._update_pager()
+
+    def clear_creation_info(self):
+        self.card_creation_info = []
+        self.current_view_mode = 'simple'
+        self.shown_page = 0
+        self._shown_range = (0, 0)
+        self._reset_pages()
+        self._update_pager()
+
+    def _reset_pages(self):
+        """Divide card_creation_info em páginas de SHOW_PAGE_SIZE linhas (depois de trocá-la ou reordená-la)."""
+        self._page_starts = list(range(0, len(self.card_creation_info), SHOW_PAGE_SIZE)) or [0]
+
+    def _page_count(self):
+        return len(self._page_starts)
+
+    def _page_range(self, page):
+        """Intervalo [início, fim) da página `page` em card_creation_info."""
+        start = self._page_starts[page]
+        end = self._page_starts[page + 1] if page + 1 < len(self._page_starts) else len(self.card_creation_info)
+        return start, end
+
+    def _page_bounds(self):
+        """Intervalo [início, fim) de card_creation_info exibido no editor."""
+        return self._shown_range
+
+    def _update_pager(self):
+        page_count = self._page_count()
+        self.page_widget.setVisible(page_count > 1)
+        self.page_spin.blockSignals(True)
+        self.page_spin.setMaximum(page_count)
+        self.page_spin.setValue(self.shown_page + 1)
+        self.page_spin.blockSignals(False)
+        self.page_count_label.setText(self._t("de {}").format(page_count))
+        self.prev_page_button.setEnabled(self.shown_page > 0)
+        self.next_page_button.setEnabled(self.shown_page < page_count - 1)
+
+    def _store_current_page(self):
+        """Grava as linhas e etiquetas da página do editor em card_creation_info."""
+        # Aplica alterações ainda pendentes (estágios do editor e edição em tempo real)
+        self.editor_pipeline.flush()
+        if self.edit_timer.isActive():
+            self.edit_timer.stop()
+            self._apply_real_time_edit()
+        if not self.card_creation_info:
+            return
+        start, end = self._page_bounds()
+        card_lines = self.txt_entrada.toPlainText().split('\n')
+        if len(card_lines) != end - start:
+            return
+        tag_lines = self.txt_tags.toPlainText().split('\n')
+        for offset, line in enumerate(card_lines):
+            entry = self.card_creation_info[start + offset]
+            entry[1] = line
+            entry[2] = tag_lines[offset].strip() if offset < len(tag_lines) else ""
+
+    def go_to_page(self, page):
+        if not self.card_creation_info:
+            return
+        page = max(0, min(page, self._page_count() - 1))
+        if page == self.shown_page:
+            self._update_pager()
+            return
+        self._store_current_page()
+        if not self.card_creation_info:
+            return
+        self._repopulate_ui_from_creation_info(page)
+        self.previous_text = self.txt_entrada.toPlainText()
+        self.update_card_count()
+        self.update_preview()
+
+    def update_line_numbers(self, first_block=0):
+        """
+        Renumera as linhas a partir de first_block; o prefixo anterior é
+        reaproveitado, pois uma edição não altera a numeração acima dela.
+        Também mantém a contagem de cards usada no rótulo de status.
+        """
+        numbers = self._card_line_numbers
+        first_block = min(first_block, len(numbers))
         valid_line_count = 0
-        
-        active_delimiters = [chk.simbolo for chk in self.chk_delimitadores.values() if chk.isChecked()]
-        if not active_delimiters:
-            active_delimiters = [';']
+        for value in reversed(numbers[:first_block]):
+            if value:
+                valid_line_count = int(value)
+                break
 
+        line_numbers = numbers[:first_block]
+        block = self.txt_entrada.document().findBlockByNumber(first_block)
         while block.isValid():
-            text = block.text().strip()
-            if text and any(d in text for d in active_delimiters):
+            if self.parse_cache.get(block).is_card:
                 valid_line_count += 1
                 line_numbers.append(str(valid_line_count))
             else:
                 line_numbers.append("")
             block = block.next()
-            
+
+        self._card_line_numbers = line_numbers
+        self._card_count = valid_line_count
+        if self.card_creation_info:
+            return
+
         self.txt_entrada.line_number_area.line_numbers = line_numbers
         self.txt_entrada.line_number_area.update()
         self.update_line_number_area_width()
 
     def line_number_area_width(self):
         if self.card_creation_info:
+            digits = '9' * max(3, len(str(self._page_bounds()[1])))
             if self.current_view_mode == 'date':
-                return self.txt_entrada.fontMetrics().horizontalAdvance('999 (9999-99-99)') + 10
+                return self.txt_entrada.fontMetrics().horizontalAdvance(f'{digits} (9999-99-99)') + 10
             elif self.current_view_mode == 'stats':
-                return self.txt_entrada.fontMetrics().horizontalAdvance('999 (E:99 R:999)') + 10
+                return self.txt_entrada.fontMetrics().horizontalAdvance(f'{digits} ({GUTTER_SAMPLE})') + 10
 
         max_num = 0
         for num_str in self.txt_entrada.line_number_area.line_numbers:
@@ -1129,6 +1399,8 @@ class CustomDialog(QDialog):
         self.txt_entrada.setExtraSelections(extra_selections)
 
     def _save_in_real_time(self):
+        if self._pending_media_copies:
+            return
         try:
             if os.path.exists(CONFIG_FILE):
                 shutil.copy2(CONFIG_FILE, CONFIG_FILE + ".bak")
@@ -1189,7 +1461,6 @@ class CustomDialog(QDialog):
             self.txt_tags.setPlainText(self.txt_tags.toPlainText() + '\n' * (len(linhas_cards) - len(linhas_tags)))
         elif len(linhas_tags) > len(linhas_cards):
             self.txt_tags.setPlainText('\n'.join(linhas_tags[:len(linhas_cards)]))
-        self.update_preview()
 
     def check_line_change(self):
         cursor = self.txt_entrada.textCursor()
@@ -1207,7 +1478,7 @@ class CustomDialog(QDialog):
     def process_media_rename(self):
         current_text = self.txt_entrada.toPlainText()
         if self.previous_text != current_text:
-            patterns = [r'<img src="([^"]+)"', r'<source src="([^"]+)"', r'<video src="([^"]+)"']
+            patterns = [r'<img src="([^"]+)"', r'<source src="([^"]+)"', r'<video src="([^"]+)"', r'\[sound:([^\]]+)\]']
             previous_media = set()
             current_media = set()
             for pattern in patterns:
@@ -1285,20 +1556,9 @@ class CustomDialog(QDialog):
         arquivos, _ = QFileDialog.getOpenFileNames(self, self._t("Selecionar Mídia para {}").format(campo), "", "Mídia (*.png *.jpg *.jpeg *.gif *.mp3 *.wav *.ogg *.mp4 *.webm)")
         if not arquivos:
             return
-        media_dir = mw.col.media.dir()
         current_line = self.txt_entrada.textCursor().blockNumber()
         linhas = self.txt_entrada.toPlainText().strip().split('\n')
-        for caminho in arquivos:
-            nome = os.path.basename(caminho)
-            destino = os.path.join(media_dir, nome)
-            if os.path.exists(destino):
-                base, ext = os.path.splitext(nome)
-                counter = 1
-                while os.path.exists(destino):
-                    nome = f"{base}_{counter}{ext}"
-                    destino = os.path.join(media_dir, nome)
-                    counter += 1
-            shutil.copy2(caminho, destino)
+        for nome, tag, _ in media_store.add_files(mw.col, arquivos, TARGET_FIELD):
             if campo not in self.field_images:
                 self.field_images[campo] = []
             while len(self.field_images[campo]) <= current_line:
@@ -1309,11 +1569,11 @@ class CustomDialog(QDialog):
                 partes = [p.strip() for p in partes]
                 if all(str(i) not in self.field_mappings for i in range(len(partes))):
                     if idx < len(partes):
-                        partes[idx] += f' <img src="{nome}">' if partes[idx] else f'<img src="{nome}">'
+                        partes[idx] += f' {tag}' if partes[idx] else tag
                 else:
                     for i, parte in enumerate(partes):
                         if str(i) in self.field_mappings and self.field_mappings[str(i)] == campo:
-                            partes[i] += f' <img src="{nome}">' if parte else f'<img src="{nome}">'
+                            partes[i] += f' {tag}' if parte else tag
                 active_delimiter = next((chk.simbolo for chk in self.chk_delimitadores.values() if chk.isChecked()), ';')
                 linhas[current_line] = active_delimiter.join(partes)
                 self.txt_entrada.setPlainText('\n'.join(linhas))
@@ -1372,36 +1632,35 @@ class CustomDialog(QDialog):
             return cleaned_text
         return text
 
-    def _get_split_parts(self, line_text: str) -> list[str]:
-        active_delimiters = [chk.simbolo for chk in self.chk_delimitadores.values() if chk.isChecked()]
-        delimiter = active_delimiters[0] if active_delimiters else ';'
-
-        if delimiter not in line_text:
-            return [line_text]
+    def _active_delimiters(self) -> list[str]:
+        return [chk.simbolo for chk in self.chk_delimitadores.values() if chk.isChecked()]
+
+    def _rebuild_tokenizer(self):
+        """Recompila o tokenizador quando os delimitadores marcados mudam."""
+        self._tokenizer = DelimiterTokenizer(self._active_delimiters())
+        self.parse_cache.set_tokenizer(self._tokenizer)
+        self.update_line_numbers()
+
+    def _core_config(self, model=None) -> DelimitadoresConfig:
+        """Configuração de conversão (core.py) a partir do estado atual do diálogo."""
+        if model is None and self.lista_notetypes.currentItem():
+            model = mw.col.models.by_name(self.lista_notetypes.currentItem().text())
+        return DelimitadoresConfig(
+            delimiters=self._active_delimiters() or [';'],
+            field_mappings=dict(self.field_mappings),
+            field_names=[f['name'] for f in model['flds']] if model else [],
+            number_tags=self.chk_num_tags.isChecked(),
+        )
 
-        parts = []
-        current_part = ""
-        tag_level = 0
-        
-        for char in line_text:
-            if char == '<':
-                tag_level += 1
-            
-            if char == delimiter and tag_level == 0:
-                parts.append(current_part.strip())
-                current_part = ""
-            else:
-                current_part += char
+    def _get_split_parts(self, line_text: str) -> list[str]:
+        return self._tokenizer.split(line_text)
 
-            if char == '>':
-                tag_level = max(0, tag_level - 1)
-        
-        parts.append(current_part.strip())
-        
-        return parts
+    def _get_mapper(self, model):
+        """Mapeador linha -> campos do modelo, compartilhado por todas as telas."""
+        return get_compiled_mapper(model, self.field_mappings, self._tokenizer.delimiters)
 
     def _check_for_state_reset(self):
-        if self.shown_note_ids and not self.txt_entrada.toPlainText():
+        if self.shown_note_ids and self.txt_entrada.document().isEmpty():
             self.shown_note_ids.clear()
             
             if self.edit_mode:
@@ -1410,143 +1669,89 @@ class CustomDialog(QDialog):
             self.update_preview()
 
     def update_preview(self):
+        """Agenda a atualização da pré-visualização da linha do cursor."""
+        if not self.preview_timer.isActive():
+            self.preview_timer.start(self.preview_page.debounce_ms)
+
+    def _preview_note_for_line(self, line_number, line_data=None):
+        """Nota (nova ou já mostrada) que a linha representa, ou None."""
+        # Linhas inseridas no modo de edição (id provisório) ainda não têm nota
+        if self.shown_note_ids and 0 <= line_number < len(self.shown_note_ids) and self.shown_note_ids[line_number] > 0:
+            return mw.col.get_note(self.shown_note_ids[line_number])
+        if line_data is None:
+            line_data = self.parse_cache.get_line(line_number)
+        if line_data is None or not self.lista_notetypes.currentItem():
+            return None
+        model = mw.col.models.by_name(self.lista_notetypes.currentItem().text())
+        if not model:
+            return None
+        note = mw.col.new_note(model)
+        note.fields[:] = self._get_mapper(model).map_parts(line_data.parts)
+        return note
+
+    def _render_preview(self):
+        started = time.perf_counter()
         try:
             cursor = self.txt_entrada.textCursor()
             current_line = cursor.blockNumber()
-            all_lines = self.txt_entrada.toPlainText().split('\n')
+            line_data = self.parse_cache.get_line(current_line)
 
-            if not (0 <= current_line < len(all_lines)):
-                self.preview_widget.setHtml("")
+            if line_data is None:
+                self.preview_page.show_message("", self.is_dark_theme)
                 return
-            
-            line_text = all_lines[current_line]
 
             if not self.lista_notetypes.currentItem():
-                self.preview_widget.setHtml(f"<div style='padding:10px;'>{self._t('Selecione um modelo para ver a pré-visualização.')}</div>")
+                self.preview_page.show_message(f"<div style='padding:10px;'>{self._t('Selecione um modelo para ver a pré-visualização.')}</div>", self.is_dark_theme)
                 return
 
-            note = None
-            
-            if self.shown_note_ids and 0 <= current_line < len(self.shown_note_ids):
-                nid = self.shown_note_ids[current_line]
-                note = mw.col.get_note(nid)
-            else:
-                modelo_nome = self.lista_notetypes.currentItem().text()
-                model = mw.col.models.by_name(modelo_nome)
-                if not model:
-                    self.preview_widget.setHtml(f"<div style='color:red'><b>{self._t('Erro:')}</b><br>{self._t('Modelo não encontrado.')}</div>")
-                    return
-
-                note = mw.col.new_note(model)
-                parts = self._get_split_parts(line_text)
-                
-                if not self.field_mappings:
-                    for idx, field_content in enumerate(parts):
-                        if idx < len(note.fields):
-                            note.fields[idx] = field_content.strip()
-                else:
-                    field_names = [f['name'] for f in model['flds']]
-                    for part_idx, field_content in enumerate(parts):
-                        target_field_name = self.field_mappings.get(str(part_idx))
-                        if target_field_name and target_field_name in field_names:
-                            field_idx = field_names.index(target_field_name)
-                            note.fields[field_idx] = field_content.strip()
+            if not self.shown_note_ids and not mw.col.models.by_name(self.lista_notetypes.currentItem().text()):
+                self.preview_page.show_message(f"<div style='color:red'><b>{self._t('Erro:')}</b><br>{self._t('Modelo não encontrado.')}</div>", self.is_dark_theme)
+                return
 
+            note = self._preview_note_for_line(current_line, line_data)
             if not note:
-                self.preview_widget.setHtml("")
+                self.preview_page.show_message("", self.is_dark_theme)
                 return
 
-            card = note.ephemeral_card()
-
-            question_html = mw.prepare_card_text_for_display(card.question())
-            answer_html = mw.prepare_card_text_for_display(card.answer())
-
-            script_pattern = re.compile(r"<script[^>]*>(.*?)</script>", re.DOTALL | re.IGNORECASE)
-            style_pattern = re.compile(r"<style[^>]*>(.*?)</style>", re.DOTALL | re.IGNORECASE)
-            
-            unique_scripts = set()
-            unique_styles = set()
-
-            for style in style_pattern.findall(question_html): unique_styles.add(style)
-            for style in style_pattern.findall(answer_html): unique_styles.add(style)
-            for script in script_pattern.findall(question_html): unique_scripts.add(script)
-            for script in script_pattern.findall(answer_html): unique_scripts.add(script)
-
-            question_html = style_pattern.sub("", question_html)
-            answer_html = style_pattern.sub("", answer_html)
-            question_html = script_pattern.sub("", question_html)
-            answer_html = script_pattern.sub("", answer_html)
-
-            question_html = gui_hooks.card_will_show(question_html, card, "clayoutQuestion")
-            answer_html = gui_hooks.card_will_show(answer_html, card, "clayoutAnswer")
-
-            body_class = theme_manager.body_classes_for_card_ord(card.ord, self.is_dark_theme)
-
-            # Define styles based on the current theme
-            if self.is_dark_theme:
-                section_style = "border: 1px solid #4a4a4a; border-radius: 8px; margin: 10px 0; overflow: hidden; background-color: #2d2d2d;"
-                header_style = "background-color: #3a3a3a; color: #eee; padding: 5px 15px; font-weight: bold; border-bottom: 1px solid #4a4a4a;"
-                content_style = "padding: 15px;"
-            else:
-                # Styles for the light theme
-                section_style = "border: 1px solid #ccc; border-radius: 8px; margin: 10px 0; overflow: hidden; background-color: #ffffff;"
-                header_style = "background-color: #f0f0f0; color: #000; padding: 5px 15px; font-weight: bold; border-bottom: 1px solid #ccc;"
-                content_style = "padding: 15px;"
-
-            # Construct the HTML with labeled sections
-            final_html = f"""
-            <div class="preview-section" style="{section_style}">
-                <div class="preview-header" style="{header_style}">{self._t("Frente do Cartão (Preview)")}</div>
-                <div id="preview-front" class="preview-content" style="{content_style}">{question_html}</div>
-            </div>
-            <div class="preview-section" style="{section_style}">
-                <div class="preview-header" style="{header_style}">{self._t("Verso do Cartão (Preview)")}</div>
-                <div id="preview-back" class="preview-content" style="{content_style}">{answer_html}</div>
-            </div>
-            """
-            
-            try:
-                self.preview_widget.loadFinished.disconnect()
-            except TypeError:
-                pass
+            rendered = render_cache.get_display(note, self.is_dark_theme)
 
-            def on_load_finished(ok):
-                if not ok: return
-                self.preview_widget.eval(f"document.body.className = '{body_class}';")
-                
-                # Set the background of the entire page to match the dialog theme
-                bg_color = "#333" if self.is_dark_theme else "#f0f0f0"
-                self.preview_widget.eval(f"document.documentElement.style.backgroundColor = '{bg_color}';")
-                
-                # Ensure the main document is scrollable
-                self.preview_widget.eval("document.documentElement.style.overflowY = 'auto';")
-
-                # Force text color to ensure theme change is applied correctly.
-                if not self.is_dark_theme:
-                    self.preview_widget.eval("document.body.style.color = 'black';")
-
-                for style_content in unique_styles:
-                    escaped_style = json.dumps(style_content)
-                    self.preview_widget.eval(f"var style = document.createElement('style'); style.type = 'text/css'; style.innerHTML = {escaped_style}; document.head.appendChild(style);")
-
-                for script in unique_scripts:
-                    if script.strip():
-                        self.preview_widget.eval(script)
-                
-                self.preview_widget.eval("if (typeof MathJax !== 'undefined') MathJax.typesetPromise();")
-
-            self.preview_widget.loadFinished.connect(on_load_finished)
-
-            self.preview_widget.stdHtml(
-                f'<div id="qa" style="padding: 0 10px;">{final_html}</div>',
-                css=["css/reviewer.css"],
-                js=self._get_reviewer_scripts(),
-                context=self
+            # Só o conteúdo do card é enviado; a página já está carregada
+            self.preview_page.show_card(
+                started, rendered.question, rendered.answer, rendered.styles, rendered.scripts,
+                rendered.body_class, self.is_dark_theme,
+                self._t("Frente do Cartão (Preview)"), self._t("Verso do Cartão (Preview)"),
             )
+            self._schedule_preview_prefetch(current_line)
 
         except Exception as e:
             logging.error(f"Erro na pré-visualização: {e}")
-            self.preview_widget.setHtml(f"<div style='color:red'><b>{self._t('Erro na pré-visualização:')}</b><br>{e}</div>")
+            self.preview_page.show_message(f"<div style='color:red'><b>{self._t('Erro na pré-visualização:')}</b><br>{html.escape(str(e))}</div>", self.is_dark_theme)
+
+    def _schedule_preview_prefetch(self, line_number):
+        """Renderiza as linhas vizinhas ao cursor quando o editor fica ocioso."""
+        block_count = self.txt_entrada.document().blockCount()
+        self._prefetch_lines = [
+            n for offset in range(1, PREFETCH_RADIUS + 1)
+            for n in (line_number + offset, line_number - offset)
+            if 0 <= n < block_count
+        ]
+        self.preview_prefetch_timer.start(PREFETCH_IDLE_MS)
+
+    def _prefetch_next_preview(self):
+        # Uma linha por vez, devolvendo o controle ao Qt entre elas
+        if not self._prefetch_lines or self.preview_timer.isActive():
+            return
+        line_number = self._prefetch_lines.pop(0)
+        try:
+            line_data = self.parse_cache.get_line(line_number)
+            if self.shown_note_ids or (line_data is not None and line_data.is_card):
+                note = self._preview_note_for_line(line_number, line_data)
+                if note:
+                    render_cache.get_display(note, self.is_dark_theme)
+        except Exception as e:
+            logging.debug(f"Pré-renderização da linha {line_number} falhou: {e}")
+        if self._prefetch_lines:
+            self.preview_prefetch_timer.start(0)
 
     def apply_text_color(self, color):
         cursor = self.txt_entrada.textCursor()
@@ -1599,7 +1804,7 @@ class CustomDialog(QDialog):
             self.field_mappings.clear()
             self.field_images.clear()
             self.media_files.clear()
-            self.card_creation_info = []
+            self.clear_creation_info()
             self.update_field_mappings()
             self.update_preview()
             self.schedule_save()
@@ -1615,15 +1820,19 @@ class CustomDialog(QDialog):
         if not deck_item or not notetype_item:
             showWarning(self._t("Selecione um deck e um modelo!"))
             return
+        if not self.tasks.check_idle():
+            return
         
-        # O texto já foi corrigido em tempo real pelo sinal textChanged,
-        # então podemos prosseguir diretamente.
-        linhas_texto = self.txt_entrada.toPlainText().strip()
-        if not linhas_texto:
+        # O texto é corrigido em tempo real pelo despachante do editor;
+        # aplica agora qualquer alteração ainda pendente na janela de espera.
+        self.editor_pipeline.flush()
+        linhas = list(self.parse_cache.iter_blocks())
+        # As linhas em branco do início não contam na numeração das etiquetas
+        primeira_linha = next((n for n, (_, data) in enumerate(linhas) if not data.is_blank), None)
+        if primeira_linha is None:
             showWarning(self._t("Digite algum conteúdo!"))
             return
         
-        linhas = linhas_texto.split('\n')
         deck_name = deck_item.text()
         deck_id = mw.col.decks.id_for_name(deck_name)
         
@@ -1632,73 +1841,168 @@ class CustomDialog(QDialog):
         if not cloze_model:
             logging.warning("Modelo 'Cloze' não encontrado. Cards com padrão cloze usarão o modelo selecionado.")
 
-        contador = 0
         linhas_tags = self.txt_tags.toPlainText().strip().split('\n')
-
-        mw.progress.start(label="Adicionando cards...", max=len(linhas))
-
-        for i, linha in enumerate(linhas):
-            mw.progress.update(value=i + 1)
-            linha = linha.strip()
-            
-            active_delimiters = [chk.simbolo for chk in self.chk_delimitadores.values() if chk.isChecked()]
-            if not active_delimiters:
-                active_delimiters = [';']
-            
-            if not linha or not any(d in linha for d in active_delimiters):
+        config = self._core_config(default_model)
+        cloze_field_count = len(cloze_model['flds']) if cloze_model else 0
+        mapper = self._get_mapper(default_model)
+
+        # As notas são montadas em memória (campos e etiquetas) na thread
+        # principal, onde o cache de linhas do editor pode ser lido...
+        pendentes = []
+        for block_number, (_, data) in enumerate(linhas):
+            if not data.is_card:
                 continue
-
-            is_cloze = cloze_model and re.search(r'{{c\d+::.*?}}', linha)
-            
-            nota = None
+            i = block_number - primeira_linha
+            is_cloze = bool(cloze_model) and data.is_cloze
             if is_cloze:
-                nota = mw.col.new_note(cloze_model)
-                parts = self._get_split_parts(linha)
-                nota.fields[0] = parts[0] # Texto com o cloze
-                if len(parts) > 1 and parts[1]:
-                    nota.fields[1] = parts[1] # Campo "Extra"
+                # Texto com o cloze no primeiro campo e o campo "Extra"
+                fields = map_cloze_parts(data.parts, cloze_field_count)
             else:
-                nota = mw.col.new_note(default_model)
-                parts = self._get_split_parts(linha)
-                
-                if not self.field_mappings:
-                    for idx, field_content in enumerate(parts):
-                        if idx < len(nota.fields):
-                            nota.fields[idx] = field_content.strip()
-                else:
-                    field_names = [f['name'] for f in default_model['flds']]
-                    for part_idx, field_content in enumerate(parts):
-                        target_field_name = self.field_mappings.get(str(part_idx))
-                        if target_field_name and target_field_name in field_names:
-                            field_idx = field_names.index(target_field_name)
-                            nota.fields[field_idx] = field_content.strip()
-            
-            if i < len(linhas_tags):
-                tags_for_card = [tag.strip() for tag in linhas_tags[i].split(',') if tag.strip()]
-                if tags_for_card:
-                    if self.chk_num_tags.isChecked():
-                        nota.tags.extend([f"{tag}{i + 1}" for tag in tags_for_card])
-                    else:
-                        nota.tags.extend(tags_for_card)
-            
-            try:
-                mw.col.add_note(nota, deck_id)
-                contador += 1
-            except Exception as e:
-                logging.error(f"Erro ao adicionar card da linha {i+1}: {str(e)}")
+                fields = mapper.map_parts(data.parts)
+            tags = tags_for_line(linhas_tags[i], i, config.number_tags) if i < len(linhas_tags) else []
+            pendentes.append((block_number, is_cloze, fields, tags))
+
+        if not pendentes:
+            showInfo(self._t("{} cards adicionados com sucesso!").format(0))
+            return
+
+        # Antes de gravar, procura no deck as linhas que já existem (mesmo
+        # tipo de nota e mesmo primeiro campo), todas numa única consulta.
+        def check(col):
+            return find_duplicates(col, deck_id, [
+                ((cloze_model if is_cloze else default_model)['id'], fields[0] if fields else "")
+                for _, is_cloze, fields, _ in pendentes
+            ])
+
+        def on_checked(duplicadas):
+            updates = []
+            if duplicadas:
+                self.txt_entrada.line_number_area.set_markers({pendentes[i][0] for i in duplicadas})
+                escolha = self._ask_duplicate_action(len(duplicadas))
+                if escolha is None:
+                    return
+                if escolha == 'update':
+                    updates = [(nid, pendentes[i][2], pendentes[i][3]) for i, nid in duplicadas.items()]
+                if escolha != 'add':
+                    novas = [p for i, p in enumerate(pendentes) if i not in duplicadas]
+                    self._add_pending_notes(novas, updates, deck_id, default_model, cloze_model)
+                    return
+            self._add_pending_notes(pendentes, updates, deck_id, default_model, cloze_model)
+
+        self.tasks.run(self._t("Verificando duplicatas..."), check, on_checked)
+
+    def _ask_duplicate_action(self, count):
+        """Retorna 'skip', 'add', 'update' ou None (cancelar)."""
+        box = QMessageBox(self)
+        box.setIcon(QMessageBox.Icon.Question)
+        box.setWindowTitle(self._t("Duplicatas encontradas"))
+        box.setText(self._t("{} linha(s) já existem neste deck (marcadas na numeração). O que deseja fazer?").format(count))
+        skip_button = box.addButton(self._t("Pular duplicatas"), QMessageBox.ButtonRole.AcceptRole)
+        add_button = box.addButton(self._t("Adicionar mesmo assim"), QMessageBox.ButtonRole.AcceptRole)
+        update_button = box.addButton(self._t("Atualizar existentes"), QMessageBox.ButtonRole.AcceptRole)
+        box.addButton(QMessageBox.StandardButton.Cancel)
+        box.setDefaultButton(skip_button)
+        box.exec()
+        clicked = box.clickedButton()
+        if clicked == skip_button:
+            return 'skip'
+        if clicked == add_button:
+            return 'add'
+        if clicked == update_button:
+            return 'update'
+        return None
+
+    def _clear_duplicate_markers(self):
+        if self.txt_entrada.line_number_area.markers:
+            self.txt_entrada.line_number_area.set_markers(set())
+
+    def _add_pending_notes(self, pendentes, updates, deck_id, default_model, cloze_model):
+        """
+        Grava as notas pendentes (block_number, is_cloze, campos, etiquetas)
+        em lotes numa operação em segundo plano e atualiza as notas de
+        `updates` (nid, campos, etiquetas), tudo num único passo de desfazer.
+        A operação avisa o Anki das mudanças, que atualiza só as telas
+        afetadas (sem mw.reset()).
+        """
+        resultado = {'skipped': []}
+        undo_label = self._t("Adicionar Cards")
+
+        def build_requests(col):
+            for _, is_cloze, fields, tags in pendentes:
+                nota = col.new_note(cloze_model if is_cloze else default_model)
+                nota.fields[:] = fields
+                nota.tags.extend(tags)
+                yield make_request(nota, deck_id)
+
+        def report_progress(added):
+            self.tasks.progress(added, len(pendentes), self._t("Adicionando cards... {}/{}").format(added, len(pendentes)))
+
+        def skip_line(index, error):
+            # Como antes, uma linha que a coleção recusa fica de fora sem interromper as demais
+            line_number = pendentes[index][0] + 1
+            logging.error(f"Erro ao adicionar a linha {line_number}: {error}")
+            resultado['skipped'].append(line_number)
+
+        def op(col):
+            undo_entry = col.add_custom_undo_entry(undo_label)
+            if updates:
+                notas = []
+                for nid, fields, tags in updates:
+                    nota = col.get_note(nid)
+                    nota.fields[:] = fields[:len(nota.fields)] + nota.fields[len(fields):]
+                    for tag in tags:
+                        nota.add_tag(tag)
+                    notas.append(nota)
+                col.update_notes(notas)
+                col.merge_undo_entries(undo_entry)
+            resultado['updated'] = len(updates)
+            resultado['added'], changes, resultado['cancelled'] = add_notes_in_batches(
+                col, build_requests(col), undo_label, on_batch=report_progress,
+                should_cancel=self.tasks.want_cancel, undo_entry=undo_entry, on_skip=skip_line)
+            return changes
+
+        def on_success(changes):
+            if resultado['skipped']:
+                showWarning(self._t("Linhas não adicionadas (erro ao criar a nota): {}").format(
+                    ", ".join(str(n) for n in resultado['skipped'])))
+            if resultado.get('cancelled'):
+                showInfo(self._t("Operação cancelada. {} cards adicionados.").format(resultado['added']))
+            elif resultado['updated']:
+                showInfo(self._t("{} cards adicionados e {} atualizados.").format(resultado['added'], resultado['updated']))
+            else:
+                showInfo(self._t("{} cards adicionados com sucesso!").format(resultado['added']))
+
+        def on_failure(error):
+            logging.error(f"Erro ao adicionar cards: {error}")
+            showWarning(self._t("Erro ao adicionar cards: {}").format(str(error)))
 
-        mw.progress.finish()
-        showInfo(self._t("{} cards adicionados com sucesso!").format(contador))
-        mw.reset()
+        self.tasks.run(self._t("Adicionando cards..."), op, on_success, on_failure, mutates=True)
+
+    def import_file(self):
+        deck_item = self.lista_decks.currentItem()
+        notetype_item = self.lista_notetypes.currentItem()
+        if not deck_item or not notetype_item:
+            showWarning(self._t("Selecione um deck e um modelo!"))
+            return
+        if not self.tasks.check_idle():
+            return
+
+        caminho, _ = QFileDialog.getOpenFileName(self, self._t("Importar Arquivo"), "", "Texto (*.txt *.csv *.tsv);;Todos (*)")
+        if not caminho:
+            return
+
+        default_model = mw.col.models.by_name(notetype_item.text())
+        cloze_model = mw.col.models.by_name("Cloze")
+        deck_id = mw.col.decks.id_for_name(deck_item.text())
+        importer = FileImporter(caminho, deck_id, default_model, cloze_model, self._core_config(default_model), self._t)
+        importer.run_in_background(self.tasks)
 
     def show_all_cards(self):
+        if not self.tasks.check_idle():
+            return
         if self.edit_mode:
             self.toggle_edit_mode()
 
-        def clean_html_tags(text):
-            text = re.sub(r'(<img[^>]*)alt="[^"]*"([^>]*>)', r'\1\2', text)
-            return text
-
         if not self.lista_decks.currentItem():
             showWarning(self._t("Selecione um deck primeiro!"))
             return
@@ -1707,8 +2011,23 @@ class CustomDialog(QDialog):
         if not deck_id:
             showWarning(self._t("Deck '{}' não encontrado!").format(deck_name))
             return
-        note_ids = mw.col.find_notes(f"deck:\"{deck_name}\"")
-        if not note_ids:
+        active_delimiter = next((chk.simbolo for chk in self.chk_delimitadores.values() if chk.isChecked()), ';')
+        label = self._t("Carregando cards do deck...")
+
+        # Leitura das notas em segundo plano; retorna None se cancelado
+        def op(col):
+            return read_deck_lines(
+                col, deck_id, active_delimiter,
+                on_progress=lambda value, total: self.tasks.progress(value, total, label),
+                should_cancel=self.tasks.want_cancel)
+
+        self.tasks.run(label, op, lambda linhas: self._apply_shown_cards(linhas, deck_id, deck_name))
+
+    def _apply_shown_cards(self, linhas, deck_id, deck_name):
+        """Coloca no editor as notas lidas por show_all_cards (thread principal)."""
+        if linhas is None:
+            return
+        if not linhas:
             showWarning(self._t("Nenhum card encontrado no deck '{}'!").format(deck_name))
             return
         current_text = self.txt_entrada.toPlainText()
@@ -1718,45 +2037,16 @@ class CustomDialog(QDialog):
         except Exception as e:
             logging.error(f"Erro ao salvar estado antes de 'Mostrar': {str(e)}")
             showWarning(self._t("Erro ao salvar estado antes de 'Mostrar': {}").format(str(e)))
-        
-        self.card_notetypes = []
-        self.shown_note_ids.clear()
-        self.card_creation_info.clear()
 
-        for nid in note_ids:
-            note = mw.col.get_note(nid)
-            
-            note_model = mw.col.models.get(note.mid)
-            note_type_name = note_model['name']
-            campos = [fld['name'] for fld in note_model['flds']]
-            field_values = []
-            for campo in campos:
-                if campo in note:
-                    field_value = html.unescape(note[campo])
-                    field_value = re.sub(r'\[sound:([^\]]+)\]', r'<audio controls=""><source src="\1" type="audio/mpeg"></audio>', field_value)
-                    field_value = clean_html_tags(field_value)
-                    field_value = field_value.replace('\n', ' ').replace('\u00A0', ' ')
-                    field_value = re.sub(r'\s+', ' ', field_value).strip()
-                    field_values.append(field_value)
-                else:
-                    field_values.append("")
-            
-            active_delimiter = next((chk.simbolo for chk in self.chk_delimitadores.values() if chk.isChecked()), ';')
-            card_line = f" {active_delimiter} ".join(field_values)
-            
-            if card_line.strip():
-                tags = note.string_tags().strip()
-                self.card_creation_info.append([nid, card_line, tags])
-                self.shown_note_ids.append(nid)
-                self.card_notetypes.append(note_type_name)
+        self.card_notetypes = [note_type_name for _, _, _, note_type_name, _ in linhas]
+        self.shown_note_ids = [nid for nid, _, _, _, _ in linhas]
+        self.card_creation_info = [[nid, card_line, tags] for nid, card_line, tags, _, _ in linhas]
+        self.edit_journal = EditJournal((nid, card_line, tags, mod) for nid, card_line, tags, _, mod in linhas)
+        self.shown_deck_id = deck_id
 
-        if self.card_creation_info:
-            self.current_view_mode = 'simple'
-            self._repopulate_ui_from_creation_info()
-        else:
-            self.txt_entrada.clear()
-            self.txt_tags.clear()
-            self.update_line_numbers()
+        self.current_view_mode = 'simple'
+        self._reset_pages()
+        self._repopulate_ui_from_creation_info(0)
 
         self.previous_text = self.txt_entrada.toPlainText()
         self.update_card_count()
@@ -1768,6 +2058,8 @@ class CustomDialog(QDialog):
             showWarning(self._t("Use a função 'Mostrar' para carregar os cards de um deck antes de editar."))
             return
 
+        if self.edit_mode:
+            self._record_edits()
         self.edit_mode = not self.edit_mode
 
         if self.edit_mode:
@@ -1778,6 +2070,9 @@ class CustomDialog(QDialog):
             self.save_status_label.setStyleSheet("color: blue; font-weight: bold;")
             QTimer.singleShot(2500, lambda: self.save_status_label.setText(self._t("Pronto")) or self.save_status_label.setStyleSheet("color: gray; font-weight: normal;"))
         else:
+            # Grava o que ainda estiver pendente antes de sair do modo de edição
+            self.edit_timer.stop()
+            self._apply_real_time_edit(final=True)
             self.edit_button.setText(self._t("Editar"))
             self.edit_button.setStyleSheet("")
             self.show_button.setEnabled(True)
@@ -1785,80 +2080,165 @@ class CustomDialog(QDialog):
             self.save_status_label.setStyleSheet("color: gray; font-weight: normal;")
             QTimer.singleShot(2500, lambda: self.save_status_label.setText(self._t("Pronto")))
 
+    def _on_tags_edited(self):
+        if self.edit_mode:
+            self._tags_edited = True
+            self.schedule_real_time_edit()
+
+    def _journal_edits(self, change):
+        """Estágio do editor: registra as linhas alteradas e agenda a gravação."""
+        if not self.edit_mode or self._pending_media_copies:
+            return
+        self._record_edits(change)
+        self.schedule_real_time_edit()
+
+    def _record_edits(self, change=None):
+        """Registra no diário as linhas de `change` (todas as da página, sem `change`)."""
+        if not self.edit_mode or self.edit_journal is None or self._pending_media_copies:
+            return
+        document = self.txt_entrada.document()
+        if document.blockCount() == len(self.shown_note_ids):
+            tags_document = self.txt_tags.document()
+            blocks = change.blocks(document) if change is not None else EditRange(0, 0, full=True).blocks(document)
+            for block in blocks:
+                number = block.blockNumber()
+                tags_block = tags_document.findBlockByNumber(number)
+                tags = tags_block.text().strip() if tags_block.isValid() else ""
+                self.edit_journal.record(self.shown_note_ids[number], block.text(), tags)
+
     def schedule_real_time_edit(self):
         if not self.edit_mode:
             return
 
-        current_line_count = len(self.txt_entrada.toPlainText().split('\n'))
+        current_line_count = self.txt_entrada.document().blockCount()
         if current_line_count != len(self.shown_note_ids):
             showWarning(self._t("O número de linhas foi alterado. Modo de edição desativado para evitar erros."))
             self.toggle_edit_mode()
             return
 
-        self.save_status_label.setText(self._t("Atualizando card..."))
-        self.save_status_label.setStyleSheet("color: orange;")
-        self.edit_timer.start(750)
+        if self.edit_journal:
+            self.save_status_label.setText(self._t("Alterações pendentes: {}").format(len(self.edit_journal)))
+            self.save_status_label.setStyleSheet("color: orange;")
+        self.edit_timer.start(EDIT_IDLE_MS)
 
-    def _apply_real_time_edit(self):
-        if not self.edit_mode:
+    def commit_edits(self):
+        """Grava agora as alterações pendentes do modo de edição (Ctrl+S)."""
+        self.edit_timer.stop()
+        self._apply_real_time_edit(final=True)
+
+    def _apply_real_time_edit(self, final=False):
+        """
+        Grava o diário de edições numa única operação (um passo de desfazer):
+        campos e etiquetas alterados, notas das linhas inseridas e exclusão
+        das notas cujas linhas foram removidas. As exclusões só são gravadas
+        com `final` (Ctrl+S, sair do modo de edição ou fechar a janela); até
+        lá, uma linha recortada e colada em outro ponto recupera a nota.
+        """
+        if self._tags_edited:
+            self._tags_edited = False
+            self._record_edits()
+        journal = self.edit_journal
+        if not journal:
+            return
+        if self.tasks.busy:
+            # Outra operação em andamento: tenta de novo depois
+            if final:
+                QTimer.singleShot(EDIT_IDLE_MS, lambda: self._apply_real_time_edit(final=True))
+            else:
+                self.edit_timer.start(EDIT_IDLE_MS)
             return
 
-        try:
-            line_number = self.txt_entrada.textCursor().blockNumber()
+        pending = journal.pending(include_deleted=final)
+        if not (pending.updates or pending.added or pending.deleted):
+            return
+        deck_id = self.shown_deck_id
+        notetype_item = self.lista_notetypes.currentItem()
+        default_model = mw.col.models.by_name(notetype_item.text()) if notetype_item else None
+        cloze_model = mw.col.models.by_name("Cloze")
+        label = self._t("Salvando edições...")
+        resultado = {'mods': {}, 'conflicts': [], 'added': {}, 'updated': 0}
 
-            if not (0 <= line_number < len(self.shown_note_ids)):
-                logging.warning(f"Edição em tempo real: número de linha inválido ({line_number}).")
+        def build_note(col, line, tags):
+            # Linhas inseridas viram notas como em "Adicionar Cards"
+            line = line.strip()
+            if not default_model or not line or not self._tokenizer.has_delimiter(line):
+                return None
+            if cloze_model and is_cloze_line(line):
+                model = cloze_model
+                fields = map_cloze_parts(self._tokenizer.split(line), len(cloze_model['flds']))
+            else:
+                model = default_model
+                fields = self._get_mapper(default_model).map_line(line)
+            note = col.new_note(model)
+            note.fields[:] = fields
+            note.tags = col.tags.split(tags)
+            return note
+
+        def op(col):
+            prepared = journal.prepare(col, pending, self._get_mapper, build_note)
+            resultado['conflicts'] = prepared.conflicts
+            if not prepared:
+                return OpChanges()
+            undo_entry = col.add_custom_undo_entry(label)
+            if prepared.notes:
+                col.update_notes(prepared.notes)
+            if prepared.added:
+                add_notes_in_batches(col, (make_request(note, deck_id) for _, note in prepared.added),
+                                     label, undo_entry=undo_entry,
+                                     on_skip=lambda index, error: logging.error(
+                                         f"Erro ao criar a nota de uma linha inserida: {error}"))
+            if prepared.deleted:
+                col.remove_notes(prepared.deleted)
+            changes = col.merge_undo_entries(undo_entry)
+            # Linhas recusadas pela coleção (sem id) continuam pendentes no diário
+            resultado['added'] = {new_id: note.id for new_id, note in prepared.added if note.id}
+            resultado['updated'] = len(prepared.notes) + len(resultado['added']) + len(prepared.deleted)
+            resultado['mods'] = journal.read_mods(
+                col, [note.id for note in prepared.notes] + list(resultado['added'].values()))
+            return changes
+
+        def on_success(changes):
+            journal.mark_committed(pending, resultado['mods'], resultado['conflicts'], resultado['added'])
+            if journal is not self.edit_journal:
                 return
-
-            note_id = self.shown_note_ids[line_number]
-            note = mw.col.get_note(note_id)
-            if not note:
-                logging.error(f"Edição em tempo real: Nota com ID {note_id} não encontrada.")
+            self._replace_new_ids(resultado['added'])
+            if resultado['conflicts']:
+                self._report_edit_conflicts(resultado['conflicts'])
+            if journal.revision != pending.revision:
+                # Novas edições chegaram durante a gravação
+                self.schedule_real_time_edit()
                 return
-
-            all_lines = self.txt_entrada.toPlainText().split('\n')
-            edited_line_text = all_lines[line_number]
-            
-            parts = self._get_split_parts(edited_line_text)
-            model = note.model()
-
-            for fld in model['flds']:
-                note[fld['name']] = ""
-
-            if not self.field_mappings:
-                for idx, field_content in enumerate(parts):
-                    if idx < len(note.fields):
-                        note.fields[idx] = field_content.strip()
-            else:
-                field_names = [f['name'] for f in model['flds']]
-                for part_idx, field_content in enumerate(parts):
-                    target_field_name = self.field_mappings.get(str(part_idx))
-                    if target_field_name and target_field_name in field_names:
-                        note[target_field_name] = field_content.strip()
-            
-            all_tags_lines = self.txt_tags.toPlainText().split('\n')
-            if line_number < len(all_tags_lines):
-                tags_for_card_str = all_tags_lines[line_number].strip()
-                note.tags = mw.col.tags.split(tags_for_card_str)
-
-            note.flush()
-            
-            if mw.state == "review" and mw.reviewer.card and mw.reviewer.card.nid == note_id:
-                mw.reviewer.card.load()
-                if mw.reviewer.state == "question":
-                    mw.reviewer._showQuestion()
-                elif mw.reviewer.state == "answer":
-                    mw.reviewer._showAnswer()
-
-            self.save_status_label.setText(self._t("Card {} atualizado!").format(line_number + 1))
+            self.save_status_label.setText(self._t("{} card(s) atualizado(s)!").format(resultado['updated']))
             self.save_status_label.setStyleSheet("color: green;")
             QTimer.singleShot(2000, lambda: self.save_status_label.setText(self._t("Pronto")) or self.save_status_label.setStyleSheet("color: gray;"))
 
-        except Exception as e:
-            logging.error(f"Erro na edição em tempo real: {e}")
+        def on_failure(error):
+            logging.error(f"Erro na edição em tempo real: {error}")
             self.save_status_label.setText(self._t("Erro ao atualizar"))
             self.save_status_label.setStyleSheet("color: red;")
 
+        self.tasks.run(label, op, on_success, on_failure, mutates=True)
+
+    def _replace_new_ids(self, added):
+        """Troca os ids provisórios das linhas inseridas pelos ids das notas criadas."""
+        if not added:
+            return
+        for entry in self.card_creation_info:
+            if entry[0] in added:
+                entry[0] = added[entry[0]]
+        self.shown_note_ids = [added.get(nid, nid) for nid in self.shown_note_ids]
+        if self.current_view_mode == 'date':
+            self._update_shown_gutter()
+
+    def _report_edit_conflicts(self, conflicts):
+        """Marca e avisa as linhas cujas notas foram alteradas fora do editor."""
+        conflicting = set(conflicts)
+        positions = [i + 1 for i, info in enumerate(self.card_creation_info) if info[0] in conflicting]
+        self.txt_entrada.line_number_area.set_markers(
+            {number for number, nid in enumerate(self.shown_note_ids) if nid in conflicting})
+        lines = ", ".join(str(n) for n in positions[:20]) + (" ..." if len(positions) > 20 else "")
+        showWarning(self._t("{} nota(s) foram alteradas ou excluídas fora deste editor depois de mostradas e não foram sobrescritas (linhas: {}). Use 'Mostrar' novamente para carregar a versão atual.").format(len(conflicting), lines))
+
     def restore_pre_show_state(self):
         if os.path.exists(self.pre_show_state_file):
             try:
@@ -1889,28 +2269,12 @@ class CustomDialog(QDialog):
         if not arquivos:
             return
 
-        media_dir = mw.col.media.dir()
+        target = TARGET_CELL if self.stacked_editor.currentIndex() == 1 else TARGET_EDITOR
         html_tags_to_add = []
-        for caminho in arquivos:
-            nome = os.path.basename(caminho)
-            destino = os.path.join(media_dir, nome)
-            if os.path.exists(destino):
-                base, ext = os.path.splitext(nome)
-                counter = 1
-                while os.path.exists(destino):
-                    nome = f"{base}_{counter}{ext}"
-                    destino = os.path.join(media_dir, nome)
-                    counter += 1
-            shutil.copy2(caminho, destino)
-            self.media_files.append(nome)
-            
-            ext = os.path.splitext(nome)[1].lower()
-            if ext in ('.png', '.jpg', '.jpeg', '.gif'):
-                html_tags_to_add.append(f'<img src="{nome}">')
-            elif ext in ('.mp3', '.wav', '.ogg'):
-                html_tags_to_add.append(f'[sound:{nome}]')
-            elif ext in ('.mp4', '.webm'):
-                html_tags_to_add.append(f'<video src="{nome}" controls></video>')
+        for nome, tag, novo in media_store.add_files(mw.col, arquivos, target):
+            if novo:
+                self.media_files.append(nome)
+            html_tags_to_add.append(tag)
 
         if not html_tags_to_add:
             return
@@ -1947,58 +2311,104 @@ class CustomDialog(QDialog):
         mime_data = event.mimeData()
         if mime_data.hasUrls():
             file_paths = [url.toLocalFile() for url in mime_data.urls()]
-            for file_path in file_paths:
-                file_name = os.path.basename(file_path)
-                media_dir = mw.col.media.dir()
-                dest_path = os.path.join(media_dir, file_name)
-                if os.path.exists(dest_path):
-                    base, ext = os.path.splitext(file_name)
-                    counter = 1
-                    while os.path.exists(dest_path):
-                        file_name = f"{base}_{counter}{ext}"
-                        dest_path = os.path.join(media_dir, file_name)
-                        counter += 1
-                shutil.copy2(file_path, dest_path)
+            self.copy_dropped_media(file_paths)
+            self.txt_entrada.setFocus()
+        event.accept()
+
+    def copy_dropped_media(self, file_paths):
+        """
+        Copia os arquivos (e o conteúdo das pastas) soltos no editor em
+        segundo plano. Um marcador entra no cursor na hora e vira a tag de
+        mídia quando o arquivo termina de copiar, ou some se a cópia falhar
+        ou for cancelada. Enquanto houver marcadores no texto, o diário de
+        edições e o salvamento automático esperam, para não gravá-los.
+        """
+        paths = expand_media_paths(file_paths)
+        if not paths or not self.tasks.check_idle():
+            return
+        self._media_placeholder_seq += 1
+        seq = self._media_placeholder_seq
+        placeholders = [self._t("[copiando {}: {}]").format(f"{seq}.{i + 1}", os.path.basename(path))
+                        for i, path in enumerate(paths)]
+        self._pending_media_copies += len(paths)
+        self.txt_entrada.textCursor().insertText("".join(placeholders))
+        pending = set(range(len(paths)))
+        failed = []
+        media_dir = mw.col.media.dir()
+        total_bytes = 0
+        for path in paths:
+            try:
+                total_bytes += os.path.getsize(path)
+            except OSError:
+                pass
+        copied = {'bytes': 0, 'files': 0}
+        results = {} # índice -> (nome na pasta de mídia, novo), ou None se falhou
+        counter_lock = threading.Lock()
+
+        def finish(i, result):
+            if i not in pending:
+                return
+            pending.discard(i)
+            file_name, created = result or (None, False)
+            # Arquivos reaproveitados podem estar em outras notas: não entram na lista renomeável
+            if created:
                 self.media_files.append(file_name)
-                ext = os.path.splitext(file_name)[1].lower()
-                if ext in ('.png', '.jpg', '.jpeg', '.gif'):
-                    html_tag = f'<img src="{file_name}">'
-                elif ext in ('.mp3', '.wav', '.ogg'):
-                    html_tag = f'<audio controls><source src="{file_name}"></audio>'
-                elif ext in ('.mp4', '.webm'):
-                    html_tag = f'<video src="{file_name}" controls width="320" height="240"></video>'
-                else:
-                    continue
-                cursor = self.txt_entrada.textCursor()
-                cursor.insertText(html_tag)
+            self._replace_placeholder(placeholders[i], media_tag(file_name) if file_name else "")
+            self._pending_media_copies -= 1
+            if not self._pending_media_copies:
+                # Edições feitas durante a cópia: registra a página toda e salva
+                if self.edit_mode:
+                    self._record_edits()
+                    self.schedule_real_time_edit()
+                self.schedule_save()
+
+        def on_bytes(n):
+            with counter_lock:
+                copied['bytes'] += n
+                value, files = copied['bytes'], copied['files']
+            self.tasks.progress(value, total_bytes, self._t("Copiando mídia ({}/{})...").format(files, len(paths)))
+
+        def on_done(i, result, error):
+            with counter_lock:
+                copied['files'] += 1
+                results[i] = result
+                if error is not None:
+                    failed.append(os.path.basename(paths[i]))
+            mw.taskman.run_on_main(lambda: finish(i, result))
+
+        def op(col):
+            media_store.copy_files(media_dir, paths, on_done, self.tasks.want_cancel, on_bytes)
+
+        def done():
+            # Marcadores ainda na fila ou que ficaram para trás (erro geral)
+            for i in list(pending):
+                finish(i, results.get(i))
             self.update_line_numbers()
             self.previous_text = self.txt_entrada.toPlainText()
             self.update_preview()
-            self.txt_entrada.setFocus()
-            QApplication.processEvents()
-        event.accept()
+
+        def on_success(_):
+            done()
+            if failed:
+                showWarning(self._t("Não foi possível copiar: {}").format(", ".join(failed)))
+
+        def on_failure(error):
+            done()
+            logging.error(f"Erro ao copiar mídia: {error}")
+            showWarning(self._t("Ocorreu um erro ao copiar a mídia: {}").format(str(error)))
+
+        self.tasks.run(self._t("Copiando mídia..."), op, on_success, on_failure)
+
+    def _replace_placeholder(self, placeholder, text):
+        cursor = self.txt_entrada.document().find(placeholder, 0, QTextDocument.FindFlag.FindCaseSensitively)
+        if not cursor.isNull():
+            cursor.insertText(text)
 
     def process_files(self, file_paths):
-        media_folder = mw.col.media.dir()
-        for file_path in file_paths:
-            file_name = os.path.basename(file_path)
-            new_path = os.path.join(media_folder, file_name)
-            if os.path.exists(new_path):
-                base_name, ext = os.path.splitext(file_name)
-                counter = 1
-                while os.path.exists(new_path):
-                    file_name = f"{base_name}{counter}{ext}"
-                    new_path = os.path.join(media_folder, file_name)
-                    counter += 1
-            shutil.copy(file_path, new_path)
-            self.media_files.append(file_name)
-            ext = file_name.lower()
-            if ext.endswith(('.png', '.xpm', '.jpg', '.jpeg', '.bmp', '.gif')):
-                self.txt_entrada.insertPlainText(f'<img src="{file_name}">\n')
-            elif ext.endswith(('.mp3', '.wav', '.ogg')):
-                self.txt_entrada.insertPlainText(f'<audio controls=""><source src="{file_name}" type="audio/mpeg"></audio>\n')
-            elif ext.endswith(('.mp4', '.webm', '.avi', '.mkv', '.mov')):
-                self.txt_entrada.insertPlainText(f'<video src="{file_name}" controls width="320" height="240"></video>\n')
+        for file_name, html_tag, created in media_store.add_files(mw.col, file_paths):
+            if created:
+                self.media_files.append(file_name)
+            self.txt_entrada.insertPlainText(f'{html_tag}\n')
 
     def show_context_menu(self, pos):
         menu = self.txt_entrada.createStandardContextMenu()
@@ -2099,17 +2509,13 @@ class CustomDialog(QDialog):
         elif mime_data.hasImage():
             image = clipboard.image()
             if not image.isNull():
-                media_folder = mw.col.media.dir()
-                base_name, ext, counter = "img", ".png", 1
-                file_name = f"{base_name}{counter}{ext}"
-                new_path = os.path.join(media_folder, file_name)
-                while os.path.exists(new_path):
-                    counter += 1
-                    file_name = f"{base_name}{counter}{ext}"
-                    new_path = os.path.join(media_folder, file_name)
-                image.save(new_path)
-                self.media_files.append(file_name)
-                self.txt_entrada.insertPlainText(f'<img src="{file_name}">\n')
+                buffer = QBuffer()
+                buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+                image.save(buffer, "PNG")
+                file_name, created = media_store.add_data(mw.col, "img.png", bytes(buffer.data()))
+                if created:
+                    self.media_files.append(file_name)
+                self.txt_entrada.insertPlainText(f'{media_tag(file_name)}\n')
         elif mime_data.hasText():
             text = clipboard.text()
             text = self.convert_markdown_to_html(text)
@@ -2267,7 +2673,7 @@ class CustomDialog(QDialog):
         self.lista_notetypes.updateGeometry()
 
     def scan_media_files_from_text(self):
-        patterns = [r'<img src="([^"]+)"', r'<source src="([^"]+)"', r'<video src="([^"]+)"']
+        patterns = [r'<img src="([^"]+)"', r'<source src="([^"]+)"', r'<video src="([^"]+)"', r'\[sound:([^\]]+)\]']
         current_text = self.txt_entrada.toPlainText()
         media_dir = mw.col.media.dir()
         found_media = set()
@@ -2341,29 +2747,64 @@ class CustomDialog(QDialog):
         self.highlight_current_line()
         self.update_preview()
 
-    def copy_media_files(self, dest_folder):
-        media_files = set()
-        text = self.txt_entrada.toPlainText()
-        for pattern in [r'src="([^"]+)"', r'<source src="([^"]+)"', r'<video src="([^"]+)"']:
-            media_files.update(re.findall(pattern, text))
-        media_dir = mw.col.media.dir()
-        for file_name in media_files:
-            src = os.path.join(media_dir, file_name)
-            dst = os.path.join(dest_folder, file_name)
-            if os.path.exists(src) and not os.path.exists(dst):
-                shutil.copy2(src, dst)
-
     def export_to_html(self):
-        try:
-            html_content = generate_export_html(self, self._t)
-            if not html_content:
-                return
-            desktop_path = os.path.join(os.path.expanduser("~/Desktop"), "delimit.html")
-            with open(desktop_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            webbrowser.open(f"file://{os.path.abspath(desktop_path)}")
-        except Exception as e:
-            QMessageBox.critical(self, self._t("Erro na Exportação"), self._t("Ocorreu um erro durante a exportação: {}").format(str(e)))
+        self._run_export(zip_file=False)
+
+    def export_to_zip(self):
+        self._run_export(zip_file=True)
+
+    def _run_export(self, zip_file):
+        if not self.tasks.check_idle():
+            return
+        if not self.lista_notetypes.currentItem():
+            showWarning(self._t("Por favor, selecione um Tipo de Nota para exportar."))
+            return
+        cards_text_lines = self.txt_entrada.toPlainText().strip().split('\n')
+        if not any(line.strip() for line in cards_text_lines):
+            showWarning(self._t("Não há conteúdo para exportar."))
+            return
+
+        model = mw.col.models.by_name(self.lista_notetypes.currentItem().text())
+        desktop = os.path.expanduser("~/Desktop")
+        if zip_file:
+            export = ZipHtmlExport(os.path.join(desktop, "delimit.zip"), cards_text_lines, model, self._get_mapper(model), self._t)
+        else:
+            export = HtmlExport(os.path.join(desktop, "delimit.html"), cards_text_lines, model, self._get_mapper(model), self._t)
+        label = self._t("Renderizando e processando cards...")
+
+        resume = False
+        checkpoint = export.checkpoint()
+        if checkpoint:
+            reply = QMessageBox.question(
+                self, self._t("Exportar para HTML"),
+                self._t("Existe uma exportação interrompida destes cards ({} de {}). Deseja continuar de onde parou?").format(
+                    checkpoint['next_line'], len(cards_text_lines)),
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.Yes)
+            resume = reply == QMessageBox.StandardButton.Yes
+
+        # Renderização e gravação do arquivo em segundo plano
+        def op(col):
+            return export.run(
+                col, resume=resume,
+                on_progress=lambda value, total, stage=None: self.tasks.progress(value, total, stage or label),
+                should_cancel=self.tasks.want_cancel)
+
+        def on_success(path):
+            if not path:
+                if zip_file:
+                    showInfo(self._t("Exportação cancelada."))
+                else:
+                    showInfo(self._t("Exportação interrompida. Ela pode ser continuada na próxima vez que você exportar estes cards."))
+            elif zip_file:
+                openFolder(os.path.dirname(path))
+            else:
+                webbrowser.open(f"file://{os.path.abspath(path)}")
+
+        def on_failure(error):
+            QMessageBox.critical(self, self._t("Erro na Exportação"), self._t("Ocorreu um erro durante a exportação: {}").format(str(error)))
+
+        self.tasks.run(label, op, on_success, on_failure)
 
     def update_tag_numbers(self):
         linhas_tags = self.txt_tags.toPlainText().strip().split('\n')
@@ -2461,9 +2902,9 @@ class CustomDialog(QDialog):
             return
         full_text = self.txt_entrada.toPlainText()
         replaced_text = re.sub(re.escape(search_query), replace_text_str, full_text, flags=re.IGNORECASE)
-        self.txt_entrada.setPlainText(replaced_text)
+        with self.editor_pipeline.bulk():
+            self.txt_entrada.setPlainText(replaced_text)
         self.previous_text = replaced_text
-        self.update_preview()
         if replace_text_str:
             showInfo(self._t("Todas as ocorrências de '{}' foram substituídas por '{}'.").format(search_query, replace_text_str))
         else:
@@ -2610,6 +3051,9 @@ class CustomDialog(QDialog):
 
     def closeEvent(self, event):
         self._save_in_real_time()
+        if self.edit_mode:
+            self.edit_timer.stop()
+            self._apply_real_time_edit(final=True)
         if hasattr(mw, 'delimitadores_dialog'):
             mw.delimitadores_dialog = None
         if hasattr(self, 'media_dialog') and self.media_dialog:
@@ -2636,26 +3080,18 @@ class CustomDialog(QDialog):
             self.toggle_view_button.setText(self._t("📝 Editar em Grade"))
 
     def switch_to_grid_view(self):
-        text = self.txt_entrada.toPlainText()
-        lines = text.split('\n')
-        
         self.table_widget.setRowCount(0)
         self.table_widget.setColumnCount(0)
 
-        if not text.strip():
+        all_parts = [data.parts for _, data in self.parse_cache.iter_blocks()]
+        if all(len(parts) == 1 and not parts[0] for parts in all_parts):
             self.stacked_editor.setCurrentIndex(1)
             return
 
-        max_cols = 0
-        all_parts = []
-        for line in lines:
-            parts = self._get_split_parts(line)
-            all_parts.append(parts)
-            if len(parts) > max_cols:
-                max_cols = len(parts)
+        max_cols = max(len(parts) for parts in all_parts)
         
         self.table_widget.setColumnCount(max_cols)
-        self.table_widget.setRowCount(len(lines))
+        self.table_widget.setRowCount(len(all_parts))
 
         self.table_widget.setHorizontalHeaderLabels([self._t("Campo {}").format(i + 1) for i in range(max_cols)])
 
@@ -2686,29 +3122,8 @@ class CustomDialog(QDialog):
         if not arquivos:
             return
 
-        media_dir = mw.col.media.dir()
-        html_to_add = []
-
-        for caminho in arquivos:
-            nome = os.path.basename(caminho)
-            destino = os.path.join(media_dir, nome)
-            if os.path.exists(destino):
-                base, ext = os.path.splitext(nome)
-                counter = 1
-                while os.path.exists(destino):
-                    nome = f"{base}_{counter}{ext}"
-                    destino = os.path.join(media_dir, nome)
-                    counter += 1
-            shutil.copy2(caminho, destino)
-            
-            ext = os.path.splitext(nome)[1].lower()
-            if ext in ('.png', '.jpg', '.jpeg', '.gif'):
-                html_to_add.append(f'<img src="{nome}">')
-            elif ext in ('.mp3', '.wav', '.ogg'):
-                html_to_add.append(f'[sound:{nome}]')
-            else:
-                continue
-        
+        html_to_add = [tag for nome, tag, _ in media_store.add_files(mw.col, arquivos, TARGET_CELL)]
+
         current_text = item.text()
         new_text = current_text + " " + " ".join(html_to_add)
         item.setText(new_text.strip())
@@ -2725,6 +3140,7 @@ class CustomDialog(QDialog):
         return [convert(c) for c in re.split('([0-9]+)', s)]
 
     def sort_cards_alphabetically(self):
+        self._store_current_page()
         if self.card_creation_info:
             current_lines = [info[1] for info in self.card_creation_info]
             sorted_lines = sorted(current_lines, key=self.natural_sort_key)
@@ -2733,7 +3149,8 @@ class CustomDialog(QDialog):
             
             self.card_creation_info.sort(key=lambda x: self.natural_sort_key(x[1]), reverse=reverse_sort)
             self.current_view_mode = 'simple'
-            self._repopulate_ui_from_creation_info()
+            self._reset_pages()
+            self._repopulate_ui_from_creation_info(0)
             return
 
         if not self.txt_entrada.toPlainText().strip():
@@ -2756,14 +3173,17 @@ class CustomDialog(QDialog):
 
         sorted_card_lines, sorted_tag_lines = zip(*combined_lines)
 
-        self.txt_entrada.setPlainText('\n'.join(sorted_card_lines))
-        self.txt_tags.setPlainText('\n'.join(sorted_tag_lines))
+        with self.editor_pipeline.bulk():
+            self.txt_entrada.setPlainText('\n'.join(sorted_card_lines))
+            self.txt_tags.setPlainText('\n'.join(sorted_tag_lines))
 
     def sort_cards_randomly(self):
+        self._store_current_page()
         if self.card_creation_info:
             random.shuffle(self.card_creation_info)
             self.current_view_mode = 'simple'
-            self._repopulate_ui_from_creation_info()
+            self._reset_pages()
+            self._repopulate_ui_from_creation_info(0)
             return
 
         if not self.txt_entrada.toPlainText().strip():
@@ -2781,10 +3201,12 @@ class CustomDialog(QDialog):
             return
             
         shuffled_cards, shuffled_tags = zip(*combined)
-        self.txt_entrada.setPlainText('\n'.join(shuffled_cards))
-        self.txt_tags.setPlainText('\n'.join(shuffled_tags))
+        with self.editor_pipeline.bulk():
+            self.txt_entrada.setPlainText('\n'.join(shuffled_cards))
+            self.txt_tags.setPlainText('\n'.join(shuffled_tags))
 
     def sort_cards_by_creation_date(self):
+        self._store_current_page()
         if not self.card_creation_info:
             return
 
@@ -2794,59 +3216,83 @@ class CustomDialog(QDialog):
             self.card_creation_info.sort(key=lambda x: x[0])
         
         self.current_view_mode = 'date'
-        self._repopulate_ui_from_creation_info()
+        self._reset_pages()
+        self._repopulate_ui_from_creation_info(0)
 
     def sort_cards_by_lapses(self):
+        self.sort_cards_by_stat('lapses')
+
+    def sort_cards_by_stat(self, key):
+        """Ordena as notas mostradas (todas as páginas) por uma estatística de NoteStats."""
+        self._store_current_page()
         if not self.card_creation_info:
             return
 
-        if len(self.card_creation_info[0]) < 5:
-            for info in self.card_creation_info:
-                nid = info[0]
-                card_ids = mw.col.card_ids_of_note(nid)
-                
-                total_lapses = 0
-                total_reps = 0
-
-                if card_ids:
-                    for cid in card_ids:
-                        lapses_for_card = mw.col.db.scalar(
-                            "SELECT count() FROM revlog WHERE cid = ? AND ease = 1", cid
-                        )
-                        reps_for_card = mw.col.db.scalar(
-                            "SELECT count() FROM revlog WHERE cid = ?", cid
-                        )
-                        total_lapses += lapses_for_card if lapses_for_card else 0
-                        total_reps += reps_for_card if reps_for_card else 0
-                
-                info.extend([total_lapses, total_reps])
-
-        current_lapses = [info[3] for info in self.card_creation_info]
-        sorted_lapses_desc = sorted(current_lapses, reverse=True)
-        
-        reverse_sort = not (current_lapses == sorted_lapses_desc)
-
-        if reverse_sort:
-            self.mais_errados_button.setText(self._t("Mais Errados"))
-            self.mais_errados_button.setToolTip(self._t("Organizar por cards mais errados (com mais lapsos)"))
-            self.lapses_sort_descending = True
-        else:
-            self.mais_errados_button.setText(self._t("Mais Certos"))
-            self.mais_errados_button.setToolTip(self._t("Organizar por cards mais certos (com menos lapsos)"))
-            self.lapses_sort_descending = False
+        nids = [info[0] for info in self.card_creation_info]
+        stats = note_stats_cache.cached(nids)
+        if stats is not None:
+            self._apply_stat_sort(key, stats)
+            return
+
+        if not self.tasks.check_idle():
+            return
+        label = self._t("Calculando estatísticas...")
+
+        # Uma consulta para todas as notas, em segundo plano
+        def op(col):
+            return note_stats_cache.get(col, nids)
+
+        self.tasks.run(label, op, lambda stats: self._apply_stat_sort(key, stats))
+
+    def _apply_stat_sort(self, key, stats):
+        self.shown_stats = stats
+
+        def value(info):
+            stat = stats.get(info[0])
+            return getattr(stat, key) if stat is not None else None
+
+        current_values = [value(info) for info in self.card_creation_info]
+        present_values = [v for v in current_values if v is not None]
+        # Primeiro clique: decrescente; se já estiver decrescente, inverte
+        reverse_sort = not (present_values == sorted(present_values, reverse=True)
+                            and current_values[:len(present_values)] == present_values)
 
-        self.card_creation_info.sort(key=lambda x: x[3], reverse=reverse_sort)
+        if key == 'lapses':
+            if reverse_sort:
+                self.mais_errados_button.setText(self._t("Mais Errados"))
+                self.mais_errados_button.setToolTip(self._t("Organizar por cards mais errados (com mais lapsos)"))
+                self.lapses_sort_descending = True
+            else:
+                self.mais_errados_button.setText(self._t("Mais Certos"))
+                self.mais_errados_button.setToolTip(self._t("Organizar por cards mais certos (com menos lapsos)"))
+                self.lapses_sort_descending = False
+
+        # Notas sem o valor (ex.: cards novos não têm intervalo) ficam no fim
+        with_value = [info for info in self.card_creation_info if value(info) is not None]
+        without_value = [info for info in self.card_creation_info if value(info) is None]
+        with_value.sort(key=value, reverse=reverse_sort)
+        self.card_creation_info = with_value + without_value
         self.current_view_mode = 'stats'
-        self._repopulate_ui_from_creation_info()
+        self._reset_pages()
+        self._repopulate_ui_from_creation_info(0)
 
-    def _repopulate_ui_from_creation_info(self):
+    def _repopulate_ui_from_creation_info(self, page=None):
+        """
+        Mostra no editor uma página de card_creation_info (a atual, se `page`
+        não for informada). A lista completa continua em card_creation_info,
+        e shown_note_ids passa a ter os ids das notas da página, na ordem das
+        linhas do editor.
+        """
         if not self.card_creation_info:
             return
-
-        unpacked = [list(item) for item in self.card_creation_info]
-        nids = [item[0] for item in unpacked]
-        card_lines = [item[1] for item in unpacked]
-        tag_lines = [item[2] for item in unpacked]
+        if page is not None:
+            self.shown_page = max(0, min(page, self._page_count() - 1))
+        start, end = self._page_range(self.shown_page)
+        self._shown_range = (start, end)
+        page_entries = self.card_creation_info[start:end]
+        nids = [item[0] for item in page_entries]
+        card_lines = [item[1] for item in page_entries]
+        tag_lines = [item[2] for item in page_entries]
 
         self.txt_entrada.blockSignals(True)
         self.txt_tags.blockSignals(True)
@@ -2857,27 +3303,36 @@ class CustomDialog(QDialog):
         self.txt_entrada.blockSignals(False)
         self.txt_tags.blockSignals(False)
 
+        self.shown_note_ids = nids
+        self._update_shown_gutter()
+        self._update_pager()
+
+    def _update_shown_gutter(self):
+        """Numeração (com data ou estatísticas) das linhas da página mostrada."""
+        start, end = self._page_bounds()
+        nids = self.shown_note_ids
+        # A numeração continua de uma página para a outra
         if self.current_view_mode == 'date':
-            dates = [datetime.fromtimestamp(nid / 1000).strftime('%Y-%m-%d') for nid in nids]
-            numbers_with_dates = [f"{i+1} ({date_str})" for i, date_str in enumerate(dates)]
+            dates = [datetime.fromtimestamp(nid / 1000).strftime('%Y-%m-%d') if nid > 0 else "-" for nid in nids]
+            numbers_with_dates = [f"{start + i + 1} ({date_str})" for i, date_str in enumerate(dates)]
             self.txt_entrada.line_number_area.line_numbers = numbers_with_dates
         elif self.current_view_mode == 'stats':
-            stats_lines = [f"{i+1} (E:{item[3]} R:{item[4]})" for i, item in enumerate(unpacked)]
+            stats_lines = [f"{start + i + 1} ({self.shown_stats[nid].gutter_text()})" if nid in self.shown_stats else str(start + i + 1)
+                           for i, nid in enumerate(nids)]
             self.txt_entrada.line_number_area.line_numbers = stats_lines
         else: # 'simple'
-            line_count = len(self.card_creation_info)
-            self.txt_entrada.line_number_area.line_numbers = [str(i + 1) for i in range(line_count)]
+            self.txt_entrada.line_number_area.line_numbers = [str(i + 1) for i in range(start, end)]
         
         self.txt_entrada.line_number_area.update()
         self.update_line_number_area_width()
 
-        self.shown_note_ids = list(nids)
-
     def delete_deck(self):
         deck_item = self.lista_decks.currentItem()
         if not deck_item:
             showWarning(self._t("Por favor, selecione um deck para excluir."))
             return
+        if not self.tasks.check_idle():
+            return
         deck_name = deck_item.text()
 
         nids_to_delete = mw.col.find_notes(f'deck:"{deck_name}"')
@@ -2892,53 +3347,53 @@ class CustomDialog(QDialog):
         if reply != QMessageBox.StandardButton.Yes:
             return
 
-        try:
-            mw.progress.start(label=self._t("Excluindo deck..."), max=3)
+        label = self._t("Excluindo deck...")
+
+        # Verificação de mídia e exclusão em segundo plano
+        def op(col):
+            # Índice de referências: monta do zero só na primeira vez
+            def on_index_progress(done, total):
+                self.tasks.progress(done, total + 1, self._t("Indexando mídia..."))
+            if not media_index.ensure(col, on_index_progress, self.tasks.want_cancel):
+                return OpChanges()  # Nada foi excluído ainda
 
-            media_to_check = set()
+            # Um arquivo só pode ser apagado se todas as notas que o usam saem junto com o deck
+            deck_refs = {}
             for nid in nids_to_delete:
-                note = mw.col.get_note(nid)
-                if not note: continue
-                text_content = "".join(note.fields)
-                media_to_check.update(mw.col.media.files_in_str(note.mid, text_content))
-            
-            other_nids = mw.col.find_notes(f'-deck:"{deck_name}"')
-            media_in_use_elsewhere = set()
-            for nid in other_nids:
-                note = mw.col.get_note(nid)
-                if not note: continue
-                text_content = "".join(note.fields)
-                media_in_use_elsewhere.update(mw.col.media.files_in_str(note.mid, text_content))
-
-            files_to_delete = media_to_check - media_in_use_elsewhere
-            media_dir = mw.col.media.dir()
+                for fname in media_index.files_of(nid):
+                    deck_refs[fname] = deck_refs.get(fname, 0) + 1
+            files_to_delete = [fname for fname, count in deck_refs.items()
+                               if media_index.count(fname) <= count]
+            # Desfazer e importar não passam pela releitura do índice: confere na coleção
+            if files_to_delete:
+                kept = media_index.used_elsewhere(col, files_to_delete, nids_to_delete)
+                files_to_delete = [fname for fname in files_to_delete if fname not in kept]
+
+            self.tasks.progress(1, 1, self._t("Mídia verificada..."))
+
+            if nids_to_delete:
+                col.remove_notes(nids_to_delete)
+
+            deck_id = col.decks.id(deck_name)
+            changes = col.decks.remove([deck_id])
+
+            # Só depois que notas e deck saíram: se algo acima falhar, a mídia fica
+            media_dir = col.media.dir()
             for fname in files_to_delete:
                 try:
                     os.remove(os.path.join(media_dir, fname))
                 except Exception as e:
                     logging.warning(f"Não foi possível excluir o arquivo de mídia '{fname}': {e}")
-            
-            mw.progress.update(value=1, label=self._t("Mídia verificada..."))
-
-            if nids_to_delete:
-                mw.col.remove_notes(nids_to_delete)
-            
-            mw.progress.update(value=2, label=self._t("Cards excluídos..."))
-
-            deck_id = mw.col.decks.id(deck_name)
-            mw.col.decks.remove([deck_id])
-
-            mw.progress.update(value=3, label=self._t("Atualizando interface..."))
+            return changes
 
+        def on_success(changes):
+            deck_names = [d.name for d in mw.col.decks.all_names_and_ids()]
             self.lista_decks.clear()
-            self.lista_decks.addItems([d.name for d in mw.col.decks.all_names_and_ids()])
-            deck_count = len(mw.col.decks.all_names_and_ids())
-            self.decks_group.setTitle(self._t("Decks: {}").format(deck_count))
+            self.lista_decks.addItems(deck_names)
+            self.decks_group.setTitle(self._t("Decks: {}").format(len(deck_names)))
 
-            mw.progress.finish()
-            mw.reset()
+        def on_failure(error):
+            showWarning(self._t("Ocorreu um erro ao excluir o deck: {}").format(str(error)))
+            logging.error(f"Erro ao excluir deck: {error}")
 
-        except Exception as e:
-            mw.progress.finish()
-            showWarning(self._t("Ocorreu um erro ao excluir o deck: {}").format(str(e)))
-            logging.error(f"Erro ao excluir deck: {e}")
+        self.tasks.run(label, op, on_success, on_failure, mutates=True)
@@ -0,0 +1,45 @@
+# duplicates.py
+#
+# Detecção de duplicatas antes de adicionar cards. O checksum do primeiro
+# campo (o mesmo que o Anki guarda em notes.csum) de todas as linhas
+# pendentes é resolvido contra o deck de destino numa única consulta SQL,
+# que usa o índice de csum da tabela de notas.
+
+from anki.utils import field_checksum, ids2str, split_fields, strip_html_media
+
+
+def find_duplicates(col, deck_id, pending):
+    """
+    `pending` é uma lista de (id_do_tipo_de_nota, primeiro_campo). Retorna
+    {índice_em_pending: id_da_nota_existente} para as linhas cujo primeiro
+    campo já existe no deck, no mesmo tipo de nota.
+    """
+    # (mid, csum) -> [(índice, primeiro campo sem HTML)]
+    candidates = {}
+    for index, (mid, first_field) in enumerate(pending):
+        stripped = strip_html_media(first_field)
+        if not stripped.strip():
+            continue
+        candidates.setdefault((mid, field_checksum(first_field)), []).append((index, stripped))
+    if not candidates:
+        return {}
+
+    mids = {mid for mid, _ in candidates}
+    csums = {csum for _, csum in candidates}
+    rows = col.db.all(
+        f"select id, mid, csum, flds from notes where csum in {ids2str(csums)} "
+        f"and mid in {ids2str(mids)} and id in (select nid from cards where did = ?)",
+        deck_id,
+    )
+
+    duplicates = {}
+    for nid, mid, csum, flds in rows:
+        lines = candidates.get((mid, csum))
+        if not lines:
+            continue
+        # O checksum pode colidir; confirma comparando o texto do campo
+        existing = strip_html_media(split_fields(flds)[0])
+        for index, stripped in lines:
+            if stripped == existing:
+                duplicates.setdefault(index, nid)
+    return duplicates
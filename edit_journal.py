@@ -0,0 +1,246 @@
+# edit_journal.py
+#
+# Diário das edições feitas no modo de edição. Guarda como cada nota estava
+# quando foi mostrada (linha, etiquetas e note.mod) e o que mudou desde
+# então: linhas alteradas, linhas inseridas (notas novas) e linhas removidas
+# (notas a excluir). Na gravação, só os campos que realmente mudaram são
+# escritos, e tudo vai numa única operação; notas alteradas em outro lugar
+# depois de mostradas são devolvidas como conflito em vez de sobrescritas.
+# Linhas removidas deixam uma marca (texto e etiquetas): se a mesma linha
+# voltar depois (recortar e colar, desfazer), ela recupera a nota original.
+
+from difflib import SequenceMatcher
+from anki.errors import NotFoundError
+from anki.utils import ids2str
+
+
+def align_lines(old_lines, new_lines):
+    """
+    Alinha o texto editado ao anterior. Retorna, para cada linha nova, o
+    índice da linha antiga que ela continua (None = linha inserida).
+
+    As linhas são comparadas pelo conteúdo: trechos iguais mantêm a
+    correspondência, uma linha idêntica que saiu de um ponto e apareceu em
+    outro é tratada como movida, e dentro de um trecho substituído as linhas
+    que sobram são pareadas na ordem, como edições.
+    """
+    matcher = SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    opcodes = matcher.get_opcodes()
+    result = [None] * len(new_lines)
+    used = set()
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == 'equal':
+            for k in range(i2 - i1):
+                result[j1 + k] = i1 + k
+                used.add(i1 + k)
+
+    # Linhas movidas: o mesmo conteúdo removido num ponto e inserido em outro
+    removed = {}
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag in ('delete', 'replace'):
+            for i in range(i1, i2):
+                removed.setdefault(old_lines[i], []).append(i)
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag in ('insert', 'replace'):
+            for j in range(j1, j2):
+                candidates = removed.get(new_lines[j])
+                if candidates:
+                    i = candidates.pop(0)
+                    result[j] = i
+                    used.add(i)
+
+    # Linhas editadas: o que sobrou de cada trecho substituído, na ordem
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == 'replace':
+            olds = [i for i in range(i1, i2) if i not in used]
+            news = [j for j in range(j1, j2) if result[j] is None]
+            for i, j in zip(olds, news):
+                result[j] = i
+                used.add(i)
+    return result
+
+
+class PendingEdits:
+    """Alterações copiadas do diário para uma gravação em segundo plano."""
+    __slots__ = ('updates', 'added', 'deleted', 'revision')
+
+    def __init__(self, updates, added, deleted, revision):
+        self.updates = updates  # id da nota -> (linha, etiquetas)
+        self.added = added      # id provisório -> (linha, etiquetas)
+        self.deleted = deleted  # ids das notas a excluir
+        self.revision = revision
+
+
+class PreparedEdits:
+    """Resultado de EditJournal.prepare, pronto para gravar na coleção."""
+    __slots__ = ('notes', 'added', 'deleted', 'conflicts')
+
+    def __init__(self):
+        self.notes = []      # notas existentes alteradas
+        self.added = []      # (id provisório, nota nova)
+        self.deleted = []    # ids das notas a excluir
+        self.conflicts = []  # ids alterados fora do editor
+
+    def __bool__(self):
+        return bool(self.notes or self.added or self.deleted)
+
+
+class EditJournal:
+    """Retrato das notas mostradas e alterações ainda não gravadas."""
+
+    def __init__(self, loaded):
+        """`loaded`: (id_da_nota, linha, etiquetas, mod) de cada nota mostrada."""
+        self.snapshot = {nid: (line, tags, mod) for nid, line, tags, mod in loaded}
+        self.dirty = {}        # id da nota -> (linha, etiquetas) atuais
+        self.new_lines = {}    # id provisório (negativo) -> (linha, etiquetas) de linhas inseridas
+        self.deleted = set()   # notas cujas linhas foram removidas
+        self.removed = {}      # id da nota removida -> (linha, etiquetas) quando saiu do editor
+        self._deleting = set() # exclusões na gravação em andamento (não podem mais ser recuperadas)
+        self.conflicts = set() # notas alteradas fora do editor depois de mostradas
+        self.revision = 0      # muda a cada registro, para saber se houve edição durante a gravação
+        self._next_new_id = -1
+
+    def __len__(self):
+        return len(self.dirty) + len(self.new_lines) + len(self.deleted)
+
+    def new_id(self):
+        """Id provisório para uma linha inserida; vira o id real ao gravar."""
+        nid = self._next_new_id
+        self._next_new_id -= 1
+        return nid
+
+    def record(self, nid, line, tags):
+        """Registra o conteúdo atual da linha de `nid` (thread principal)."""
+        self.revision += 1
+        if nid < 0:
+            self.new_lines[nid] = (line, tags)
+            return
+        snapshot = self.snapshot.get(nid)
+        if snapshot is None or nid in self.conflicts:
+            return
+        if (line, tags) == snapshot[:2]:
+            self.dirty.pop(nid, None)
+        else:
+            self.dirty[nid] = (line, tags)
+
+    def remove(self, nid, line="", tags=""):
+        """A linha de `nid` (com este texto e etiquetas) foi apagada do editor."""
+        self.revision += 1
+        if nid < 0:
+            self.new_lines.pop(nid, None)
+        elif nid in self.snapshot and nid not in self.conflicts:
+            self.dirty.pop(nid, None)
+            self.deleted.add(nid)
+            self.removed[nid] = (line, tags)
+
+    def reclaim(self, line):
+        """
+        Nota removida ainda não excluída cuja linha era `line` (no momento da
+        remoção ou quando foi mostrada). Retorna (id, etiquetas) e tira a
+        nota da lista de exclusão, ou None.
+        """
+        for nid, (removed_line, tags) in self.removed.items():
+            if nid in self._deleting:
+                continue
+            if line == removed_line or line == self.snapshot[nid][0]:
+                del self.removed[nid]
+                self.deleted.discard(nid)
+                self.revision += 1
+                return nid, tags
+        return None
+
+    def pending(self, include_deleted=True):
+        """
+        Cópia das alterações a gravar, para a operação em segundo plano. A
+        gravação automática deixa as exclusões para a gravação explícita,
+        para que uma linha recortada e colada depois ainda recupere a nota.
+        """
+        deleted = set(self.deleted) if include_deleted else set()
+        self._deleting = deleted
+        return PendingEdits(dict(self.dirty), dict(self.new_lines), deleted, self.revision)
+
+    def prepare(self, col, pending, mapper_for, build_note):
+        """
+        Monta as notas a gravar. `mapper_for(modelo)` devolve o CompiledMapper
+        do tipo de nota; `build_note(col, linha, etiquetas)` cria a nota de
+        uma linha inserida, ou None se a linha ainda não é um card. Os campos
+        da linha salva no diário são comparados aos da linha mostrada, e só os
+        que mudaram são escritos; os demais mantêm o conteúdo original.
+        """
+        prepared = PreparedEdits()
+        for nid, (line, tags) in pending.updates.items():
+            old_line, old_tags, mod = self.snapshot[nid]
+            try:
+                note = col.get_note(nid)
+            except NotFoundError:
+                prepared.conflicts.append(nid)
+                continue
+            if note.mod != mod:
+                prepared.conflicts.append(nid)
+                continue
+            changed = False
+            if line != old_line:
+                mapper = mapper_for(note.note_type())
+                new_fields = mapper.map_line(line)
+                old_fields = mapper.map_line(old_line)
+                for index, (new, old) in enumerate(zip(new_fields, old_fields)):
+                    if new != old and note.fields[index] != new:
+                        note.fields[index] = new
+                        changed = True
+            if tags != old_tags:
+                note.tags = col.tags.split(tags)
+                changed = True
+            if changed:
+                prepared.notes.append(note)
+
+        for new_id, (line, tags) in pending.added.items():
+            note = build_note(col, line, tags)
+            if note is not None:
+                prepared.added.append((new_id, note))
+
+        # Notas já excluídas em outro lugar não precisam de nada
+        for nid, mod in self.read_mods(col, pending.deleted).items():
+            if mod != self.snapshot[nid][2]:
+                prepared.conflicts.append(nid)
+            else:
+                prepared.deleted.append(nid)
+        return prepared
+
+    @staticmethod
+    def read_mods(col, nids):
+        return dict(col.db.all(f"select id, mod from notes where id in {ids2str(nids)}")) if nids else {}
+
+    def mark_committed(self, pending, mods, conflicts, added):
+        """
+        Atualiza o retrato depois da gravação (thread principal). `added` é
+        {id provisório: id da nota criada}. Linhas editadas de novo durante a
+        gravação continuam pendentes.
+        """
+        for nid in conflicts:
+            self.conflicts.add(nid)
+            self.dirty.pop(nid, None)
+            self.deleted.discard(nid)
+            self.removed.pop(nid, None)
+        for nid, (line, tags) in pending.updates.items():
+            if nid in self.conflicts or nid not in self.snapshot:
+                continue
+            mod = mods.get(nid, self.snapshot[nid][2])
+            self.snapshot[nid] = (line, tags, mod)
+            if self.dirty.get(nid) == (line, tags):
+                del self.dirty[nid]
+        for new_id, nid in added.items():
+            line, tags = pending.added[new_id]
+            self.snapshot[nid] = (line, tags, mods.get(nid))
+            current = self.new_lines.pop(new_id, None)
+            if current is None:
+                # A linha foi apagada enquanto a nota era criada
+                self.deleted.add(nid)
+                self.removed[nid] = (line, tags)
+            elif current != (line, tags):
+                self.dirty[nid] = current
+        self._deleting = set()
+        for nid in pending.deleted:
+            if nid not in self.conflicts:
+                self.snapshot.pop(nid, None)
+                self.deleted.discard(nid)
+                self.removed.pop(nid, None)
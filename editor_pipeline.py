@@ -0,0 +1,148 @@
+# editor_pipeline.py
+
+import logging
+from contextlib import contextmanager
+from aqt.qt import QObject, QTimer
+
+# Janela para juntar rajadas de alterações (colar, IME, autorepetição de tecla)
+COALESCE_MS = 16
+
+
+class EditRange:
+    """Intervalo de blocos (linhas) afetado pelas alterações desde a última execução."""
+
+    def __init__(self, first_block, last_block, full=False):
+        self.first_block = first_block
+        self.last_block = last_block
+        self.full = full
+
+    def contains(self, block_number):
+        return self.full or self.first_block <= block_number <= self.last_block
+
+    def blocks(self, document):
+        """Percorre os QTextBlocks do intervalo."""
+        if self.full:
+            block = document.firstBlock()
+            last = document.blockCount() - 1
+        else:
+            block = document.findBlockByNumber(self.first_block)
+            last = self.last_block
+        while block.isValid() and block.blockNumber() <= last:
+            yield block
+            block = block.next()
+
+    def __repr__(self):
+        return f"EditRange({self.first_block}, {self.last_block}, full={self.full})"
+
+
+class EditorPipeline(QObject):
+    """
+    Despachante único para as atualizações derivadas do texto do editor.
+
+    As alterações chegam por QTextDocument.contentsChange, o intervalo de
+    blocos afetado é acumulado e, depois de uma pequena janela, os estágios
+    registrados rodam em ordem uma única vez sobre esse intervalo.
+    Alterações feitas com os sinais do editor bloqueados (blockSignals) não
+    disparam os estágios, como acontecia com textChanged, mas fazem a próxima
+    execução cobrir o documento inteiro, já que o intervalo se perdeu.
+    """
+
+    def __init__(self, editor, parent=None):
+        super().__init__(parent)
+        self.editor = editor
+        self.document = editor.document()
+        self.stages = []
+        self._bulk_depth = 0
+        self._in_flush = False
+        self._stale = False
+        self._reset_pending()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(COALESCE_MS)
+        self._timer.timeout.connect(self.flush)
+
+        self.document.contentsChange.connect(self._on_contents_change)
+        self.editor.textChanged.connect(self._schedule)
+
+    def add_stage(self, name, callback):
+        """Registra um estágio; callback recebe um EditRange."""
+        self.stages.append((name, callback))
+
+    def _reset_pending(self):
+        self._first_block = None
+        self._last_block = None
+        self._full = False
+
+    def has_pending(self):
+        return self._full or self._first_block is not None
+
+    def _on_contents_change(self, position, removed, added):
+        if self._bulk_depth or self._in_flush:
+            # Edições feitas pelos próprios estágios já estão dentro do intervalo
+            return
+        if self.editor.signalsBlocked():
+            self._stale = True
+            return
+        first = self.document.findBlock(position).blockNumber()
+        last_block = self.document.findBlock(position + added)
+        last = last_block.blockNumber() if last_block.isValid() else self.document.blockCount() - 1
+        if first < 0:
+            self._full = True
+            return
+        if self._first_block is None:
+            self._first_block, self._last_block = first, max(first, last)
+        else:
+            # Linhas inseridas ou removidas deslocam o fim do intervalo anterior
+            self._first_block = min(self._first_block, first)
+            self._last_block = max(self._last_block, last)
+
+    def _schedule(self):
+        if self.editor.signalsBlocked() or self._bulk_depth:
+            return
+        if not self.has_pending():
+            # textChanged sem contentsChange correspondente: trata como geral
+            self._full = True
+        self._timer.start()
+
+    def mark_all_dirty(self):
+        self._full = True
+        self._timer.start()
+
+    @contextmanager
+    def bulk(self):
+        """
+        Transação em lote: alterações feitas dentro do bloco `with` não
+        disparam os estágios; ao sair, roda uma única atualização completa.
+        """
+        self._bulk_depth += 1
+        try:
+            yield
+        finally:
+            self._bulk_depth -= 1
+            if not self._bulk_depth:
+                self._full = True
+                self.flush()
+
+    def flush(self):
+        """Roda os estágios imediatamente para as alterações pendentes."""
+        self._timer.stop()
+        if not self.has_pending():
+            return
+        if self._full or self._stale:
+            change = EditRange(0, self.document.blockCount() - 1, full=True)
+            self._stale = False
+        else:
+            last = min(self._last_block, self.document.blockCount() - 1)
+            change = EditRange(self._first_block, max(self._first_block, last))
+        self._reset_pending()
+
+        self._in_flush = True
+        try:
+            for name, callback in self.stages:
+                try:
+                    callback(change)
+                except Exception as e:
+                    logging.error(f"Erro no estágio '{name}' do editor: {e}")
+        finally:
+            self._in_flush = False
@@ -182,6 +182,7 @@ TRANSLATIONS = {
     "Salvar como HTML": "Save as HTML",
     "Impressão": "Print",
     "Nenhum card para visualizar.": "No cards to view.",
+    "Card {}": "Card {}",
     "Conteúdo copiado para a área de transferência!": "Content copied to clipboard!",
     "Salvar Arquivo HTML": "Save HTML File",
     "Arquivo HTML salvo em: {}": "HTML file saved at: {}",
@@ -202,5 +203,81 @@ TRANSLATIONS = {
     "beginner_instructions_example_title": "Example:",
     "beginner_instructions_example_text": "capital of the USA; Washington",
 
+    # File import
+    "Importar Arquivo...": "Import File...",
+    "Importar Arquivo": "Import File",
+    "Importar arquivo": "Import file",
+    "Importa um arquivo de texto grande direto para o deck, sem carregá-lo no editor": "Imports a large text file straight into the deck, without loading it into the editor",
+    "Importando arquivo...": "Importing file...",
+    "Importando: {} cards - restante {}": "Importing: {} cards - {} remaining",
+    "Erro ao importar o arquivo: {}": "Error importing the file: {}",
+    "Importação cancelada. {} cards adicionados.": "Import cancelled. {} cards added.",
+    "{} cards importados em {:.1f}s.": "{} cards imported in {:.1f}s.",
 
+    # Batched card adding
+    "Adicionar Cards": "Add Cards",
+    "Adicionando cards...": "Adding cards...",
+    "Adicionando cards... {}/{}": "Adding cards... {}/{}",
+    "Erro ao adicionar cards: {}": "Error adding cards: {}",
+    "Linhas não adicionadas (erro ao criar a nota): {}": "Lines not added (error creating the note): {}",
+    "{} linha(s) do arquivo não importada(s) por erro ao criar a nota.": "{} line(s) from the file not imported due to an error creating the note.",
+    "Operação cancelada. {} cards adicionados.": "Operation cancelled. {} cards added.",
+
+    # Background operations
+    "Carregando cards do deck...": "Loading deck cards...",
+    "Calculando estatísticas...": "Calculating statistics...",
+    "Cancelar": "Cancel",
+    "Cancelando...": "Cancelling...",
+    "Aguarde o fim da operação em andamento: {}": "Please wait for the current operation to finish: {}",
+    "Ocorreu um erro: {}": "An error occurred: {}",
+
+    # Duplicates
+    "Verificando duplicatas...": "Checking for duplicates...",
+    "Duplicatas encontradas": "Duplicates found",
+    "{} linha(s) já existem neste deck (marcadas na numeração). O que deseja fazer?": "{} line(s) already exist in this deck (marked in the line numbers). What do you want to do?",
+    "Pular duplicatas": "Skip duplicates",
+    "Adicionar mesmo assim": "Add anyway",
+    "Atualizar existentes": "Update existing",
+    "{} cards adicionados e {} atualizados.": "{} cards added and {} updated.",
+
+    # Card viewer
+    "Erro ao renderizar card {}:": "Error rendering card {}:",
+
+    # Resumable export
+    "Existe uma exportação interrompida destes cards ({} de {}). Deseja continuar de onde parou?": "There is an interrupted export of these cards ({} of {}). Do you want to continue where it stopped?",
+    "Exportação interrompida. Ela pode ser continuada na próxima vez que você exportar estes cards.": "Export interrupted. It can be resumed the next time you export these cards.",
+
+    # ZIP export
+    "Exportar ZIP": "Export ZIP",
+    "Exportar cards para um ZIP com HTML, pasta de mídia e MathJax, para uso offline": "Export cards to a ZIP with HTML, a media folder and MathJax, for offline use",
+    "Copiando mídia...": "Copying media...",
+    "Exportação cancelada.": "Export cancelled.",
+
+    # Pager
+    "Página": "Page",
+    "de {}": "of {}",
+
+    # Sort by review statistics
+    "Organizar os cards mostrados por uma estatística de revisão": "Sort the shown cards by a review statistic",
+    "Lapsos": "Lapses",
+    "Revisões": "Reviews",
+    "Intervalo": "Interval",
+    "Facilidade": "Ease",
+    "Vencimento": "Due",
+    "Última Revisão": "Last Review",
+
+    # Edit mode
+    "Salvando edições...": "Saving edits...",
+    "{} card(s) atualizado(s)!": "{} card(s) updated!",
+    "Alterações pendentes: {}": "Pending changes: {}",
+    "{} nota(s) foram alteradas ou excluídas fora deste editor depois de mostradas e não foram sobrescritas (linhas: {}). Use 'Mostrar' novamente para carregar a versão atual.": "{} note(s) were changed or deleted outside this editor after being shown and were not overwritten (lines: {}). Use 'Show' again to load the current version.",
+
+    # Media index
+    "Indexando mídia...": "Indexing media...",
+
+    # Media copying
+    "Copiando mídia ({}/{})...": "Copying media ({}/{})...",
+    "Não foi possível copiar: {}": "Could not copy: {}",
+    "[copiando {}: {}]": "[copying {}: {}]",
+    "Ocorreu um erro ao copiar a mídia: {}": "An error occurred while copying the media: {}",
 }
\ No newline at end of file
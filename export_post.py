@@ -0,0 +1,167 @@
+# export_post.py
+#
+# Pós-processamento dos cards da exportação para HTML (isolar ou remover
+# JavaScript e trocar referências de mídia pela tabela de recursos ou pela
+# pasta media/ da exportação em ZIP). É só regex sobre texto, sem Anki nem
+# Qt, e roda em série, lote a lote, na thread da exportação: o trabalho
+# segura o GIL, então threads não aceleram, e um pool de processos dentro
+# do Anki teria de iniciar outra cópia do executável do Anki.
+
+import base64
+import hashlib
+import mimetypes
+import os
+import re
+from urllib.parse import quote, unquote
+
+CHUNK_SIZE = 50  # cards por lote (cada lote vira uma escrita no arquivo)
+MEDIA_FOLDER = "media"  # pasta da mídia na exportação em ZIP
+# Muda quando o HTML gerado muda, para não retomar exportações no formato antigo
+OUTPUT_FORMAT = 2
+
+# Blocos <script> ficam de fora da troca de referências
+SCRIPT_BLOCK_PATTERN = re.compile(r"(<script\b[^>]*>.*?</script\s*>)", re.DOTALL | re.IGNORECASE)
+TAG_PATTERN = re.compile(r"<[a-zA-Z][^>]*>")
+# Atributo src de verdade (não data-src e afins), com aspas
+SRC_ATTR_PATTERN = re.compile(r"""(?<![\w:-])(src\s*=\s*)(["'])([^"']+)\2""", re.IGNORECASE)
+CSS_URL_PATTERN = re.compile(r"""url\(\s*(["']?)([^"')]+)\1\s*\)""", re.IGNORECASE)
+
+MIME_TYPES = {
+    '.jpg': 'image/jpeg', '.jpeg': 'image/jpeg', '.png': 'image/png', '.gif': 'image/gif',
+    '.svg': 'image/svg+xml', '.webp': 'image/webp',
+    '.woff': 'font/woff', '.woff2': 'font/woff2', '.ttf': 'font/ttf', '.otf': 'font/otf',
+}
+
+
+def process_card_html_isolate_js(html_content):
+    """ESTRATÉGIA 1: Isola o JavaScript para notas padrão (Cloze, etc.)."""
+    if not html_content: return ""
+    processed_html = re.sub(r"\[\[type:[^]]+\]\]", "", html_content)
+    def scope_script_tag(match):
+        original_script = match.group(1)
+        scoped_script = original_script.replace('document.querySelectorAll', 'cardElement.querySelectorAll').replace('document.querySelector', 'cardElement.querySelector')
+        scoped_script = re.sub(r"document\.getElementById\((['\"])([^'\"]+)\1\)", r"cardElement.querySelector('#\2')", scoped_script)
+        scoped_script = re.sub(r"window\.(addEventListener|ankiDidShowQuestion|ankiDidShowAnswer)\s*=\s*function\(\)[\s\S]*?};?", "", scoped_script, flags=re.DOTALL)
+        return f"""<script>(function(){{const cardElement=document.currentScript.closest('.card-item');if(!cardElement)return;try{{{scoped_script}}}catch(e){{console.error('Error in scoped script for card:',cardElement.id,e);}}}})();</script>"""
+    return re.sub(r"<script>([\s\S]*?)</script>", scope_script_tag, processed_html, flags=re.DOTALL)
+
+
+def process_card_html_remove_js(html_content):
+    """ESTRATÉGIA 2: Remove completamente o JavaScript para Oclusão de Imagem."""
+    if not html_content: return ""
+    return re.sub(r"<script>.*?</script>", "", html_content, flags=re.DOTALL)
+
+
+def file_data_url(path):
+    """Conteúdo de `path` como data URL Base64, ou None se não puder ser lido."""
+    ext = os.path.splitext(path)[1].lower()
+    mime_type = MIME_TYPES.get(ext) or mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    try:
+        with open(path, 'rb') as f:
+            data = base64.b64encode(f.read()).decode('ascii')
+    except OSError:
+        return None
+    return f"data:{mime_type};base64,{data}"
+
+
+def asset_key(filename):
+    """Identificador estável de um arquivo de mídia, igual em qualquer exportação."""
+    return hashlib.sha1(filename.encode('utf-8')).hexdigest()[:12]
+
+
+class AssetRefs:
+    """
+    Referências de mídia encontradas nos cards. Cada arquivo recebe um
+    identificador derivado do nome, então lotes diferentes (e uma
+    exportação retomada) chegam ao mesmo identificador sem compartilhar
+    estado.
+
+    Atributos src apontam para a tabela de data URLs; url() de CSS recebe
+    o data URL direto, já que var() não vale em todo lugar (ex.: @font-face)
+    e o CSS de cada tipo de nota só é emitido uma vez. Com inline=False
+    (exportação em ZIP) as duas apontam para a pasta media/ ao lado do HTML.
+    """
+
+    def __init__(self, media_dir, inline=True):
+        self.media_dir = media_dir
+        self.inline = inline
+        self.filenames = {}   # identificador -> nome do arquivo
+        self.missing = set()  # arquivos referenciados que não existem
+        self._data_urls = {}  # identificador -> data URL já lido (só para CSS)
+
+    def asset_id(self, filename):
+        key = asset_key(filename)
+        if key in self.filenames:
+            return key
+        if filename in self.missing:
+            return None
+        if os.path.exists(os.path.join(self.media_dir, unquote(filename))):
+            self.filenames[key] = filename
+            return key
+        self.missing.add(filename)
+        return None
+
+    def embed(self, content):
+        """Troca as referências a arquivos locais fora de <script> (src de tags e url() de CSS)."""
+        if not content: return ""
+        parts = SCRIPT_BLOCK_PATTERN.split(content)
+        for i in range(0, len(parts), 2):  # índices pares: texto fora de <script>
+            text = TAG_PATTERN.sub(lambda tag: SRC_ATTR_PATTERN.sub(self._replace_src, tag.group(0)), parts[i])
+            parts[i] = CSS_URL_PATTERN.sub(self._replace_css_url, text)
+        return "".join(parts)
+
+    def _local_asset(self, filename):
+        if filename.startswith(('http:', 'https:', 'data:', '//', '#')):
+            return None
+        return self.asset_id(filename)
+
+    def _replace_src(self, match):
+        filename = match.group(3)
+        asset = self._local_asset(filename)
+        if asset is None:
+            return match.group(0)
+        if not self.inline:
+            return f'{match.group(1)}{match.group(2)}{MEDIA_FOLDER}/{filename}{match.group(2)}'
+        return f'data-delim-asset="{asset}"'
+
+    def _replace_css_url(self, match):
+        filename = match.group(2).strip()
+        asset = self._local_asset(filename)
+        if asset is None:
+            return match.group(0)
+        if not self.inline:
+            # Sem aspas, que podem conflitar com as do atributo style
+            return f'url({MEDIA_FOLDER}/{quote(unquote(filename))})'
+        data_url = self._data_urls.get(asset)
+        if data_url is None:
+            data_url = self._data_urls[asset] = file_data_url(os.path.join(self.media_dir, unquote(filename)))
+        return f'url({data_url})' if data_url else match.group(0)
+
+    def merge(self, other):
+        self.filenames.update(other.filenames)
+        self.missing.update(other.missing)
+
+
+def post_process_chunk(media_dir, remove_js, labels, items, inline=True):
+    """
+    Converte (índice, frente, verso) já renderizados no HTML final de cada
+    card. Retorna ([(índice, html)], AssetRefs com a mídia referenciada).
+    """
+    refs = AssetRefs(media_dir, inline)
+    process = process_card_html_remove_js if remove_js else process_card_html_isolate_js
+    front_label, back_label = labels
+    results = []
+    for i, front_raw, back_raw in items:
+        if front_raw is None:
+            results.append((i, ""))
+            continue
+        front_final = refs.embed(process(front_raw))
+        back_final = refs.embed(process(back_raw))
+        final_html = (f'<div class="side-title">{front_label}</div>{front_final}'
+                      f'<div class="separator"></div>'
+                      f'<div class="side-title">{back_label}</div>{back_final}')
+        results.append((i, f'<div class="card-item card" id="card-item-{i}">'
+                           f'<div class="card-content-wrapper">{final_html}</div>'
+                           '</div>'))
+    return results, refs
+
@@ -2,10 +2,17 @@
 
 import os
 import re
-import base64
+import hashlib
+import json
+import zipfile
+from itertools import islice
 from urllib.parse import unquote
 from aqt import mw
-from aqt.utils import showWarning
+from .render_cache import render_cache
+from . import export_post
+
+process_card_html_isolate_js = export_post.process_card_html_isolate_js
+process_card_html_remove_js = export_post.process_card_html_remove_js
 
 # --- FUNÇÕES AUXILIARES ---
 
@@ -37,126 +44,321 @@ def get_common_css(cards_per_row):
 
 def get_pure_back_content(card):
     """Extrai apenas o conteúdo do verso."""
-    answer_html = card.render_output(True, False).answer_text
+    answer_html = card.render_output().answer_text
     parts = re.split(r'<hr id=[\'"]?answer[\'"]?>', answer_html, maxsplit=1)
     return parts[1] if len(parts) > 1 else answer_html
 
-def media_to_data_url(filename):
+def media_to_data_url(filename, media_dir=None):
     """Converte um arquivo de mídia local para um data URL Base64."""
     if not filename: return None
-    decoded_filename = unquote(filename)
-    media_dir = mw.col.media.dir()
+    media_dir = media_dir or mw.col.media.dir()
     if not media_dir: return None
-    file_path = os.path.join(media_dir, decoded_filename)
-    if not os.path.exists(file_path): return None
-    ext = os.path.splitext(decoded_filename)[1].lower()
-    mime_type = {'.jpg': 'image/jpeg', '.jpeg': 'image/jpeg', '.png': 'image/png', '.gif': 'image/gif', '.svg': 'image/svg+xml'}.get(ext, 'application/octet-stream')
-    try:
-        with open(file_path, 'rb') as f:
-            data = base64.b64encode(f.read()).decode('utf-8')
-        return f"data:{mime_type};base64,{data}"
-    except Exception:
-        return None
+    return export_post.file_data_url(os.path.join(media_dir, unquote(filename)))
+
+class ExportAssets(export_post.AssetRefs):
+    """
+    Tabela de recursos compartilhados da exportação. Cada arquivo de mídia é
+    codificado em Base64 uma única vez e os cards apenas apontam para ele
+    (data-delim-asset="id" no HTML; em url() de CSS o data URL vai direto); o CSS de
+    cada tipo de nota também é emitido uma única vez. Só os nomes dos
+    arquivos ficam na memória: a codificação acontece ao gravar a tabela.
+    Com inline=False os cards apontam para media/ e não há tabela.
+    """
+
+    def __init__(self, media_dir, inline=True):
+        super().__init__(media_dir, inline)
+        self.emitted_css = set()
 
-def find_and_embed_media(content: str) -> str:
-    """Encontra e embute todas as mídias (imagens e CSS) de forma robusta."""
-    if not content: return ""
-    media_references = re.findall(r'src\s*=\s*["\']([^"\']+)["\']|url\s*\(\s*["\']?([^"\')]+)["\']?\s*\)', content, re.IGNORECASE)
-    filenames_to_process = {src or url for src, url in media_references if (src or url) and not (src or url).startswith(('http', 'data:'))}
-    for original in filenames_to_process:
-        data_url = media_to_data_url(original)
-        if data_url:
-            content = content.replace(f'"{original}"', f'"{data_url}"').replace(f"'{original}'", f"'{data_url}'").replace(f'({original})', f'({data_url})').replace(f"('{original}')", f"('{data_url}')")
-    return content
-
-def process_card_html_isolate_js(html_content):
-    """ESTRATÉGIA 1: Isola o JavaScript para notas padrão (Cloze, etc.)."""
-    if not html_content: return ""
-    processed_html = re.sub(r"\[\[type:[^]]+\]\]", "", html_content)
-    def scope_script_tag(match):
-        original_script = match.group(1)
-        scoped_script = original_script.replace('document.querySelectorAll', 'cardElement.querySelectorAll').replace('document.querySelector', 'cardElement.querySelector')
-        scoped_script = re.sub(r"document\.getElementById\((['\"])([^'\"]+)\1\)", r"cardElement.querySelector('#\2')", scoped_script)
-        scoped_script = re.sub(r"window\.(addEventListener|ankiDidShowQuestion|ankiDidShowAnswer)\s*=\s*function\(\)[\s\S]*?};?", "", scoped_script, flags=re.DOTALL)
-        return f"""<script>(function(){{const cardElement=document.currentScript.closest('.card-item');if(!cardElement)return;try{{{scoped_script}}}catch(e){{console.error('Error in scoped script for card:',cardElement.id,e);}}}})();</script>"""
-    return re.sub(r"<script>([\s\S]*?)</script>", scope_script_tag, processed_html, flags=re.DOTALL)
-
-def process_card_html_remove_js(html_content):
-    """ESTRATÉGIA 2: Remove completamente o JavaScript para Oclusão de Imagem."""
-    if not html_content: return ""
-    return re.sub(r"<script>.*?</script>", "", html_content, flags=re.DOTALL)
+    def note_type_css(self, model):
+        """CSS do tipo de nota na primeira vez em que aparece; depois, vazio."""
+        if model['id'] in self.emitted_css:
+            return ""
+        self.emitted_css.add(model['id'])
+        return f"<style>{self.embed(model.get('css', ''))}</style>"
+
+    def iter_table(self):
+        """Script, no fim do documento, que aplica os data URLs aos elementos."""
+        if not self.filenames or not self.inline:
+            return
+        yield "<script>(function(){const assets={"
+        for n, (key, filename) in enumerate(self.filenames.items()):
+            data_url = media_to_data_url(filename, self.media_dir) or ""
+            yield ("," if n else "") + f'"{key}":' + json.dumps(data_url)
+        yield ("};"
+               "document.querySelectorAll('[data-delim-asset]').forEach(function(el){el.src=assets[el.dataset.delimAsset];"
+               "var media=el.closest('audio,video');if(media)media.load();});"
+               "})();</script>")
+
+    def state(self):
+        return {'filenames': self.filenames, 'missing': sorted(self.missing),
+                'emitted_css': sorted(self.emitted_css)}
+
+    def restore(self, state):
+        self.filenames = dict(state['filenames'])
+        self.missing = set(state['missing'])
+        self.emitted_css = set(state['emitted_css'])
 
 # --- FUNÇÃO PRINCIPAL DE EXPORTAÇÃO (COM LÓGICA HÍBRIDA E CORREÇÃO) ---
 
-def generate_export_html(self, translator):
+CARDS_PER_ROW = 3
+WRITE_BUFFER_SIZE = 1024 * 1024
+CHECKPOINT_EVERY = 200  # cards entre pontos de retomada gravados em disco
+
+MATHJAX_CDN = "https://cdn.jsdelivr.net/npm/mathjax@3/es5/tex-mml-chtml.js"
+MATHJAX_FOLDER = "mathjax"  # pasta do MathJax dentro do ZIP
+# Arquivos de entrada do MathJax distribuído com o Anki, do mais novo ao mais antigo
+MATHJAX_ENTRY_FILES = ("tex-chtml-full.js", "tex-chtml.js", "tex-mml-chtml.js")
+# Extensões que valem a pena comprimir no ZIP (imagens, áudio e vídeo já vêm comprimidos)
+DEFLATE_EXTENSIONS = {'.svg', '.css', '.js', '.html', '.htm', '.txt', '.json', '.xml'}
+
+def export_header(translator, mathjax_src=MATHJAX_CDN):
     _t = translator
-    if not self.lista_notetypes.currentItem():
-        showWarning(_t("Por favor, selecione um Tipo de Nota para exportar."))
-        return None
-    cards_text_lines = self.txt_entrada.toPlainText().strip().split('\n')
-    if not any(line.strip() for line in cards_text_lines):
-        showWarning(_t("Não há conteúdo para exportar."))
+    # startup.typeset=false: nada é processado no carregamento; export_footer
+    # processa cada card quando ele aparece na tela
+    mathjax_script = ('<script>window.MathJax={startup:{typeset:false}};</script>'
+                      f'<script id="MathJax-script" async src="{mathjax_src}"></script>')
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{_t('Cards Exportados')}</title>{get_common_css(CARDS_PER_ROW)}{mathjax_script}</head><body>"
+            f'<h1>{_t("Cards Exportados")}</h1><div class="card-grid">')
+
+def export_footer():
+    """Fecha a grade e processa o MathJax só dos cards visíveis (e de todos ao imprimir)."""
+    return ("</div><script>(function(){"
+            "function typeset(els){if(window.MathJax&&MathJax.typesetPromise){return MathJax.typesetPromise(els);}"
+            "setTimeout(function(){typeset(els);},200);}"
+            "const cards=document.querySelectorAll('.card-item');"
+            "if(!('IntersectionObserver' in window)){typeset(Array.from(cards));return;}"
+            "const observer=new IntersectionObserver(function(entries){"
+            "const visible=entries.filter(function(e){return e.isIntersecting;}).map(function(e){return e.target;});"
+            "visible.forEach(function(el){observer.unobserve(el);});"
+            "if(visible.length)typeset(visible);},{rootMargin:'300px'});"
+            "cards.forEach(function(el){observer.observe(el);});"
+            "window.addEventListener('beforeprint',function(){observer.disconnect();typeset(Array.from(cards));});"
+            "})();</script>")
+
+def anki_mathjax_dir():
+    """
+    Pasta e arquivo de entrada do MathJax que acompanha o Anki, ou
+    (None, None) se não for encontrado.
+    """
+    try:
+        from aqt.utils import aqt_data_folder
+        data_dir = aqt_data_folder()
+    except ImportError:
+        import aqt
+        data_dir = os.path.join(os.path.dirname(aqt.__file__), "data")
+    mathjax_dir = os.path.join(data_dir, "web", "js", "vendor", "mathjax")
+    for entry in MATHJAX_ENTRY_FILES:
+        if os.path.isfile(os.path.join(mathjax_dir, entry)):
+            return mathjax_dir, entry
+    return None, None
+
+def is_image_occlusion_model(model):
+    # Verifica de forma mais robusta se o modelo é de Oclusão de Imagem (inglês ou português).
+    model_name_lower = model['name'].lower()
+    return 'image occlusion' in model_name_lower or 'oclusão de imagem' in model_name_lower
+
+def iter_rendered_cards(lines, model, mapper, col, start=0):
+    """
+    Gera (índice, frente, verso) renderizados para as linhas a partir de
+    `start` (None nas linhas vazias). Precisa da coleção, mas não a altera.
+    """
+    def render_sides(note):
+        # Card efêmero: renderizado sem gravar nada na coleção
+        card = note.ephemeral_card()
+        return card.render_output().question_text, get_pure_back_content(card)
+
+    for i in range(start, len(lines)):
+        line = lines[i]
+        if not line.strip():
+            yield i, None, None
+            continue
+        note = col.new_note(model)
+        note.fields[:] = mapper.map_line(line)
+        # Linhas repetidas ou já exportadas reaproveitam a renderização
+        front_raw, back_raw = render_cache.get(note, 'export', render_sides)
+        yield i, front_raw, back_raw
+
+def iter_chunks(items, size=export_post.CHUNK_SIZE):
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class HtmlExport:
+    """
+    Exportação em duas etapas: a renderização (que precisa da coleção) roda
+    na thread da operação, e o pós-processamento dos cards (regex de scripts
+    e mídia) segue em série, lote a lote, na mesma thread.
+
+    O resultado é gravado em fluxo em `caminho.part` por um buffer de tamanho
+    fixo, então a memória usada não depende do número de cards. A cada
+    CHECKPOINT_EVERY cards um arquivo `.part.json` registra até onde o
+    arquivo está completo; se a exportação for cancelada ou interrompida,
+    ela pode continuar desse ponto. O arquivo final só aparece (por rename)
+    quando tudo foi gravado.
+    """
+
+    def __init__(self, path, lines, model, mapper, translator):
+        self.path = path
+        self.part_path = path + ".part"
+        self.state_path = self.part_path + ".json"
+        self.lines = lines
+        self.model = model
+        self.mapper = mapper
+        self._t = translator
+        digest = hashlib.sha1(f"{export_post.OUTPUT_FORMAT}:{model['id']}:{model['mod']}:{mapper.field_names}:{mapper.targets}".encode('utf-8'))
+        for line in lines:
+            digest.update(line.encode('utf-8'))
+            digest.update(b'\n')
+        self.signature = digest.hexdigest()
+
+    def checkpoint(self):
+        """Ponto de retomada de uma exportação interrompida deste mesmo conteúdo."""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get('signature') != self.signature or not os.path.exists(self.part_path):
+            return None
+        if os.path.getsize(self.part_path) < state['offset']:
+            return None
+        return state
+
+    def discard_checkpoint(self):
+        for path in (self.part_path, self.state_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _save_checkpoint(self, f, next_line, assets):
+        f.flush()
+        state = {'signature': self.signature, 'offset': f.tell(), 'next_line': next_line, 'assets': assets.state()}
+        with open(self.state_path, 'w', encoding='utf-8') as state_file:
+            json.dump(state, state_file)
+
+    def _iter_output(self, col, assets, start):
+        """
+        Gera (html_do_lote, próxima_linha) na ordem das linhas, a partir de
+        `start`, acumulando em `assets` a mídia referenciada.
+        """
+        labels = (self._t("Frente"), self._t("Verso"))
+        remove_js = is_image_occlusion_model(self.model)
+        for chunk in iter_chunks(iter_rendered_cards(self.lines, self.model, self.mapper, col, start)):
+            results, refs = export_post.post_process_chunk(assets.media_dir, remove_js, labels, chunk, assets.inline)
+            assets.merge(refs)
+            yield "".join(fragment for _, fragment in results), results[-1][0] + 1
+
+    def run(self, col, resume=True, on_progress=None, should_cancel=None):
+        """Grava a exportação; retorna o caminho final ou None se cancelada."""
+        assets = ExportAssets(col.media.dir())
+        state = self.checkpoint() if resume else None
+        if state:
+            assets.restore(state['assets'])
+            start = state['next_line']
+            f = open(self.part_path, 'r+b', buffering=WRITE_BUFFER_SIZE)
+            f.truncate(state['offset'])
+            f.seek(state['offset'])
+        else:
+            start = 0
+            f = open(self.part_path, 'wb', buffering=WRITE_BUFFER_SIZE)
+            f.write(export_header(self._t).encode('utf-8'))
+            f.write(assets.note_type_css(self.model).encode('utf-8'))
+
+        total = len(self.lines)
+        last_checkpoint = start
+        output = self._iter_output(col, assets, start)
+        with f:
+            try:
+                for html, next_line in output:
+                    f.write(html.encode('utf-8'))
+                    if on_progress:
+                        on_progress(next_line, total)
+                    if should_cancel and should_cancel():
+                        self._save_checkpoint(f, next_line, assets)
+                        return None
+                    if next_line - last_checkpoint >= CHECKPOINT_EVERY:
+                        self._save_checkpoint(f, next_line, assets)
+                        last_checkpoint = next_line
+            finally:
+                output.close()
+
+            f.write(export_footer().encode('utf-8'))
+            for chunk in assets.iter_table():
+                f.write(chunk.encode('utf-8'))
+            f.write(b"</body></html>")
+
+        os.replace(self.part_path, self.path)
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+        return self.path
+
+
+class _Cancelled(Exception):
+    pass
+
+
+class ZipHtmlExport(HtmlExport):
+    """
+    Exportação em ZIP: index.html com referências relativas, a mídia usada
+    pelos cards em media/ (cada arquivo uma vez) e o MathJax do Anki em
+    mathjax/, para abrir sem internet. O index.html é comprimido em fluxo
+    direto no ZIP; como um ZIP não pode ser retomado no meio, cancelar
+    descarta o arquivo parcial.
+    """
+
+    def checkpoint(self):
         return None
 
-    model = mw.col.models.by_name(self.lista_notetypes.currentItem().text())
-    deck_id = mw.col.decks.current()['id']
-    cards_per_row = 3
-    mathjax_script = '<script id="MathJax-script" async src="https://cdn.jsdelivr.net/npm/mathjax@3/es5/tex-mml-chtml.js"></script>'
-    
-    buf = []
-    buf.append(f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{_t('Cards Exportados')}</title>{get_common_css(cards_per_row)}{mathjax_script}</head><body>")
-    buf.append(f'<h1>{_t("Cards Exportados")}</h1><div class="card-grid">')
-    
-    mw.progress.start(label=_t("Renderizando e processando cards..."), max=len(cards_text_lines))
-    
-    for i, line in enumerate(cards_text_lines):
-        mw.progress.update(value=i)
-        if not line.strip(): continue
-        note = None
+    def run(self, col, resume=False, on_progress=None, should_cancel=None):
+        assets = ExportAssets(col.media.dir(), inline=False)
+        mathjax_dir, mathjax_entry = anki_mathjax_dir()
+        mathjax_src = f"{MATHJAX_FOLDER}/{mathjax_entry}" if mathjax_dir else MATHJAX_CDN
+        total = len(self.lines)
         try:
-            note = mw.col.new_note(model)
-            parts = self._get_split_parts(line)
-            for idx, field_content in enumerate(parts):
-                if idx < len(note.fields):
-                    note.fields[idx] = field_content.strip()
-            mw.col.add_note(note, deck_id)
-            card = note.cards()[0]
-            
-            raw_css = model.get('css', '')
-            front_raw = card.render_output(True, False).question_text
-            back_raw = get_pure_back_content(card)
-
-            # --- CORREÇÃO DEFINITIVA ---
-            # Verifica de forma mais robusta se o modelo é de Oclusão de Imagem (inglês ou português).
-            model_name_lower = model['name'].lower()
-            is_image_occlusion = 'image occlusion' in model_name_lower or 'oclusão de imagem' in model_name_lower
-
-            if is_image_occlusion:
-                # Se for Oclusão de Imagem, usa a ESTRATÉGIA 2: REMOVER o script.
-                front_processed = process_card_html_remove_js(front_raw)
-                back_processed = process_card_html_remove_js(back_raw)
-            else:
-                # Para todos os outros tipos, usa a ESTRATÉGIA 1: ISOLAR o script.
-                front_processed = process_card_html_isolate_js(front_raw)
-                back_processed = process_card_html_isolate_js(back_raw)
-
-            processed_css = find_and_embed_media(raw_css)
-            front_final = find_and_embed_media(front_processed)
-            back_final = find_and_embed_media(back_processed)
-
-            final_html = (f'<div class="side-title">{_t("Frente")}</div>{front_final}'
-                          f'<div class="separator"></div>'
-                          f'<div class="side-title">{_t("Verso")}</div>{back_final}')
-            
-            card_content = (f'<div class="card-item card" id="card-item-{card.id}">'
-                            f'<style>{processed_css}</style>'
-                            f'<div class="card-content-wrapper">{final_html}</div>'
-                            '</div>')
-            buf.append(card_content)
-        finally:
-            if note and note.id:
-                mw.col.remove_notes([note.id])
-
-    mw.progress.finish()
-    buf.append("</div></body></html>")
-    return "".join(buf)
\ No newline at end of file
+            with zipfile.ZipFile(self.part_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+                with zf.open('index.html', 'w', force_zip64=True) as f:
+                    f.write(export_header(self._t, mathjax_src).encode('utf-8'))
+                    f.write(assets.note_type_css(self.model).encode('utf-8'))
+                    output = self._iter_output(col, assets, 0)
+                    try:
+                        for html, next_line in output:
+                            f.write(html.encode('utf-8'))
+                            if on_progress:
+                                on_progress(next_line, total)
+                            if should_cancel and should_cancel():
+                                raise _Cancelled()
+                    finally:
+                        output.close()
+                    f.write(export_footer().encode('utf-8'))
+                    f.write(b"</body></html>")
+
+                media_label = self._t("Copiando mídia...")
+                filenames = sorted(set(unquote(name) for name in assets.filenames.values()))
+                for n, filename in enumerate(filenames, 1):
+                    self._write_file(zf, os.path.join(assets.media_dir, filename), f"{export_post.MEDIA_FOLDER}/{filename}")
+                    if on_progress:
+                        on_progress(n, len(filenames), media_label)
+                    if should_cancel and should_cancel():
+                        raise _Cancelled()
+
+                if mathjax_dir:
+                    for root, _, files in os.walk(mathjax_dir):
+                        for name in files:
+                            path = os.path.join(root, name)
+                            arcname = os.path.relpath(path, mathjax_dir).replace(os.sep, '/')
+                            self._write_file(zf, path, f"{MATHJAX_FOLDER}/{arcname}")
+        except _Cancelled:
+            os.remove(self.part_path)
+            return None
+
+        os.replace(self.part_path, self.path)
+        return self.path
+
+    @staticmethod
+    def _write_file(zf, path, arcname):
+        ext = os.path.splitext(path)[1].lower()
+        compression = zipfile.ZIP_DEFLATED if ext in DEFLATE_EXTENSIONS else zipfile.ZIP_STORED
+        zf.write(path, arcname, compress_type=compression)
@@ -182,6 +182,7 @@ TRANSLATIONS = {
     "Salvar como HTML": "Enregistrer en HTML",
     "Impressão": "Imprimer",
     "Nenhum card para visualizar.": "Aucune carte à visualiser.",
+    "Card {}": "Carte {}",
     "Conteúdo copiado para a área de transferência!": "Contenu copié dans le presse-papiers !",
     "Salvar Arquivo HTML": "Enregistrer le Fichier HTML",
     "Arquivo HTML salvo em: {}": "Fichier HTML enregistré dans : {}",
@@ -200,4 +201,82 @@ TRANSLATIONS = {
     "beginner_instructions_line2": "<b>2. Séparez le recto du verso avec un point-virgule ( ; ).</b>",
     "beginner_instructions_example_title": "Exemple :",
     "beginner_instructions_example_text": "Capitale de la France ; Paris",
+
+    # Importação de arquivo
+    "Importar Arquivo...": "Importer un Fichier...",
+    "Importar Arquivo": "Importer un Fichier",
+    "Importar arquivo": "Importer un fichier",
+    "Importa um arquivo de texto grande direto para o deck, sem carregá-lo no editor": "Importe un gros fichier texte directement dans le paquet, sans le charger dans l'éditeur",
+    "Importando arquivo...": "Importation du fichier...",
+    "Importando: {} cards - restante {}": "Importation : {} cartes - reste {}",
+    "Erro ao importar o arquivo: {}": "Erreur lors de l'importation du fichier : {}",
+    "Importação cancelada. {} cards adicionados.": "Importation annulée. {} cartes ajoutées.",
+    "{} cards importados em {:.1f}s.": "{} cartes importées en {:.1f}s.",
+
+    # Adicionar cards em lotes
+    "Adicionar Cards": "Ajouter des Cartes",
+    "Adicionando cards...": "Ajout des cartes...",
+    "Adicionando cards... {}/{}": "Ajout des cartes... {}/{}",
+    "Erro ao adicionar cards: {}": "Erreur lors de l'ajout des cartes : {}",
+    "Linhas não adicionadas (erro ao criar a nota): {}": "Lignes non ajoutées (erreur lors de la création de la note) : {}",
+    "{} linha(s) do arquivo não importada(s) por erro ao criar a nota.": "{} ligne(s) du fichier non importée(s) suite à une erreur lors de la création de la note.",
+    "Operação cancelada. {} cards adicionados.": "Opération annulée. {} cartes ajoutées.",
+
+    # Operações em segundo plano
+    "Carregando cards do deck...": "Chargement des cartes du paquet...",
+    "Calculando estatísticas...": "Calcul des statistiques...",
+    "Cancelar": "Annuler",
+    "Cancelando...": "Annulation...",
+    "Aguarde o fim da operação em andamento: {}": "Veuillez attendre la fin de l'opération en cours : {}",
+    "Ocorreu um erro: {}": "Une erreur s'est produite : {}",
+
+    # Duplicatas
+    "Verificando duplicatas...": "Recherche des doublons...",
+    "Duplicatas encontradas": "Doublons trouvés",
+    "{} linha(s) já existem neste deck (marcadas na numeração). O que deseja fazer?": "{} ligne(s) existent déjà dans ce paquet (marquées dans la numérotation). Que voulez-vous faire ?",
+    "Pular duplicatas": "Ignorer les doublons",
+    "Adicionar mesmo assim": "Ajouter quand même",
+    "Atualizar existentes": "Mettre à jour les existantes",
+    "{} cards adicionados e {} atualizados.": "{} cartes ajoutées et {} mises à jour.",
+
+    # Visualizador de cards
+    "Erro ao renderizar card {}:": "Erreur lors du rendu de la carte {} :",
+
+    # Exportação retomável
+    "Existe uma exportação interrompida destes cards ({} de {}). Deseja continuar de onde parou?": "Il existe une exportation interrompue de ces cartes ({} sur {}). Voulez-vous reprendre là où elle s'est arrêtée ?",
+    "Exportação interrompida. Ela pode ser continuada na próxima vez que você exportar estes cards.": "Exportation interrompue. Elle pourra être reprise la prochaine fois que vous exporterez ces cartes.",
+
+    # Exportação ZIP
+    "Exportar ZIP": "Exporter en ZIP",
+    "Exportar cards para um ZIP com HTML, pasta de mídia e MathJax, para uso offline": "Exporter les cartes dans un ZIP avec HTML, dossier de médias et MathJax, pour une utilisation hors ligne",
+    "Copiando mídia...": "Copie des médias...",
+    "Exportação cancelada.": "Exportation annulée.",
+
+    # Paginação
+    "Página": "Page",
+    "de {}": "sur {}",
+
+    # Ordenar por estatísticas de revisão
+    "Organizar os cards mostrados por uma estatística de revisão": "Trier les cartes affichées selon une statistique de révision",
+    "Lapsos": "Oublis",
+    "Revisões": "Révisions",
+    "Intervalo": "Intervalle",
+    "Facilidade": "Facilité",
+    "Vencimento": "Échéance",
+    "Última Revisão": "Dernière Révision",
+
+    # Modo de edição
+    "Salvando edições...": "Enregistrement des modifications...",
+    "{} card(s) atualizado(s)!": "{} carte(s) mise(s) à jour !",
+    "Alterações pendentes: {}": "Modifications en attente : {}",
+    "{} nota(s) foram alteradas ou excluídas fora deste editor depois de mostradas e não foram sobrescritas (linhas: {}). Use 'Mostrar' novamente para carregar a versão atual.": "{} note(s) ont été modifiées ou supprimées en dehors de cet éditeur après avoir été affichées et n'ont pas été écrasées (lignes : {}). Utilisez à nouveau « Afficher » pour charger la version actuelle.",
+
+    # Índice de mídia
+    "Indexando mídia...": "Indexation des médias...",
+
+    # Cópia de mídia
+    "Copiando mídia ({}/{})...": "Copie des médias ({}/{})...",
+    "Não foi possível copiar: {}": "Impossible de copier : {}",
+    "[copiando {}: {}]": "[copie {} : {}]",
+    "Ocorreu um erro ao copiar a mídia: {}": "Une erreur s'est produite lors de la copie des médias : {}",
 }
\ No newline at end of file
@@ -182,6 +182,7 @@ TRANSLATIONS = {
     "Salvar como HTML": "Als HTML speichern",
     "Impressão": "Drucken",
     "Nenhum card para visualizar.": "Keine Karten zur Ansicht vorhanden.",
+    "Card {}": "Karte {}",
     "Conteúdo copiado para a área de transferência!": "Inhalt in die Zwischenablage kopiert!",
     "Salvar Arquivo HTML": "HTML-Datei speichern",
     "Arquivo HTML salvo em: {}": "HTML-Datei gespeichert unter: {}",
@@ -200,4 +201,82 @@ TRANSLATIONS = {
     "beginner_instructions_line2": "<b>2. Trennen Sie die Vorder- von der Rückseite mit einem Semikolon ( ; ).</b>",
     "beginner_instructions_example_title": "Beispiel:",
     "beginner_instructions_example_text": "Hauptstadt von Deutschland; Berlin",
+
+    # Importação de arquivo
+    "Importar Arquivo...": "Datei Importieren...",
+    "Importar Arquivo": "Datei Importieren",
+    "Importar arquivo": "Datei importieren",
+    "Importa um arquivo de texto grande direto para o deck, sem carregá-lo no editor": "Importiert eine große Textdatei direkt in den Stapel, ohne sie in den Editor zu laden",
+    "Importando arquivo...": "Datei wird importiert...",
+    "Importando: {} cards - restante {}": "Import: {} Karten - noch {}",
+    "Erro ao importar o arquivo: {}": "Fehler beim Importieren der Datei: {}",
+    "Importação cancelada. {} cards adicionados.": "Import abgebrochen. {} Karten hinzugefügt.",
+    "{} cards importados em {:.1f}s.": "{} Karten in {:.1f}s importiert.",
+
+    # Adicionar cards em lotes
+    "Adicionar Cards": "Karten Hinzufügen",
+    "Adicionando cards...": "Karten werden hinzugefügt...",
+    "Adicionando cards... {}/{}": "Karten werden hinzugefügt... {}/{}",
+    "Erro ao adicionar cards: {}": "Fehler beim Hinzufügen der Karten: {}",
+    "Linhas não adicionadas (erro ao criar a nota): {}": "Nicht hinzugefügte Zeilen (Fehler beim Erstellen der Notiz): {}",
+    "{} linha(s) do arquivo não importada(s) por erro ao criar a nota.": "{} Zeile(n) der Datei wegen eines Fehlers beim Erstellen der Notiz nicht importiert.",
+    "Operação cancelada. {} cards adicionados.": "Vorgang abgebrochen. {} Karten hinzugefügt.",
+
+    # Operações em segundo plano
+    "Carregando cards do deck...": "Karten des Stapels werden geladen...",
+    "Calculando estatísticas...": "Statistiken werden berechnet...",
+    "Cancelar": "Abbrechen",
+    "Cancelando...": "Wird abgebrochen...",
+    "Aguarde o fim da operação em andamento: {}": "Bitte warten Sie, bis der laufende Vorgang beendet ist: {}",
+    "Ocorreu um erro: {}": "Ein Fehler ist aufgetreten: {}",
+
+    # Duplicatas
+    "Verificando duplicatas...": "Duplikate werden geprüft...",
+    "Duplicatas encontradas": "Duplikate gefunden",
+    "{} linha(s) já existem neste deck (marcadas na numeração). O que deseja fazer?": "{} Zeile(n) existieren bereits in diesem Stapel (in der Nummerierung markiert). Was möchten Sie tun?",
+    "Pular duplicatas": "Duplikate überspringen",
+    "Adicionar mesmo assim": "Trotzdem hinzufügen",
+    "Atualizar existentes": "Vorhandene aktualisieren",
+    "{} cards adicionados e {} atualizados.": "{} Karten hinzugefügt und {} aktualisiert.",
+
+    # Visualizador de cards
+    "Erro ao renderizar card {}:": "Fehler beim Rendern der Karte {}:",
+
+    # Exportação retomável
+    "Existe uma exportação interrompida destes cards ({} de {}). Deseja continuar de onde parou?": "Es gibt einen unterbrochenen Export dieser Karten ({} von {}). Möchten Sie dort fortfahren, wo er angehalten wurde?",
+    "Exportação interrompida. Ela pode ser continuada na próxima vez que você exportar estes cards.": "Export unterbrochen. Er kann beim nächsten Export dieser Karten fortgesetzt werden.",
+
+    # Exportação ZIP
+    "Exportar ZIP": "ZIP Exportieren",
+    "Exportar cards para um ZIP com HTML, pasta de mídia e MathJax, para uso offline": "Karten als ZIP mit HTML, Medienordner und MathJax für die Offline-Nutzung exportieren",
+    "Copiando mídia...": "Medien werden kopiert...",
+    "Exportação cancelada.": "Export abgebrochen.",
+
+    # Paginação
+    "Página": "Seite",
+    "de {}": "von {}",
+
+    # Ordenar por estatísticas de revisão
+    "Organizar os cards mostrados por uma estatística de revisão": "Die angezeigten Karten nach einer Wiederholungsstatistik sortieren",
+    "Lapsos": "Fehler",
+    "Revisões": "Wiederholungen",
+    "Intervalo": "Intervall",
+    "Facilidade": "Leichtigkeit",
+    "Vencimento": "Fällig",
+    "Última Revisão": "Letzte Wiederholung",
+
+    # Modo de edição
+    "Salvando edições...": "Änderungen werden gespeichert...",
+    "{} card(s) atualizado(s)!": "{} Karte(n) aktualisiert!",
+    "Alterações pendentes: {}": "Ausstehende Änderungen: {}",
+    "{} nota(s) foram alteradas ou excluídas fora deste editor depois de mostradas e não foram sobrescritas (linhas: {}). Use 'Mostrar' novamente para carregar a versão atual.": "{} Notiz(en) wurden nach dem Anzeigen außerhalb dieses Editors geändert oder gelöscht und nicht überschrieben (Zeilen: {}). Verwenden Sie erneut „Anzeigen“, um die aktuelle Version zu laden.",
+
+    # Índice de mídia
+    "Indexando mídia...": "Medien werden indiziert...",
+
+    # Cópia de mídia
+    "Copiando mídia ({}/{})...": "Medien werden kopiert ({}/{})...",
+    "Não foi possível copiar: {}": "Konnte nicht kopiert werden: {}",
+    "[copiando {}: {}]": "[wird kopiert {}: {}]",
+    "Ocorreu um erro ao copiar a mídia: {}": "Beim Kopieren der Medien ist ein Fehler aufgetreten: {}",
 }
\ No newline at end of file
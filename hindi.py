@@ -182,6 +182,7 @@ TRANSLATIONS = {
     "Salvar como HTML": "HTML के रूप में सहेजें",
     "Impressão": "प्रिंट करें",
     "Nenhum card para visualizar.": "देखने के लिए कोई कार्ड नहीं है।",
+    "Card {}": "कार्ड {}",
     "Conteúdo copiado para a área de transferência!": "सामग्री क्लिपबोर्ड पर कॉपी की गई!",
     "Salvar Arquivo HTML": "HTML फ़ाइल सहेजें",
     "Arquivo HTML salvo em: {}": "HTML फ़ाइल यहाँ सहेजी गई: {}",
@@ -200,4 +201,82 @@ TRANSLATIONS = {
     "beginner_instructions_line2": "<b>२. अगले भाग को पिछले भाग से अर्धविराम ( ; ) से अलग करें।</b>",
     "beginner_instructions_example_title": "उदाहरण:",
     "beginner_instructions_example_text": "भारत की राजधानी ; नई दिल्ली",
+
+    # Importação de arquivo
+    "Importar Arquivo...": "फ़ाइल आयात करें...",
+    "Importar Arquivo": "फ़ाइल आयात करें",
+    "Importar arquivo": "फ़ाइल आयात करें",
+    "Importa um arquivo de texto grande direto para o deck, sem carregá-lo no editor": "बड़ी टेक्स्ट फ़ाइल को संपादक में लोड किए बिना सीधे डेक में आयात करता है",
+    "Importando arquivo...": "फ़ाइल आयात हो रही है...",
+    "Importando: {} cards - restante {}": "आयात हो रहा है: {} कार्ड - {} शेष",
+    "Erro ao importar o arquivo: {}": "फ़ाइल आयात करने में त्रुटि: {}",
+    "Importação cancelada. {} cards adicionados.": "आयात रद्द किया गया। {} कार्ड जोड़े गए।",
+    "{} cards importados em {:.1f}s.": "{} कार्ड {:.1f} सेकंड में आयात हुए।",
+
+    # Adicionar cards em lotes
+    "Adicionar Cards": "कार्ड जोड़ें",
+    "Adicionando cards...": "कार्ड जोड़े जा रहे हैं...",
+    "Adicionando cards... {}/{}": "कार्ड जोड़े जा रहे हैं... {}/{}",
+    "Erro ao adicionar cards: {}": "कार्ड जोड़ने में त्रुटि: {}",
+    "Linhas não adicionadas (erro ao criar a nota): {}": "नहीं जोड़ी गई पंक्तियाँ (नोट बनाने में त्रुटि): {}",
+    "{} linha(s) do arquivo não importada(s) por erro ao criar a nota.": "नोट बनाने में त्रुटि के कारण फ़ाइल की {} पंक्ति(याँ) आयात नहीं हुईं।",
+    "Operação cancelada. {} cards adicionados.": "कार्य रद्द किया गया। {} कार्ड जोड़े गए।",
+
+    # Operações em segundo plano
+    "Carregando cards do deck...": "डेक के कार्ड लोड हो रहे हैं...",
+    "Calculando estatísticas...": "आँकड़े गिने जा रहे हैं...",
+    "Cancelar": "रद्द करें",
+    "Cancelando...": "रद्द किया जा रहा है...",
+    "Aguarde o fim da operação em andamento: {}": "चल रहे कार्य के पूरा होने की प्रतीक्षा करें: {}",
+    "Ocorreu um erro: {}": "एक त्रुटि हुई: {}",
+
+    # Duplicatas
+    "Verificando duplicatas...": "डुप्लिकेट जाँचे जा रहे हैं...",
+    "Duplicatas encontradas": "डुप्लिकेट मिले",
+    "{} linha(s) já existem neste deck (marcadas na numeração). O que deseja fazer?": "{} पंक्ति(याँ) इस डेक में पहले से मौजूद हैं (क्रमांकन में चिह्नित)। आप क्या करना चाहते हैं?",
+    "Pular duplicatas": "डुप्लिकेट छोड़ें",
+    "Adicionar mesmo assim": "फिर भी जोड़ें",
+    "Atualizar existentes": "मौजूदा अपडेट करें",
+    "{} cards adicionados e {} atualizados.": "{} कार्ड जोड़े गए और {} अपडेट किए गए।",
+
+    # Visualizador de cards
+    "Erro ao renderizar card {}:": "कार्ड {} रेंडर करने में त्रुटि:",
+
+    # Exportação retomável
+    "Existe uma exportação interrompida destes cards ({} de {}). Deseja continuar de onde parou?": "इन कार्डों का एक बाधित निर्यात मौजूद है ({} में से {})। क्या आप वहीं से जारी रखना चाहते हैं जहाँ वह रुका था?",
+    "Exportação interrompida. Ela pode ser continuada na próxima vez que você exportar estes cards.": "निर्यात बाधित हुआ। अगली बार इन कार्डों को निर्यात करते समय इसे जारी रखा जा सकता है।",
+
+    # Exportação ZIP
+    "Exportar ZIP": "ZIP निर्यात करें",
+    "Exportar cards para um ZIP com HTML, pasta de mídia e MathJax, para uso offline": "ऑफ़लाइन उपयोग के लिए कार्डों को HTML, मीडिया फ़ोल्डर और MathJax के साथ ZIP में निर्यात करें",
+    "Copiando mídia...": "मीडिया कॉपी हो रहा है...",
+    "Exportação cancelada.": "निर्यात रद्द किया गया।",
+
+    # Paginação
+    "Página": "पृष्ठ",
+    "de {}": "{} में से",
+
+    # Ordenar por estatísticas de revisão
+    "Organizar os cards mostrados por uma estatística de revisão": "दिखाए गए कार्डों को समीक्षा आँकड़े के अनुसार व्यवस्थित करें",
+    "Lapsos": "चूक",
+    "Revisões": "समीक्षाएँ",
+    "Intervalo": "अंतराल",
+    "Facilidade": "सरलता",
+    "Vencimento": "देय",
+    "Última Revisão": "अंतिम समीक्षा",
+
+    # Modo de edição
+    "Salvando edições...": "संपादन सहेजे जा रहे हैं...",
+    "{} card(s) atualizado(s)!": "{} कार्ड अपडेट किए गए!",
+    "Alterações pendentes: {}": "लंबित परिवर्तन: {}",
+    "{} nota(s) foram alteradas ou excluídas fora deste editor depois de mostradas e não foram sobrescritas (linhas: {}). Use 'Mostrar' novamente para carregar a versão atual.": "{} नोट दिखाए जाने के बाद इस संपादक के बाहर बदले या हटाए गए और उन्हें अधिलेखित नहीं किया गया (पंक्तियाँ: {})। वर्तमान संस्करण लोड करने के लिए फिर से 'दिखाएँ' का उपयोग करें।",
+
+    # Índice de mídia
+    "Indexando mídia...": "मीडिया अनुक्रमित हो रहा है...",
+
+    # Cópia de mídia
+    "Copiando mídia ({}/{})...": "मीडिया कॉपी हो रहा है ({}/{})...",
+    "Não foi possível copiar: {}": "कॉपी नहीं हो सका: {}",
+    "[copiando {}: {}]": "[कॉपी हो रहा है {}: {}]",
+    "Ocorreu um erro ao copiar a mídia: {}": "मीडिया कॉपी करते समय त्रुटि हुई: {}",
 }
\ No newline at end of file
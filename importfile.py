@@ -0,0 +1,112 @@
+# importfile.py
+#
+# Importação de arquivos grandes direto para a coleção, sem passar pelo
+# campo 'Digite seus cards'. O arquivo é lido em fluxo por uma cadeia de
+# geradores: decodificação -> divisão nos delimitadores -> mapeamento de
+# campos -> criação de notas em lotes. A memória usada fica limitada ao
+# tamanho de um lote.
+
+import logging
+import os
+import time
+from aqt.utils import showInfo, showWarning
+
+from .core import LineProcessor
+from .note_batch import add_notes_in_batches, make_request
+
+
+def iter_file_lines(path, encoding='utf-8'):
+    """Gera (índice, linha, bytes_lidos) lendo o arquivo em modo binário."""
+    bytes_read = 0
+    with open(path, 'rb') as f:
+        for index, raw in enumerate(f):
+            bytes_read += len(raw)
+            if index == 0 and raw.startswith(b'\xef\xbb\xbf'):
+                raw = raw[3:]  # BOM do UTF-8
+            yield index, raw.decode(encoding, errors='replace').rstrip('\r\n'), bytes_read
+
+
+def iter_parsed_lines(lines, processor):
+    """Gera (ParsedLine, bytes_lidos) apenas para as linhas que viram cards."""
+    for index, line, bytes_read in lines:
+        parsed = processor.process(line, index)
+        if parsed is not None:
+            yield parsed, bytes_read
+
+
+def format_eta(seconds):
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{(seconds % 3600) // 60:02d}m"
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+class FileImporter:
+    """Importa um arquivo delimitado para o deck e tipo de nota escolhidos."""
+
+    def __init__(self, path, deck_id, default_model, cloze_model, config, translator):
+        self.path = path
+        self.deck_id = deck_id
+        self.default_model = default_model
+        self.cloze_model = cloze_model
+        self.config = config
+        self._t = translator
+        self.total_bytes = max(1, os.path.getsize(path))
+        self.bytes_read = 0
+        self.started_at = None
+        self.skipped = 0  # linhas recusadas pela coleção
+        self.tasks = None
+
+    def _iter_requests(self, col):
+        self.config.detect_cloze = self.cloze_model is not None
+        processor = LineProcessor(self.config)
+        for parsed, bytes_read in iter_parsed_lines(iter_file_lines(self.path), processor):
+            self.bytes_read = bytes_read
+            note = col.new_note(self.cloze_model if parsed.is_cloze else self.default_model)
+            note.fields[:] = parsed.fields[:len(note.fields)] + [""] * (len(note.fields) - len(parsed.fields))
+            if parsed.tags:
+                note.tags.extend(parsed.tags)
+            yield make_request(note, self.deck_id)
+
+    def _report_progress(self, added):
+        fraction = self.bytes_read / self.total_bytes
+        elapsed = time.monotonic() - self.started_at
+        eta = elapsed / fraction - elapsed if fraction > 0 else 0
+        label = self._t("Importando: {} cards - restante {}").format(added, format_eta(eta))
+        self.tasks.progress(int(fraction * 1000), 1000, label)
+
+    def _run(self, col):
+        self.started_at = time.monotonic()
+        self.skipped = 0
+        self.added, changes, self.cancelled = add_notes_in_batches(
+            col,
+            self._iter_requests(col),
+            self._t("Importar arquivo"),
+            on_batch=self._report_progress,
+            should_cancel=self.tasks.want_cancel,
+            on_skip=self._skip_line,
+        )
+        return changes
+
+    def _skip_line(self, index, error):
+        logging.error(f"Erro ao importar um card de '{self.path}': {error}")
+        self.skipped += 1
+
+    def _on_success(self, changes):
+        elapsed = time.monotonic() - self.started_at
+        if self.skipped:
+            showWarning(self._t("{} linha(s) do arquivo não importada(s) por erro ao criar a nota.").format(self.skipped))
+        if self.cancelled:
+            showInfo(self._t("Importação cancelada. {} cards adicionados.").format(self.added))
+        else:
+            showInfo(self._t("{} cards importados em {:.1f}s.").format(self.added, elapsed))
+
+    def _on_failure(self, error):
+        logging.error(f"Erro ao importar arquivo '{self.path}': {error}")
+        showWarning(self._t("Erro ao importar o arquivo: {}").format(str(error)))
+
+    def run_in_background(self, tasks):
+        """Roda a importação pelo BackgroundTasks do diálogo (progresso e cancelar)."""
+        self.tasks = tasks
+        return tasks.run(self._t("Importando arquivo..."), self._run, self._on_success,
+                         self._on_failure, mutates=True)
@@ -182,6 +182,7 @@ TRANSLATIONS = {
     "Salvar como HTML": "Simpan sebagai HTML",
     "Impressão": "Cetak",
     "Nenhum card para visualizar.": "Tidak ada kartu untuk ditampilkan.",
+    "Card {}": "Kartu {}",
     "Conteúdo copiado para a área de transferência!": "Konten disalin ke papan klip!",
     "Salvar Arquivo HTML": "Simpan File HTML",
     "Arquivo HTML salvo em: {}": "File HTML disimpan di: {}",
@@ -200,4 +201,82 @@ TRANSLATIONS = {
     "beginner_instructions_line2": "<b>2. Pisahkan bagian depan dan belakang dengan titik koma ( ; ).</b>",
     "beginner_instructions_example_title": "Contoh:",
     "beginner_instructions_example_text": "Ibu kota Indonesia ; Jakarta",
+
+    # Importação de arquivo
+    "Importar Arquivo...": "Impor Berkas...",
+    "Importar Arquivo": "Impor Berkas",
+    "Importar arquivo": "Impor berkas",
+    "Importa um arquivo de texto grande direto para o deck, sem carregá-lo no editor": "Mengimpor berkas teks besar langsung ke dek tanpa memuatnya ke editor",
+    "Importando arquivo...": "Mengimpor berkas...",
+    "Importando: {} cards - restante {}": "Mengimpor: {} kartu - sisa {}",
+    "Erro ao importar o arquivo: {}": "Kesalahan saat mengimpor berkas: {}",
+    "Importação cancelada. {} cards adicionados.": "Impor dibatalkan. {} kartu ditambahkan.",
+    "{} cards importados em {:.1f}s.": "{} kartu diimpor dalam {:.1f} dtk.",
+
+    # Adicionar cards em lotes
+    "Adicionar Cards": "Tambah Kartu",
+    "Adicionando cards...": "Menambahkan kartu...",
+    "Adicionando cards... {}/{}": "Menambahkan kartu... {}/{}",
+    "Erro ao adicionar cards: {}": "Kesalahan saat menambahkan kartu: {}",
+    "Linhas não adicionadas (erro ao criar a nota): {}": "Baris yang tidak ditambahkan (kesalahan saat membuat catatan): {}",
+    "{} linha(s) do arquivo não importada(s) por erro ao criar a nota.": "{} baris dari file tidak diimpor karena kesalahan saat membuat catatan.",
+    "Operação cancelada. {} cards adicionados.": "Operasi dibatalkan. {} kartu ditambahkan.",
+
+    # Operações em segundo plano
+    "Carregando cards do deck...": "Memuat kartu dari dek...",
+    "Calculando estatísticas...": "Menghitung statistik...",
+    "Cancelar": "Batal",
+    "Cancelando...": "Membatalkan...",
+    "Aguarde o fim da operação em andamento: {}": "Tunggu hingga operasi yang sedang berjalan selesai: {}",
+    "Ocorreu um erro: {}": "Terjadi kesalahan: {}",
+
+    # Duplicatas
+    "Verificando duplicatas...": "Memeriksa duplikat...",
+    "Duplicatas encontradas": "Duplikat ditemukan",
+    "{} linha(s) já existem neste deck (marcadas na numeração). O que deseja fazer?": "{} baris sudah ada di dek ini (ditandai pada penomoran). Apa yang ingin Anda lakukan?",
+    "Pular duplicatas": "Lewati duplikat",
+    "Adicionar mesmo assim": "Tetap tambahkan",
+    "Atualizar existentes": "Perbarui yang ada",
+    "{} cards adicionados e {} atualizados.": "{} kartu ditambahkan dan {} diperbarui.",
+
+    # Visualizador de cards
+    "Erro ao renderizar card {}:": "Kesalahan saat merender kartu {}:",
+
+    # Exportação retomável
+    "Existe uma exportação interrompida destes cards ({} de {}). Deseja continuar de onde parou?": "Ada ekspor kartu ini yang terhenti ({} dari {}). Lanjutkan dari tempat terhentinya?",
+    "Exportação interrompida. Ela pode ser continuada na próxima vez que você exportar estes cards.": "Ekspor terhenti. Ekspor dapat dilanjutkan saat Anda mengekspor kartu ini lagi.",
+
+    # Exportação ZIP
+    "Exportar ZIP": "Ekspor ZIP",
+    "Exportar cards para um ZIP com HTML, pasta de mídia e MathJax, para uso offline": "Ekspor kartu ke ZIP berisi HTML, folder media, dan MathJax untuk penggunaan offline",
+    "Copiando mídia...": "Menyalin media...",
+    "Exportação cancelada.": "Ekspor dibatalkan.",
+
+    # Paginação
+    "Página": "Halaman",
+    "de {}": "dari {}",
+
+    # Ordenar por estatísticas de revisão
+    "Organizar os cards mostrados por uma estatística de revisão": "Urutkan kartu yang ditampilkan berdasarkan statistik ulasan",
+    "Lapsos": "Lupa",
+    "Revisões": "Ulasan",
+    "Intervalo": "Interval",
+    "Facilidade": "Kemudahan",
+    "Vencimento": "Jatuh Tempo",
+    "Última Revisão": "Ulasan Terakhir",
+
+    # Modo de edição
+    "Salvando edições...": "Menyimpan suntingan...",
+    "{} card(s) atualizado(s)!": "{} kartu diperbarui!",
+    "Alterações pendentes: {}": "Perubahan tertunda: {}",
+    "{} nota(s) foram alteradas ou excluídas fora deste editor depois de mostradas e não foram sobrescritas (linhas: {}). Use 'Mostrar' novamente para carregar a versão atual.": "{} catatan diubah atau dihapus di luar editor ini setelah ditampilkan dan tidak ditimpa (baris: {}). Gunakan 'Tampilkan' lagi untuk memuat versi terbaru.",
+
+    # Índice de mídia
+    "Indexando mídia...": "Mengindeks media...",
+
+    # Cópia de mídia
+    "Copiando mídia ({}/{})...": "Menyalin media ({}/{})...",
+    "Não foi possível copiar: {}": "Tidak dapat menyalin: {}",
+    "[copiando {}: {}]": "[menyalin {}: {}]",
+    "Ocorreu um erro ao copiar a mídia: {}": "Terjadi kesalahan saat menyalin media: {}",
 }
\ No newline at end of file
@@ -182,6 +182,7 @@ TRANSLATIONS = {
     "Salvar como HTML": "Salva come HTML",
     "Impressão": "Stampa",
     "Nenhum card para visualizar.": "Nessuna scheda da visualizzare.",
+    "Card {}": "Carta {}",
     "Conteúdo copiado para a área de transferência!": "Contenuto copiato negli appunti!",
     "Salvar Arquivo HTML": "Salva File HTML",
     "Arquivo HTML salvo em: {}": "File HTML salvato in: {}",
@@ -200,4 +201,82 @@ TRANSLATIONS = {
     "beginner_instructions_line2": "<b>2. Separa il fronte dal retro con un punto e virgola ( ; ).</b>",
     "beginner_instructions_example_title": "Esempio:",
     "beginner_instructions_example_text": "capitale d'Italia ; Roma",
+
+    # Importação de arquivo
+    "Importar Arquivo...": "Importa File...",
+    "Importar Arquivo": "Importa File",
+    "Importar arquivo": "Importa file",
+    "Importa um arquivo de texto grande direto para o deck, sem carregá-lo no editor": "Importa un file di testo grande direttamente nel mazzo, senza caricarlo nell'editor",
+    "Importando arquivo...": "Importazione del file...",
+    "Importando: {} cards - restante {}": "Importazione: {} carte - restano {}",
+    "Erro ao importar o arquivo: {}": "Errore durante l'importazione del file: {}",
+    "Importação cancelada. {} cards adicionados.": "Importazione annullata. {} carte aggiunte.",
+    "{} cards importados em {:.1f}s.": "{} carte importate in {:.1f}s.",
+
+    # Adicionar cards em lotes
+    "Adicionar Cards": "Aggiungi Carte",
+    "Adicionando cards...": "Aggiunta delle carte...",
+    "Adicionando cards... {}/{}": "Aggiunta delle carte... {}/{}",
+    "Erro ao adicionar cards: {}": "Errore durante l'aggiunta delle carte: {}",
+    "Linhas não adicionadas (erro ao criar a nota): {}": "Righe non aggiunte (errore nella creazione della nota): {}",
+    "{} linha(s) do arquivo não importada(s) por erro ao criar a nota.": "{} riga/e del file non importata/e per un errore nella creazione della nota.",
+    "Operação cancelada. {} cards adicionados.": "Operazione annullata. {} carte aggiunte.",
+
+    # Operações em segundo plano
+    "Carregando cards do deck...": "Caricamento delle carte del mazzo...",
+    "Calculando estatísticas...": "Calcolo delle statistiche...",
+    "Cancelar": "Annulla",
+    "Cancelando...": "Annullamento...",
+    "Aguarde o fim da operação em andamento: {}": "Attendi la fine dell'operazione in corso: {}",
+    "Ocorreu um erro: {}": "Si è verificato un errore: {}",
+
+    # Duplicatas
+    "Verificando duplicatas...": "Controllo dei duplicati...",
+    "Duplicatas encontradas": "Duplicati trovati",
+    "{} linha(s) já existem neste deck (marcadas na numeração). O que deseja fazer?": "{} riga/e esistono già in questo mazzo (segnate nella numerazione). Cosa vuoi fare?",
+    "Pular duplicatas": "Salta i duplicati",
+    "Adicionar mesmo assim": "Aggiungi comunque",
+    "Atualizar existentes": "Aggiorna esistenti",
+    "{} cards adicionados e {} atualizados.": "{} carte aggiunte e {} aggiornate.",
+
+    # Visualizador de cards
+    "Erro ao renderizar card {}:": "Errore durante il rendering della carta {}:",
+
+    # Exportação retomável
+    "Existe uma exportação interrompida destes cards ({} de {}). Deseja continuar de onde parou?": "Esiste un'esportazione interrotta di queste carte ({} di {}). Vuoi riprendere da dove si è fermata?",
+    "Exportação interrompida. Ela pode ser continuada na próxima vez que você exportar estes cards.": "Esportazione interrotta. Potrà essere ripresa la prossima volta che esporti queste carte.",
+
+    # Exportação ZIP
+    "Exportar ZIP": "Esporta ZIP",
+    "Exportar cards para um ZIP com HTML, pasta de mídia e MathJax, para uso offline": "Esporta le carte in uno ZIP con HTML, cartella dei media e MathJax, per l'uso offline",
+    "Copiando mídia...": "Copia dei media...",
+    "Exportação cancelada.": "Esportazione annullata.",
+
+    # Paginação
+    "Página": "Pagina",
+    "de {}": "di {}",
+
+    # Ordenar por estatísticas de revisão
+    "Organizar os cards mostrados por uma estatística de revisão": "Ordina le carte mostrate per una statistica di ripasso",
+    "Lapsos": "Errori",
+    "Revisões": "Ripassi",
+    "Intervalo": "Intervallo",
+    "Facilidade": "Facilità",
+    "Vencimento": "Scadenza",
+    "Última Revisão": "Ultimo Ripasso",
+
+    # Modo de edição
+    "Salvando edições...": "Salvataggio delle modifiche...",
+    "{} card(s) atualizado(s)!": "{} carta/e aggiornata/e!",
+    "Alterações pendentes: {}": "Modifiche in sospeso: {}",
+    "{} nota(s) foram alteradas ou excluídas fora deste editor depois de mostradas e não foram sobrescritas (linhas: {}). Use 'Mostrar' novamente para carregar a versão atual.": "{} nota/e sono state modificate o eliminate fuori da questo editor dopo essere state mostrate e non sono state sovrascritte (righe: {}). Usa di nuovo 'Mostra' per caricare la versione attuale.",
+
+    # Índice de mídia
+    "Indexando mídia...": "Indicizzazione dei media...",
+
+    # Cópia de mídia
+    "Copiando mídia ({}/{})...": "Copia dei media ({}/{})...",
+    "Não foi possível copiar: {}": "Impossibile copiare: {}",
+    "[copiando {}: {}]": "[copia {}: {}]",
+    "Ocorreu um erro ao copiar a mídia: {}": "Si è verificato un errore durante la copia dei media: {}",
 }
\ No newline at end of file
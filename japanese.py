@@ -182,6 +182,7 @@ TRANSLATIONS = {
     "Salvar como HTML": "HTMLとして保存",
     "Impressão": "印刷",
     "Nenhum card para visualizar.": "表示するカードはありません。",
+    "Card {}": "カード {}",
     "Conteúdo copiado para a área de transferência!": "コンテンツがクリップボードにコピーされました！",
     "Salvar Arquivo HTML": "HTMLファイルを保存",
     "Arquivo HTML salvo em: {}": "HTMLファイルを{}に保存しました",
@@ -203,4 +204,81 @@ TRANSLATIONS = {
     "beginner_instructions_example_title": "例：",
     "beginner_instructions_example_text": "日本の首都 ; 東京",
 
+    # File import
+    "Importar Arquivo...": "ファイルをインポート...",
+    "Importar Arquivo": "ファイルをインポート",
+    "Importar arquivo": "ファイルをインポート",
+    "Importa um arquivo de texto grande direto para o deck, sem carregá-lo no editor": "大きなテキストファイルをエディタに読み込まずにデッキへ直接インポートします",
+    "Importando arquivo...": "ファイルをインポート中...",
+    "Importando: {} cards - restante {}": "インポート中: {} 枚 - 残り {}",
+    "Erro ao importar o arquivo: {}": "ファイルのインポート中にエラー: {}",
+    "Importação cancelada. {} cards adicionados.": "インポートをキャンセルしました。{} 枚のカードを追加しました。",
+    "{} cards importados em {:.1f}s.": "{} 枚のカードを {:.1f} 秒でインポートしました。",
+
+    # Batched card adding
+    "Adicionar Cards": "カードを追加",
+    "Adicionando cards...": "カードを追加中...",
+    "Adicionando cards... {}/{}": "カードを追加中... {}/{}",
+    "Erro ao adicionar cards: {}": "カード追加中にエラー: {}",
+    "Linhas não adicionadas (erro ao criar a nota): {}": "追加されなかった行（ノート作成エラー）: {}",
+    "{} linha(s) do arquivo não importada(s) por erro ao criar a nota.": "ノート作成エラーのため、ファイルの {} 行がインポートされませんでした。",
+    "Operação cancelada. {} cards adicionados.": "操作をキャンセルしました。{} 枚のカードを追加しました。",
+
+    # Background operations
+    "Carregando cards do deck...": "デッキのカードを読み込み中...",
+    "Calculando estatísticas...": "統計を計算中...",
+    "Cancelar": "キャンセル",
+    "Cancelando...": "キャンセル中...",
+    "Aguarde o fim da operação em andamento: {}": "実行中の操作が終わるまでお待ちください: {}",
+    "Ocorreu um erro: {}": "エラーが発生しました: {}",
+
+    # Duplicates
+    "Verificando duplicatas...": "重複を確認中...",
+    "Duplicatas encontradas": "重複が見つかりました",
+    "{} linha(s) já existem neste deck (marcadas na numeração). O que deseja fazer?": "{} 行はすでにこのデッキに存在します（行番号に表示）。どうしますか？",
+    "Pular duplicatas": "重複をスキップ",
+    "Adicionar mesmo assim": "そのまま追加",
+    "Atualizar existentes": "既存のものを更新",
+    "{} cards adicionados e {} atualizados.": "{} 枚追加、{} 枚更新しました。",
+
+    # Card viewer
+    "Erro ao renderizar card {}:": "カード {} のレンダリング中にエラー:",
+
+    # Resumable export
+    "Existe uma exportação interrompida destes cards ({} de {}). Deseja continuar de onde parou?": "これらのカードの中断されたエクスポートがあります（{} / {}）。中断したところから続けますか？",
+    "Exportação interrompida. Ela pode ser continuada na próxima vez que você exportar estes cards.": "エクスポートが中断されました。次回これらのカードをエクスポートするときに続行できます。",
+
+    # ZIP export
+    "Exportar ZIP": "ZIPでエクスポート",
+    "Exportar cards para um ZIP com HTML, pasta de mídia e MathJax, para uso offline": "HTML、メディアフォルダ、MathJaxを含むZIPにカードをエクスポート（オフライン用）",
+    "Copiando mídia...": "メディアをコピー中...",
+    "Exportação cancelada.": "エクスポートをキャンセルしました。",
+
+    # Pager
+    "Página": "ページ",
+    "de {}": "/ {}",
+
+    # Sort by review statistics
+    "Organizar os cards mostrados por uma estatística de revisão": "表示中のカードを復習統計で並べ替え",
+    "Lapsos": "失敗回数",
+    "Revisões": "復習回数",
+    "Intervalo": "間隔",
+    "Facilidade": "易しさ",
+    "Vencimento": "期日",
+    "Última Revisão": "最終復習",
+
+    # Edit mode
+    "Salvando edições...": "編集を保存中...",
+    "{} card(s) atualizado(s)!": "{} 枚のカードを更新しました！",
+    "Alterações pendentes: {}": "保留中の変更: {}",
+    "{} nota(s) foram alteradas ou excluídas fora deste editor depois de mostradas e não foram sobrescritas (linhas: {}). Use 'Mostrar' novamente para carregar a versão atual.": "{} 件のノートは表示後にこのエディタ外で変更または削除されたため、上書きしませんでした（行: {}）。最新の内容を読み込むには、もう一度「表示」を使ってください。",
+
+    # Media index
+    "Indexando mídia...": "メディアをインデックス中...",
+
+    # Media copying
+    "Copiando mídia ({}/{})...": "メディアをコピー中 ({}/{})...",
+    "Não foi possível copiar: {}": "コピーできませんでした: {}",
+    "[copiando {}: {}]": "[コピー中 {}: {}]",
+    "Ocorreu um erro ao copiar a mídia: {}": "メディアのコピー中にエラーが発生しました: {}",
 }
\ No newline at end of file
@@ -0,0 +1,278 @@
+# media_index.py
+#
+# Índice persistente de referências de mídia: para cada arquivo, quantas
+# notas o usam, e para cada nota com mídia, quais arquivos ela usa. É
+# montado uma vez a partir da tabela de notas, em segundo plano, gravado na
+# pasta do perfil e mantido em dia pelo hook de exclusão de notas e por uma
+# releitura das notas modificadas desde a última atualização, feita depois
+# de cada operação que muda o texto das notas. Com ele, excluir um deck só
+# precisa olhar as notas do deck. Desfazer e importar podem trazer notas com
+# note.mod antigo, que a releitura não vê; por isso, antes de apagar um
+# arquivo, used_elsewhere confere direto na tabela de notas.
+
+import html
+import json
+import logging
+import os
+import re
+import threading
+import urllib.parse
+from anki import hooks
+from anki.utils import ids2str
+from aqt import mw, gui_hooks
+from aqt.operations import QueryOp
+
+INDEX_FILE = "delimitadores_media_index.json"
+BUILD_BATCH = 5000  # notas lidas por consulta na montagem do índice
+# Campos sem nenhum destes trechos não podem referenciar mídia
+MEDIA_HINT = re.compile(r"src|\[sound:|url\(|\[latex\]|\[\$|\\\(|\\\[", re.IGNORECASE)
+# O mesmo filtro em SQL, para não trazer da coleção notas sem mídia
+MEDIA_HINT_SQL = ("(flds like '%src%' or flds like '%[sound:%' or flds like '%url(%'"
+                  " or flds like '%[latex]%' or flds like '%[$%' or flds like '%\\(%' or flds like '%\\[%')")
+
+
+def note_media(col, mid, flds):
+    """Arquivos de mídia usados pelos campos de uma nota (como tupla ordenada)."""
+    if not MEDIA_HINT.search(flds):
+        return ()
+    return tuple(sorted(set(col.media.files_in_str(mid, flds))))
+
+
+class MediaIndex:
+    """
+    Contagem de referências de mídia por arquivo. As leituras e as
+    atualizações feitas pelos hooks podem acontecer em threads diferentes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {}      # arquivo -> número de notas que o usam
+        self.note_files = {}  # id da nota -> arquivos usados (só notas com mídia)
+        self.last_mod = 0     # maior notes.mod já indexado
+        self.ready = False
+        self.stale = False    # a coleção mudou por fora dos hooks (ex.: sincronização)
+        self._refresh_pending = False
+
+    # --- contagem ---
+
+    def _set_note(self, nid, files):
+        """Troca os arquivos de `nid`, ajustando as contagens (com o lock)."""
+        for filename in self.note_files.pop(nid, ()):
+            remaining = self.counts.get(filename, 0) - 1
+            if remaining > 0:
+                self.counts[filename] = remaining
+            else:
+                self.counts.pop(filename, None)
+        if files:
+            self.note_files[nid] = files
+            for filename in files:
+                self.counts[filename] = self.counts.get(filename, 0) + 1
+
+    def count(self, filename):
+        with self._lock:
+            return self.counts.get(filename, 0)
+
+    def files_of(self, nid):
+        with self._lock:
+            return self.note_files.get(nid, ())
+
+    # --- montagem e atualização ---
+
+    def build(self, col, on_progress=None, should_cancel=None):
+        """Lê todas as notas em lotes. Retorna False se cancelado."""
+        total = col.db.scalar("select count() from notes") or 0
+        note_files = {}
+        counts = {}
+        last_mod = 0
+        last_id = 0
+        done = 0
+        while True:
+            if should_cancel and should_cancel():
+                return False
+            rows = col.db.all("select id, mid, flds, mod from notes where id > ? order by id limit ?",
+                              last_id, BUILD_BATCH)
+            if not rows:
+                break
+            for nid, mid, flds, mod in rows:
+                files = note_media(col, mid, flds)
+                if files:
+                    note_files[nid] = files
+                    for filename in files:
+                        counts[filename] = counts.get(filename, 0) + 1
+                last_mod = max(last_mod, mod)
+            last_id = rows[-1][0]
+            done += len(rows)
+            if on_progress:
+                on_progress(done, total)
+        with self._lock:
+            self.note_files = note_files
+            self.counts = counts
+            self.last_mod = last_mod
+            self.ready = True
+            self.stale = False
+        self.save()
+        return True
+
+    def refresh(self, col):
+        """Relê as notas modificadas desde a última atualização."""
+        with self._lock:
+            if not self.ready:
+                return
+            last_mod = self.last_mod
+        rows = col.db.all("select id, mid, flds, mod from notes where mod >= ?", last_mod)
+        updates = [(nid, note_media(col, mid, flds), mod) for nid, mid, flds, mod in rows]
+        with self._lock:
+            for nid, files, mod in updates:
+                self._set_note(nid, files)
+                self.last_mod = max(self.last_mod, mod)
+
+    def drop_missing(self, col):
+        """Esquece notas com mídia que não existem mais (excluídas sem passar pelos hooks)."""
+        with self._lock:
+            tracked = list(self.note_files)
+        if not tracked:
+            return
+        existing = set(col.db.list(f"select id from notes where id in {ids2str(tracked)}"))
+        with self._lock:
+            for nid in tracked:
+                if nid not in existing:
+                    self._set_note(nid, ())
+
+    def used_elsewhere(self, col, filenames, excluded_nids):
+        """
+        Dos `filenames`, os que ainda aparecem em notas fora de
+        `excluded_nids`, conferidos na tabela de notas (não no índice) numa
+        única passagem pelas notas com mídia. Se achar algum, o índice estava
+        incompleto e é marcado para remontagem.
+        """
+        filenames = set(filenames)
+        if not filenames:
+            return set()
+        # Nomes como aparecem no HTML: puros, com %XX ou com entidades
+        variants = set()
+        for filename in filenames:
+            variants.update((filename, urllib.parse.quote(filename), html.escape(filename, quote=False)))
+        names = re.compile("|".join(re.escape(v) for v in sorted(variants, key=len, reverse=True)))
+        excluded = ids2str(excluded_nids)
+        used = set()
+        last_id = 0
+        while len(used) < len(filenames):
+            rows = col.db.all(f"select id, mid, flds from notes where id > ? and id not in {excluded}"
+                              f" and {MEDIA_HINT_SQL} order by id limit ?", last_id, BUILD_BATCH)
+            if not rows:
+                break
+            for nid, mid, flds in rows:
+                if names.search(flds):
+                    used.update(filenames.intersection(col.media.files_in_str(mid, flds)))
+            last_id = rows[-1][0]
+        if used:
+            with self._lock:
+                self.stale = True
+        return used
+
+    def ensure(self, col, on_progress=None, should_cancel=None):
+        """
+        Deixa o índice pronto e em dia: carrega do disco, monta do zero se
+        necessário ou só relê o que mudou. Retorna False se cancelado.
+        """
+        if not self.ready:
+            self.load(col)
+        if not self.ready or self.stale:
+            return self.build(col, on_progress, should_cancel)
+        self.refresh(col)
+        self.drop_missing(col)
+        return True
+
+    def warm_up(self):
+        """Monta o índice em segundo plano, se ainda não estiver pronto."""
+        if self.ready and not self.stale:
+            return
+        QueryOp(parent=mw, op=lambda col: self.ensure(col), success=lambda ok: None).failure(
+            lambda error: logging.error(f"Erro ao montar o índice de mídia: {error}")).run_in_background()
+
+    # --- persistência ---
+
+    @staticmethod
+    def _path():
+        return os.path.join(mw.pm.profileFolder(), INDEX_FILE)
+
+    def save(self):
+        with self._lock:
+            if not self.ready:
+                return
+            data = {'mod': mw.col.mod if mw.col else None, 'last_mod': self.last_mod,
+                    'notes': {str(nid): files for nid, files in self.note_files.items()}}
+        try:
+            with open(self._path(), 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+        except Exception as e:
+            logging.error(f"Erro ao salvar o índice de mídia: {e}")
+
+    def load(self, col):
+        """Usa o índice salvo se a coleção não mudou desde que ele foi gravado."""
+        try:
+            with open(self._path(), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('mod') != col.mod:
+            return
+        with self._lock:
+            self.note_files = {}
+            self.counts = {}
+            for nid, files in data['notes'].items():
+                self._set_note(int(nid), tuple(files))
+            self.last_mod = data['last_mod']
+            self.ready = True
+            self.stale = False
+
+    def reset(self):
+        with self._lock:
+            self.counts = {}
+            self.note_files = {}
+            self.last_mod = 0
+            self.ready = False
+            self.stale = False
+
+    # --- hooks ---
+
+    def _on_notes_deleted(self, col, nids):
+        with self._lock:
+            if self.ready:
+                for nid in nids:
+                    self._set_note(nid, ())
+
+    def _on_operation(self, changes, handler):
+        if changes.note_text:
+            self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        if not self.ready or self._refresh_pending:
+            return
+        self._refresh_pending = True
+
+        def done(_):
+            self._refresh_pending = False
+
+        def failed(error):
+            self._refresh_pending = False
+            logging.error(f"Erro ao atualizar o índice de mídia: {error}")
+
+        # Depois da operação atual, junta inclusões e edições numa releitura só
+        mw.progress.single_shot(500, lambda: QueryOp(
+            parent=mw, op=self.refresh, success=done).failure(failed).run_in_background())
+
+    def _on_sync(self):
+        with self._lock:
+            self.stale = True
+
+    def _on_profile_close(self):
+        self.save()
+        self.reset()
+
+
+media_index = MediaIndex()
+hooks.notes_will_be_deleted.append(media_index._on_notes_deleted)
+gui_hooks.operation_did_execute.append(media_index._on_operation)
+gui_hooks.sync_did_finish.append(media_index._on_sync)
+gui_hooks.profile_will_close.append(media_index._on_profile_close)
@@ -0,0 +1,397 @@
+# media_ingest.py
+#
+# Entrada de mídia na coleção, usada por todos os botões, arrastar e soltar
+# e colar do editor. Cada arquivo é identificado pelo hash do conteúdo: se
+# um arquivo idêntico já está na pasta de mídia (conforme um índice de
+# hashes gravado na pasta do perfil), ele é reaproveitado; senão o arquivo
+# entra pela API de mídia da coleção, que resolve conflitos de nome. Aqui
+# também ficam as tags de cada destino (editor, célula da grade ou campo)
+# e a cópia em segundo plano dos arquivos arrastados para o editor, feita
+# por um pool de threads com as chamadas de cópia do próprio sistema.
+
+import errno
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from aqt import mw, gui_hooks
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+HASH_INDEX_FILE = "delimitadores_media_hashes.json"
+HASH_BLOCK = 1024 * 1024  # bytes lidos por vez ao calcular o hash
+COPY_CHUNK = 8 * 1024 * 1024  # bytes por chamada de cópia (entre verificações de cancelamento)
+COPY_WORKERS = 4  # cópias simultâneas
+FICLONE = 0x40049409  # ioctl do Linux que clona o arquivo sem copiar dados (btrfs, XFS...)
+# Erros que indicam só que a chamada não serve para este par de arquivos
+COPY_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP,
+                    errno.ENOTSUP, errno.ENOTSOCK, errno.EBADF, errno.ENOTTY, errno.EPERM}
+
+# Caracteres que o Anki remove dos nomes de mídia (anki.media / rslib)
+ILLEGAL_NAME_CHARS = re.compile(r'[\\/:\*?"<>\|]')
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.xpm', '.webp', '.svg')
+AUDIO_EXTENSIONS = ('.mp3', '.wav', '.ogg', '.m4a', '.flac')
+VIDEO_EXTENSIONS = ('.mp4', '.webm', '.avi', '.mkv', '.mov')
+
+# Destinos das tags
+TARGET_EDITOR = 'editor'  # texto do editor (botão de mídia, arrastar e soltar, colar)
+TARGET_CELL = 'cell'      # célula da grade, que precisa caber numa linha curta
+TARGET_FIELD = 'field'    # parte da linha ligada a um campo pelo botão "Midia <campo>"
+
+MEDIA_TAGS = {
+    TARGET_EDITOR: {
+        'image': '<img src="{}">',
+        'audio': '[sound:{}]',
+        'video': '<video src="{}" controls width="320" height="240"></video>',
+    },
+    TARGET_CELL: {
+        'image': '<img src="{}">',
+        'audio': '[sound:{}]',
+        'video': '[sound:{}]',
+    },
+    TARGET_FIELD: {
+        'image': '<img src="{}">',
+        'audio': '[sound:{}]',
+        'video': '<video src="{}" controls></video>',
+    },
+}
+
+
+def media_kind(filename):
+    """'image', 'audio', 'video' ou None para arquivos que o editor não usa."""
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in IMAGE_EXTENSIONS:
+        return 'image'
+    if ext in AUDIO_EXTENSIONS:
+        return 'audio'
+    if ext in VIDEO_EXTENSIONS:
+        return 'video'
+    return None
+
+
+def media_tag(filename, target=TARGET_EDITOR):
+    """Tag que referencia `filename` no destino, ou None se o tipo não é suportado."""
+    kind = media_kind(filename)
+    if kind is None:
+        return None
+    return MEDIA_TAGS[target][kind].format(filename)
+
+
+def file_hash(path, should_cancel=None):
+    """Hash SHA-1 do conteúdo, ou None se cancelado."""
+    sha = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b''):
+            if should_cancel and should_cancel():
+                return None
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def expand_media_paths(paths):
+    """Troca as pastas pelos arquivos de mídia dentro delas (em ordem de nome)."""
+    result = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                result.extend(os.path.join(root, name) for name in sorted(files) if media_kind(name))
+        elif media_kind(path):
+            result.append(path)
+    return result
+
+
+def _reflink(fin, fout):
+    if fcntl is None:
+        return False
+    try:
+        fcntl.ioctl(fout, FICLONE, fin)
+        return True
+    except OSError:
+        return False
+
+
+def _copy_file_range(fin, fout, offset, count):
+    return os.copy_file_range(fin, fout, count, offset, offset)
+
+
+def _sendfile(fin, fout, offset, count):
+    os.lseek(fout, offset, os.SEEK_SET)
+    return os.sendfile(fout, fin, offset, count)
+
+
+def _read_write(fin, fout, offset, count):
+    os.lseek(fin, offset, os.SEEK_SET)
+    os.lseek(fout, offset, os.SEEK_SET)
+    data = os.read(fin, count)
+    return os.write(fout, data) if data else 0
+
+
+def copy_media(src, dst, should_cancel=None, on_bytes=None):
+    """
+    Copia `src` para `dst` pelo caminho mais barato disponível: clone do
+    sistema de arquivos (reflink), copy_file_range, sendfile ou leitura e
+    escrita comuns, em blocos para poder cancelar. `on_bytes(n)` recebe os
+    bytes copiados a cada bloco. Retorna False se cancelado.
+    """
+    with open(src, 'rb') as f_src, open(dst, 'wb') as f_dst:
+        fin, fout = f_src.fileno(), f_dst.fileno()
+        size = os.fstat(fin).st_size
+        if size and _reflink(fin, fout):
+            if on_bytes:
+                on_bytes(size)
+            return True
+        methods = [m for m, name in ((_copy_file_range, 'copy_file_range'), (_sendfile, 'sendfile'))
+                   if hasattr(os, name)] + [_read_write]
+        offset = 0
+        while offset < size:
+            if should_cancel and should_cancel():
+                return False
+            count = min(COPY_CHUNK, size - offset)
+            try:
+                copied = methods[0](fin, fout, offset, count)
+            except OSError as e:
+                # Só troca de método antes do primeiro byte; depois é erro de verdade
+                if offset or len(methods) == 1 or e.errno not in COPY_UNSUPPORTED:
+                    raise
+                methods.pop(0)
+                continue
+            if not copied:
+                if offset == 0 and len(methods) > 1:
+                    methods.pop(0)
+                    continue
+                break  # O arquivo encolheu durante a cópia
+            offset += copied
+            if on_bytes:
+                on_bytes(copied)
+        os.ftruncate(fout, offset)
+    return True
+
+
+class MediaStore:
+    """
+    Índice {hash: arquivo} da mídia que entrou pelo add-on. Cada entrada
+    guarda tamanho e data de modificação do arquivo na pasta de mídia; se
+    o arquivo foi apagado, renomeado ou alterado, a entrada é descartada.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._files = None  # arquivo -> (tamanho, mtime_ns, hash)
+        self._by_hash = {}  # hash -> arquivo
+        self._reserved = set()  # nomes de cópias em andamento
+
+    # --- índice ---
+
+    @staticmethod
+    def _path():
+        return os.path.join(mw.pm.profileFolder(), HASH_INDEX_FILE)
+
+    def _load(self):
+        """Carrega o índice na primeira utilização (com o lock)."""
+        if self._files is not None:
+            return
+        self._files = {}
+        self._by_hash = {}
+        try:
+            with open(self._path(), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for filename, (size, mtime, digest) in data.items():
+            self._files[filename] = (size, mtime, digest)
+            self._by_hash[digest] = filename
+
+    def _remember(self, media_dir, filename, digest):
+        try:
+            st = os.stat(os.path.join(media_dir, filename))
+        except OSError:
+            return
+        self._forget(filename)
+        self._files[filename] = (st.st_size, st.st_mtime_ns, digest)
+        self._by_hash[digest] = filename
+
+    def _forget(self, filename):
+        entry = self._files.pop(filename, None)
+        if entry and self._by_hash.get(entry[2]) == filename:
+            del self._by_hash[entry[2]]
+
+    def _existing(self, media_dir, digest, size, name):
+        """Arquivo da pasta de mídia com o mesmo conteúdo, ou None."""
+        filename = self._by_hash.get(digest)
+        if filename is not None:
+            entry = self._files[filename]
+            try:
+                st = os.stat(os.path.join(media_dir, filename))
+            except OSError:
+                st = None
+            if st is not None and (st.st_size, st.st_mtime_ns) == entry[:2]:
+                return filename
+            self._forget(filename)
+        # Arquivo de mesmo nome que ainda não passou pelo índice (ex.: adicionado antes dele)
+        if name not in self._files:
+            candidate = os.path.join(media_dir, name)
+            try:
+                if os.path.getsize(candidate) == size and file_hash(candidate) == digest:
+                    self._remember(media_dir, name, digest)
+                    return name
+            except OSError:
+                pass
+        return None
+
+    # --- entrada de mídia ---
+
+    def _add_file(self, col, path):
+        digest = file_hash(path)
+        size = os.path.getsize(path)
+        media_dir = col.media.dir()
+        with self._lock:
+            self._load()
+            filename = self._existing(media_dir, digest, size, self._media_name(os.path.basename(path)))
+            if filename is not None:
+                return filename, False
+            filename = col.media.add_file(path)
+            self._remember(media_dir, filename, digest)
+        return filename, True
+
+    def add_file(self, col, path):
+        """
+        (arquivo, novo): o nome na pasta de mídia com o conteúdo de `path` e
+        se ele foi criado agora (cópia feita por col.media.add_file) ou é um
+        arquivo idêntico que já existia e pode estar em uso por outras notas.
+        """
+        result = self._add_file(col, path)
+        self.save()
+        return result
+
+    def add_data(self, col, name, data):
+        """Como add_file, para conteúdo em memória (ex.: imagem colada)."""
+        digest = hashlib.sha1(data).hexdigest()
+        media_dir = col.media.dir()
+        with self._lock:
+            self._load()
+            filename = self._existing(media_dir, digest, len(data), self._media_name(name))
+            created = filename is None
+            if created:
+                filename = col.media.write_data(name, data)
+                self._remember(media_dir, filename, digest)
+        self.save()
+        return filename, created
+
+    def add_files(self, col, paths, target=TARGET_EDITOR):
+        """
+        Adiciona os arquivos de tipo suportado. Retorna [(arquivo, tag, novo)]
+        na ordem de `paths`; os de tipo não suportado são ignorados.
+        """
+        added = []
+        for path in paths:
+            if media_kind(path) is None:
+                continue
+            filename, created = self._add_file(col, path)
+            added.append((filename, media_tag(filename, target), created))
+        if added:
+            self.save()
+        return added
+
+    @staticmethod
+    def _media_name(name):
+        """Nome como col.media.add_file o gravaria: NFC e sem caracteres proibidos."""
+        name = ILLEGAL_NAME_CHARS.sub("", unicodedata.normalize("NFC", name)).strip()
+        return name or "media"
+
+    def _free_name(self, media_dir, name, digest):
+        """Nome livre na pasta de mídia, no padrão do Anki para conflitos (nome-hash.ext)."""
+        base, ext = os.path.splitext(name)
+        for candidate in (name, f"{base}-{digest[:8]}{ext}", f"{base}-{digest}{ext}"):
+            if candidate not in self._reserved and not os.path.exists(os.path.join(media_dir, candidate)):
+                return candidate
+        counter = 1
+        while True:
+            candidate = f"{base}-{digest}-{counter}{ext}"
+            if candidate not in self._reserved and not os.path.exists(os.path.join(media_dir, candidate)):
+                return candidate
+            counter += 1
+
+    def copy_file(self, media_dir, path, should_cancel=None, on_bytes=None):
+        """
+        Versão de add_file para threads de fundo: um arquivo idêntico já
+        existente ou uma cópia feita por copy_media direto na pasta de mídia
+        (via arquivo temporário). Retorna (arquivo, novo), ou None se
+        cancelado.
+        """
+        size = os.path.getsize(path)
+        digest = file_hash(path, should_cancel)
+        if digest is None:
+            return None
+        name = self._media_name(os.path.basename(path))
+        with self._lock:
+            self._load()
+            filename = self._existing(media_dir, digest, size, name)
+            if filename is not None:
+                if on_bytes:
+                    on_bytes(size)
+                return filename, False
+            filename = self._free_name(media_dir, name, digest)
+            self._reserved.add(filename)
+        temp_path = os.path.join(media_dir, f".{filename}.part")
+        done = False
+        try:
+            if copy_media(path, temp_path, should_cancel, on_bytes):
+                os.replace(temp_path, os.path.join(media_dir, filename))
+                done = True
+        finally:
+            if not done and os.path.exists(temp_path):
+                os.remove(temp_path)
+            with self._lock:
+                self._reserved.discard(filename)
+                if done:
+                    self._remember(media_dir, filename, digest)
+        return (filename, True) if done else None
+
+    def copy_files(self, media_dir, paths, on_done, should_cancel=None, on_bytes=None):
+        """
+        Copia `paths` com COPY_WORKERS threads. `on_done(índice, resultado,
+        erro)` é chamado (na thread de fundo) assim que cada arquivo termina;
+        resultado é o (arquivo, novo) de copy_file, ou None se o arquivo
+        falhou ou a cópia foi cancelada antes dele.
+        """
+        with ThreadPoolExecutor(max_workers=COPY_WORKERS) as pool:
+            futures = {pool.submit(self.copy_file, media_dir, path, should_cancel, on_bytes): i
+                       for i, path in enumerate(paths)}
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    result, error = future.result(), None
+                except Exception as e:
+                    logging.error(f"Erro ao copiar a mídia '{paths[i]}': {e}")
+                    result, error = None, e
+                on_done(i, result, error)
+        self.save()
+
+    def save(self):
+        with self._lock:
+            if self._files is None:
+                return
+            data = dict(self._files)
+        try:
+            with open(self._path(), 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+        except Exception as e:
+            logging.error(f"Erro ao salvar o índice de hashes de mídia: {e}")
+
+    def reset(self):
+        with self._lock:
+            self._files = None
+            self._by_hash = {}
+
+
+media_store = MediaStore()
+gui_hooks.profile_will_close.append(media_store.reset)
@@ -0,0 +1,77 @@
+# note_batch.py
+#
+# Inserção de notas em lotes pela API em massa da coleção (add_notes),
+# registrada como um único passo de desfazer. Um lote recusado pela coleção
+# é refeito nota a nota, para que só as notas com problema fiquem de fora.
+
+from itertools import islice
+from anki.collection import AddNoteRequest
+
+BATCH_SIZE = 1000
+
+
+def iter_batches(iterable, size=BATCH_SIZE):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _add_one_by_one(col, batch, first_index, on_skip):
+    """Adiciona as notas do lote uma a uma; retorna quantas entraram."""
+    added = 0
+    for offset, request in enumerate(batch):
+        try:
+            col.add_notes([request])
+        except Exception as e:
+            if on_skip:
+                on_skip(first_index + offset, e)
+            continue
+        added += 1
+    return added
+
+
+def add_notes_in_batches(col, requests, undo_label, batch_size=BATCH_SIZE,
+                         on_batch=None, should_cancel=None, undo_entry=None, on_skip=None):
+    """
+    Adiciona as AddNoteRequest de `requests` (qualquer iterável, inclusive um
+    gerador) em lotes de `batch_size`. Todos os lotes são fundidos num único
+    passo de desfazer com o nome `undo_label`.
+
+    on_batch(total_adicionado) é chamado depois de cada lote;
+    should_cancel() é consultado antes de cada lote para interromper.
+    Se a coleção recusar um lote, ele é refeito nota a nota e
+    on_skip(posição_em_requests, erro) é chamado para cada nota recusada.
+    Passe `undo_entry` para juntar os lotes a um passo já criado pelo chamador.
+    Retorna (total_adicionado, OpChanges, cancelado).
+    """
+    if undo_entry is None:
+        undo_entry = col.add_custom_undo_entry(undo_label)
+    changes = None
+    added = 0
+    index = 0  # posição, em `requests`, da primeira nota do lote
+    cancelled = False
+    for batch in iter_batches(requests, batch_size):
+        if should_cancel and should_cancel():
+            cancelled = True
+            break
+        try:
+            col.add_notes(batch)
+            added_now = len(batch)
+        except Exception:
+            # O lote inteiro é desfeito pela coleção; refaz sem as notas ruins
+            added_now = _add_one_by_one(col, batch, index, on_skip)
+        changes = col.merge_undo_entries(undo_entry)
+        index += len(batch)
+        added += added_now
+        if on_batch:
+            on_batch(added)
+    if changes is None:
+        changes = col.merge_undo_entries(undo_entry)
+    return added, changes, cancelled
+
+
+def make_request(note, deck_id):
+    return AddNoteRequest(note=note, deck_id=deck_id)
@@ -0,0 +1,130 @@
+# note_stats.py
+#
+# Estatísticas de revisão das notas mostradas (lapsos, revisões, intervalo,
+# facilidade, vencimento e última revisão), lidas numa única consulta que
+# agrupa cards e revlog por nota. Os resultados ficam guardados até a
+# coleção mudar.
+
+import threading
+from datetime import datetime
+from anki.utils import ids2str
+from aqt import gui_hooks
+
+
+class NoteStats:
+    """Estatísticas somadas dos cards de uma nota."""
+    __slots__ = ('lapses', 'reviews', 'interval', 'ease', 'due', 'last_review')
+
+    def __init__(self, lapses=0, reviews=0, interval=None, ease=None, due=None, last_review=None):
+        self.lapses = lapses            # respostas "De novo" no histórico
+        self.reviews = reviews          # respostas no histórico
+        self.interval = interval        # maior intervalo atual, em dias
+        self.ease = ease                # facilidade média, em %
+        self.due = due                  # dias até o próximo vencimento (negativo = atrasado)
+        self.last_review = last_review  # data da última revisão (ms)
+
+    def gutter_text(self):
+        """Texto das colunas na área de números de linha."""
+        interval = f"{self.interval}d" if self.interval is not None else "-"
+        ease = f"{self.ease}%" if self.ease is not None else "-"
+        due = f"{self.due:+d}d" if self.due is not None else "-"
+        last = datetime.fromtimestamp(self.last_review / 1000).strftime('%Y-%m-%d') if self.last_review else "-"
+        return f"E:{self.lapses} R:{self.reviews} I:{interval} F:{ease} V:{due} U:{last}"
+
+
+# (atributo de NoteStats, rótulo) de cada modo de ordenação
+SORT_KEYS = [
+    ('lapses', "Lapsos"),
+    ('reviews', "Revisões"),
+    ('interval', "Intervalo"),
+    ('ease', "Facilidade"),
+    ('due', "Vencimento"),
+    ('last_review', "Última Revisão"),
+]
+
+# Texto mais largo de gutter_text, para dimensionar a área de números de linha
+GUTTER_SAMPLE = "E:999 R:9999 I:9999d F:999% V:+9999d U:9999-99-99"
+
+
+def read_note_stats(col, nids):
+    """{id_da_nota: NoteStats} para `nids`, numa única consulta."""
+    if not nids:
+        return {}
+    nid_list = ids2str(nids)
+    today = col.sched.today
+    rows = col.db.all(
+        f"""
+        select c.nid,
+               coalesce(sum(r.lapses), 0),
+               coalesce(sum(r.reviews), 0),
+               max(case when c.type in (2, 3) then c.ivl end),
+               avg(case when c.factor > 0 then c.factor end),
+               min(case
+                     when c.queue in (2, 3) then (case when c.odid then c.odue else c.due end) - ?
+                     when c.queue = 1 then 0
+                   end),
+               max(r.last_review)
+        from cards c
+        left join (
+            select cid, count() as reviews, sum(ease = 1) as lapses, max(id) as last_review
+            from revlog
+            where cid in (select id from cards where nid in {nid_list})
+            group by cid
+        ) r on r.cid = c.id
+        where c.nid in {nid_list}
+        group by c.nid
+        """,
+        today,
+    )
+    stats = {}
+    for nid, lapses, reviews, interval, ease, due, last_review in rows:
+        stats[nid] = NoteStats(
+            lapses, reviews, interval,
+            int(round(ease / 10)) if ease is not None else None,
+            due, last_review,
+        )
+    return stats
+
+
+class NoteStatsCache:
+    """
+    Guarda as estatísticas já lidas. É esvaziado quando uma operação altera
+    cards (responder, reagendar, excluir...) ou quando outra coleção é aberta.
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def cached(self, nids):
+        """Estatísticas de todas as `nids`, ou None se alguma ainda não foi lida."""
+        with self._lock:
+            if all(nid in self._stats for nid in nids):
+                return {nid: self._stats[nid] for nid in nids}
+        return None
+
+    def get(self, col, nids):
+        """Lê só as notas que ainda não estão no cache (thread de fundo)."""
+        with self._lock:
+            result = {nid: self._stats[nid] for nid in nids if nid in self._stats}
+        missing = [nid for nid in nids if nid not in result]
+        if missing:
+            fresh = read_note_stats(col, missing)
+            for nid in missing:
+                result[nid] = fresh.get(nid) or NoteStats()
+            with self._lock:
+                self._stats.update((nid, result[nid]) for nid in missing)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._stats.clear()
+
+    def _on_operation(self, changes, handler):
+        if changes.card:
+            self.clear()
+
+
+note_stats_cache = NoteStatsCache()
+gui_hooks.operation_did_execute.append(note_stats_cache._on_operation)
+gui_hooks.collection_did_load.append(lambda col: note_stats_cache.clear())
@@ -0,0 +1,74 @@
+# parse_cache.py
+
+from aqt.qt import QTextBlockUserData
+from .core import is_cloze_line
+
+
+class LineParseData(QTextBlockUserData):
+    """Resultado do parse de uma linha, guardado no próprio QTextBlock."""
+
+    def __init__(self, revision, generation, parts, has_delimiter, is_cloze, is_blank):
+        super().__init__()
+        self.revision = revision
+        self.generation = generation
+        self.parts = parts
+        self.has_delimiter = has_delimiter
+        self.is_cloze = is_cloze
+        self.is_blank = is_blank
+
+    @property
+    def is_card(self):
+        """Uma linha vira card quando não está vazia e tem algum delimitador ativo."""
+        return self.has_delimiter and not self.is_blank
+
+
+class LineParseCache:
+    """
+    Cache de parse por linha do editor. Cada QTextBlock guarda as partes, a
+    presença de delimitador e a flag de cloze; o bloco só é reprocessado quando
+    o Qt muda sua revisão (ou seja, quando a linha foi editada) ou quando os
+    delimitadores ativos mudam.
+    """
+
+    def __init__(self, document, tokenizer):
+        self.document = document
+        self.tokenizer = tokenizer
+        self.generation = 0
+
+    def set_tokenizer(self, tokenizer):
+        self.tokenizer = tokenizer
+        self.generation += 1  # Invalida todos os blocos de uma vez
+
+    def get(self, block) -> LineParseData:
+        data = block.userData()
+        revision = block.revision()
+        if (isinstance(data, LineParseData) and data.revision == revision
+                and data.generation == self.generation):
+            return data
+
+        text = block.text().strip()
+        tokenizer = self.tokenizer
+        has_delimiter = tokenizer.has_delimiter(text)
+        data = LineParseData(
+            revision,
+            self.generation,
+            tokenizer.split(text) if has_delimiter else [text],
+            has_delimiter,
+            is_cloze_line(text),
+            not text,
+        )
+        block.setUserData(data)
+        return data
+
+    def get_line(self, line_number):
+        block = self.document.findBlockByNumber(line_number)
+        if not block.isValid():
+            return None
+        return self.get(block)
+
+    def iter_blocks(self):
+        """Percorre (bloco, dados) do documento na ordem das linhas."""
+        block = self.document.firstBlock()
+        while block.isValid():
+            yield block, self.get(block)
+            block = block.next()
@@ -0,0 +1,195 @@
+# preview_page.py
+#
+# Página persistente da pré-visualização. O HTML base (reviewer.css, scripts
+# do revisor e MathJax) é carregado uma única vez; depois, cada atualização
+# envia só a frente, o verso, os estilos e a classe do body numa única
+# chamada JavaScript, sem recarregar a página.
+
+import json
+import time
+
+PREVIEW_BODY = """
+<style>
+    /* reviewer.css usa overflow: hidden, o que impede rolar cards longos */
+    html, body { overflow-y: auto !important; height: auto !important; }
+    #qa { padding: 0 10px; }
+    .preview-section { border: 1px solid #ccc; border-radius: 8px; margin: 10px 0; overflow: hidden; background-color: #ffffff; }
+    .preview-header { background-color: #f0f0f0; color: #000; padding: 5px 15px; font-weight: bold; border-bottom: 1px solid #ccc; }
+    .preview-content { padding: 15px; }
+    html.delim-dark .preview-section { border-color: #4a4a4a; background-color: #2d2d2d; }
+    html.delim-dark .preview-header { background-color: #3a3a3a; color: #eee; border-bottom-color: #4a4a4a; }
+</style>
+<style id="delim-card-styles"></style>
+<div id="qa">
+    <div id="preview-message"></div>
+    <div id="preview-sections" style="display: none;">
+        <div class="preview-section">
+            <div id="preview-front-label" class="preview-header"></div>
+            <div id="preview-front" class="preview-content"></div>
+        </div>
+        <div class="preview-section">
+            <div id="preview-back-label" class="preview-header"></div>
+            <div id="preview-back" class="preview-content"></div>
+        </div>
+    </div>
+</div>
+<script>
+// Scripts do card rodam só quando o conjunto de scripts muda (outro tipo de
+// nota ou modelo); os ouvintes e intervalos que eles registraram antes são
+// removidos nessa hora, para não se acumularem na página persistente. Nas
+// demais atualizações rodam só os ganchos onUpdateHook/onShownHook, como no
+// revisor do Anki.
+let delimitadoresScriptsKey = null;
+const delimitadoresCleanup = [];
+
+function delimitadoresRunScripts(scripts) {
+    for (const undo of delimitadoresCleanup.splice(0)) {
+        try { undo(); } catch (e) { console.error(e); }
+    }
+    for (const hook of ['onUpdateHook', 'onShownHook']) {
+        if (Array.isArray(window[hook])) window[hook].length = 0;
+    }
+    const restore = [];
+    for (const target of [window, document]) {
+        const add = target.addEventListener;
+        target.addEventListener = function (type, listener, options) {
+            delimitadoresCleanup.push(() => target.removeEventListener(type, listener, options));
+            return add.call(target, type, listener, options);
+        };
+        restore.push(() => { target.addEventListener = add; });
+    }
+    const setIntervalOriginal = window.setInterval;
+    window.setInterval = function (...args) {
+        const id = setIntervalOriginal.apply(window, args);
+        delimitadoresCleanup.push(() => clearInterval(id));
+        return id;
+    };
+    restore.push(() => { window.setInterval = setIntervalOriginal; });
+    try {
+        for (const script of scripts) {
+            try { (0, eval)(script); } catch (e) { console.error(e); }
+        }
+    } finally {
+        for (const undo of restore) undo();
+    }
+}
+
+function delimitadoresRunHooks(name) {
+    for (const hook of (Array.isArray(window[name]) ? window[name] : [])) {
+        try { hook(); } catch (e) { console.error(e); }
+    }
+}
+
+function delimitadoresUpdate(p) {
+    const start = performance.now();
+    const root = document.documentElement;
+    root.classList.toggle('delim-dark', p.dark);
+    root.style.backgroundColor = p.dark ? '#333' : '#f0f0f0';
+    root.style.overflowY = 'auto';
+    document.body.style.color = p.dark ? '' : 'black';
+    const sections = document.getElementById('preview-sections');
+    const message = document.getElementById('preview-message');
+    const mathjax = typeof MathJax !== 'undefined' && MathJax.typesetPromise;
+    if (mathjax && MathJax.typesetClear) {
+        // Esquece as fórmulas do conteúdo que vai ser substituído
+        MathJax.typesetClear([sections]);
+    }
+    if (p.message !== undefined) {
+        sections.style.display = 'none';
+        message.innerHTML = p.message;
+        return performance.now() - start;
+    }
+    message.innerHTML = '';
+    document.body.className = p.bodyClass;
+    document.getElementById('delim-card-styles').textContent = p.styles.join('\\n');
+    document.getElementById('preview-front-label').textContent = p.frontLabel;
+    document.getElementById('preview-back-label').textContent = p.backLabel;
+    document.getElementById('preview-front').innerHTML = p.front;
+    document.getElementById('preview-back').innerHTML = p.back;
+    sections.style.display = '';
+    const scriptsKey = JSON.stringify(p.scripts);
+    if (scriptsKey !== delimitadoresScriptsKey) {
+        delimitadoresScriptsKey = scriptsKey;
+        delimitadoresRunScripts(p.scripts);
+    }
+    delimitadoresRunHooks('onUpdateHook');
+    if (mathjax) {
+        MathJax.typesetPromise([sections]).then(() => delimitadoresRunHooks('onShownHook'));
+    } else {
+        delimitadoresRunHooks('onShownHook');
+    }
+    return performance.now() - start;
+}
+</script>
+"""
+
+MAX_DEBOUNCE_MS = 300
+# Renderizações mais rápidas que isso não atrasam a próxima atualização
+FAST_RENDER_MS = 8
+
+
+class PreviewPage:
+    """
+    Mantém a página da pré-visualização carregada e aplica as atualizações
+    por JavaScript. Também mede o tempo de cada renderização (Python + página)
+    para ajustar a espera entre atualizações: modelos pesados são atualizados
+    com menos frequência enquanto se digita.
+    """
+
+    def __init__(self, web, context, scripts):
+        self.web = web
+        self.context = context
+        self.scripts = scripts
+        self._loaded = False
+        self._loading = False
+        self._pending = None
+        self._render_ms = 0.0  # Média móvel do tempo de renderização
+        self.web.loadFinished.connect(self._on_load_finished)
+
+    @property
+    def debounce_ms(self):
+        if self._render_ms < FAST_RENDER_MS:
+            return 0
+        return min(MAX_DEBOUNCE_MS, int(self._render_ms * 2))
+
+    def _ensure_loaded(self):
+        if self._loaded or self._loading:
+            return
+        self._loading = True
+        self.web.stdHtml(PREVIEW_BODY, css=["css/reviewer.css"], js=self.scripts, context=self.context)
+
+    def _on_load_finished(self, ok):
+        if not self._loading:
+            return
+        self._loading = False
+        self._loaded = ok
+        if ok and self._pending is not None:
+            payload, started = self._pending
+            self._pending = None
+            self._push(payload, started)
+
+    def _push(self, payload, started):
+        if not self._loaded:
+            self._pending = (payload, started)
+            self._ensure_loaded()
+            return
+        python_ms = (time.perf_counter() - started) * 1000
+        self.web.evalWithCallback(
+            f"delimitadoresUpdate({json.dumps(payload)})",
+            lambda js_ms: self._record_render(python_ms + (js_ms or 0)),
+        )
+
+    def _record_render(self, ms):
+        self._render_ms = ms if not self._render_ms else self._render_ms * 0.7 + ms * 0.3
+
+    def show_card(self, started, front, back, styles, scripts, body_class, dark, front_label, back_label):
+        """`started` é o time.perf_counter() do início da renderização do card."""
+        self._push({
+            'front': front, 'back': back,
+            'styles': list(styles), 'scripts': [s for s in scripts if s.strip()],
+            'bodyClass': body_class, 'dark': dark,
+            'frontLabel': front_label, 'backLabel': back_label,
+        }, started)
+
+    def show_message(self, message_html, dark=False):
+        self._push({'message': message_html, 'dark': dark}, time.perf_counter())
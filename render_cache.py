@@ -0,0 +1,102 @@
+# render_cache.py
+#
+# Cache LRU dos cards já renderizados, compartilhado pela pré-visualização,
+# pelo visualizador de cards e pela exportação para HTML. A chave é o tipo
+# de nota (id e data de modificação), a nota (id e etiquetas), o template,
+# o conteúdo dos campos e o tema, então voltar a uma linha já vista não
+# renderiza o card de novo.
+
+import re
+import threading
+from collections import OrderedDict
+from aqt import mw, gui_hooks
+from aqt.theme import theme_manager
+
+MAX_ENTRIES = 256
+
+SCRIPT_PATTERN = re.compile(r"<script[^>]*>(.*?)</script>", re.DOTALL | re.IGNORECASE)
+STYLE_PATTERN = re.compile(r"<style[^>]*>(.*?)</style>", re.DOTALL | re.IGNORECASE)
+
+
+class CardRender:
+    """Frente e verso prontos para exibição, sem <style>/<script> embutidos."""
+    __slots__ = ('question', 'answer', 'styles', 'scripts', 'body_class')
+
+    def __init__(self, question, answer, styles, scripts, body_class):
+        self.question = question
+        self.answer = answer
+        self.styles = styles
+        self.scripts = scripts
+        self.body_class = body_class
+
+
+def render_for_display(note, dark):
+    """Renderiza o primeiro card de `note` como no editor de templates do Anki."""
+    card = note.ephemeral_card()
+
+    question_html = mw.prepare_card_text_for_display(card.question())
+    answer_html = mw.prepare_card_text_for_display(card.answer())
+
+    # dict mantém a ordem em que estilos e scripts aparecem no card
+    styles = tuple(dict.fromkeys(STYLE_PATTERN.findall(question_html) + STYLE_PATTERN.findall(answer_html)))
+    scripts = tuple(dict.fromkeys(SCRIPT_PATTERN.findall(question_html) + SCRIPT_PATTERN.findall(answer_html)))
+
+    question_html = SCRIPT_PATTERN.sub("", STYLE_PATTERN.sub("", question_html))
+    answer_html = SCRIPT_PATTERN.sub("", STYLE_PATTERN.sub("", answer_html))
+
+    question_html = gui_hooks.card_will_show(question_html, card, "clayoutQuestion")
+    answer_html = gui_hooks.card_will_show(answer_html, card, "clayoutAnswer")
+
+    body_class = theme_manager.body_classes_for_card_ord(card.ord, dark)
+    return CardRender(question_html, answer_html, styles, scripts, body_class)
+
+
+class RenderCache:
+    """
+    LRU limitado a `max_entries` resultados. Pode ser usado da thread de
+    fundo (exportação) e da thread principal ao mesmo tempo.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(note, variant, ord=0, dark=False):
+        model = note.note_type()
+        # id e etiquetas entram porque templates podem usar {{Tags}}, {{Deck}} e afins.
+        # Os campos entram inteiros (não só o hash): o dict compara por igualdade.
+        return (model['id'], model['mod'], note.id, tuple(note.tags), ord,
+                tuple(note.fields), dark, variant)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def get(self, note, variant, render, ord=0, dark=False):
+        """Retorna o resultado guardado ou chama render(note) e guarda."""
+        key = self.key(note, variant, ord, dark)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                return value
+        value = render(note)
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def get_display(self, note, dark):
+        return self.get(note, 'display', lambda n: render_for_display(n, dark), dark=dark)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Instância única: o visualizador e a exportação aproveitam o que a
+# pré-visualização já renderizou, e vice-versa.
+render_cache = RenderCache()
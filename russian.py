@@ -182,6 +182,7 @@ TRANSLATIONS = {
     "Salvar como HTML": "Сохранить как HTML",
     "Impressão": "Печать",
     "Nenhum card para visualizar.": "Нет карточек для просмотра.",
+    "Card {}": "Карточка {}",
     "Conteúdo copiado para a área de transferência!": "Содержимое скопировано в буфер обмена!",
     "Salvar Arquivo HTML": "Сохранить HTML-файл",
     "Arquivo HTML salvo em: {}": "HTML-файл сохранен в: {}",
@@ -200,4 +201,82 @@ TRANSLATIONS = {
     "beginner_instructions_line2": "<b>2. Отделяйте лицевую сторону от оборотной точкой с запятой ( ; ).</b>",
     "beginner_instructions_example_title": "Пример:",
     "beginner_instructions_example_text": "столица России ; Москва",
+
+    # Importação de arquivo
+    "Importar Arquivo...": "Импорт Файла...",
+    "Importar Arquivo": "Импорт Файла",
+    "Importar arquivo": "Импорт файла",
+    "Importa um arquivo de texto grande direto para o deck, sem carregá-lo no editor": "Импортирует большой текстовый файл прямо в колоду, не загружая его в редактор",
+    "Importando arquivo...": "Импорт файла...",
+    "Importando: {} cards - restante {}": "Импорт: {} карточек - осталось {}",
+    "Erro ao importar o arquivo: {}": "Ошибка при импорте файла: {}",
+    "Importação cancelada. {} cards adicionados.": "Импорт отменён. Добавлено карточек: {}.",
+    "{} cards importados em {:.1f}s.": "Импортировано карточек: {} за {:.1f} с.",
+
+    # Adicionar cards em lotes
+    "Adicionar Cards": "Добавить Карточки",
+    "Adicionando cards...": "Добавление карточек...",
+    "Adicionando cards... {}/{}": "Добавление карточек... {}/{}",
+    "Erro ao adicionar cards: {}": "Ошибка при добавлении карточек: {}",
+    "Linhas não adicionadas (erro ao criar a nota): {}": "Строки не добавлены (ошибка при создании заметки): {}",
+    "{} linha(s) do arquivo não importada(s) por erro ao criar a nota.": "{} строк(и) файла не импортировано из-за ошибки при создании заметки.",
+    "Operação cancelada. {} cards adicionados.": "Операция отменена. Добавлено карточек: {}.",
+
+    # Operações em segundo plano
+    "Carregando cards do deck...": "Загрузка карточек колоды...",
+    "Calculando estatísticas...": "Подсчёт статистики...",
+    "Cancelar": "Отмена",
+    "Cancelando...": "Отмена...",
+    "Aguarde o fim da operação em andamento: {}": "Дождитесь завершения текущей операции: {}",
+    "Ocorreu um erro: {}": "Произошла ошибка: {}",
+
+    # Duplicatas
+    "Verificando duplicatas...": "Проверка дубликатов...",
+    "Duplicatas encontradas": "Найдены дубликаты",
+    "{} linha(s) já existem neste deck (marcadas na numeração). O que deseja fazer?": "{} строк(а) уже есть в этой колоде (отмечены в нумерации). Что сделать?",
+    "Pular duplicatas": "Пропустить дубликаты",
+    "Adicionar mesmo assim": "Всё равно добавить",
+    "Atualizar existentes": "Обновить существующие",
+    "{} cards adicionados e {} atualizados.": "Добавлено карточек: {}, обновлено: {}.",
+
+    # Visualizador de cards
+    "Erro ao renderizar card {}:": "Ошибка при отображении карточки {}:",
+
+    # Exportação retomável
+    "Existe uma exportação interrompida destes cards ({} de {}). Deseja continuar de onde parou?": "Есть прерванный экспорт этих карточек ({} из {}). Продолжить с места остановки?",
+    "Exportação interrompida. Ela pode ser continuada na próxima vez que você exportar estes cards.": "Экспорт прерван. Его можно будет продолжить при следующем экспорте этих карточек.",
+
+    # Exportação ZIP
+    "Exportar ZIP": "Экспорт в ZIP",
+    "Exportar cards para um ZIP com HTML, pasta de mídia e MathJax, para uso offline": "Экспортировать карточки в ZIP с HTML, папкой медиа и MathJax для работы офлайн",
+    "Copiando mídia...": "Копирование медиа...",
+    "Exportação cancelada.": "Экспорт отменён.",
+
+    # Paginação
+    "Página": "Страница",
+    "de {}": "из {}",
+
+    # Ordenar por estatísticas de revisão
+    "Organizar os cards mostrados por uma estatística de revisão": "Упорядочить показанные карточки по статистике повторений",
+    "Lapsos": "Забывания",
+    "Revisões": "Повторения",
+    "Intervalo": "Интервал",
+    "Facilidade": "Лёгкость",
+    "Vencimento": "Срок",
+    "Última Revisão": "Последнее Повторение",
+
+    # Modo de edição
+    "Salvando edições...": "Сохранение изменений...",
+    "{} card(s) atualizado(s)!": "Обновлено карточек: {}!",
+    "Alterações pendentes: {}": "Несохранённые изменения: {}",
+    "{} nota(s) foram alteradas ou excluídas fora deste editor depois de mostradas e não foram sobrescritas (linhas: {}). Use 'Mostrar' novamente para carregar a versão atual.": "{} заметок было изменено или удалено вне этого редактора после показа и не было перезаписано (строки: {}). Снова используйте «Показать», чтобы загрузить текущую версию.",
+
+    # Índice de mídia
+    "Indexando mídia...": "Индексация медиа...",
+
+    # Cópia de mídia
+    "Copiando mídia ({}/{})...": "Копирование медиа ({}/{})...",
+    "Não foi possível copiar: {}": "Не удалось скопировать: {}",
+    "[copiando {}: {}]": "[копирование {}: {}]",
+    "Ocorreu um erro ao copiar a mídia: {}": "Ошибка при копировании медиа: {}",
 }
\ No newline at end of file
@@ -182,6 +182,7 @@ TRANSLATIONS = {
     "Salvar como HTML": "Guardar como HTML",
     "Impressão": "Imprimir",
     "Nenhum card para visualizar.": "No hay tarjetas para visualizar.",
+    "Card {}": "Tarjeta {}",
     "Conteúdo copiado para a área de transferência!": "¡Contenido copiado al portapapeles!",
     "Salvar Arquivo HTML": "Guardar Archivo HTML",
     "Arquivo HTML salvo em: {}": "Archivo HTML guardado en: {}",
@@ -200,4 +201,82 @@ TRANSLATIONS = {
     "beginner_instructions_line2": "<b>2. Separa el anverso del reverso con un punto y coma ( ; ).</b>",
     "beginner_instructions_example_title": "Ejemplo:",
     "beginner_instructions_example_text": "capital de España ; Madrid",
+
+    # Importação de arquivo
+    "Importar Arquivo...": "Importar Archivo...",
+    "Importar Arquivo": "Importar Archivo",
+    "Importar arquivo": "Importar archivo",
+    "Importa um arquivo de texto grande direto para o deck, sem carregá-lo no editor": "Importa un archivo de texto grande directamente al mazo, sin cargarlo en el editor",
+    "Importando arquivo...": "Importando archivo...",
+    "Importando: {} cards - restante {}": "Importando: {} tarjetas - quedan {}",
+    "Erro ao importar o arquivo: {}": "Error al importar el archivo: {}",
+    "Importação cancelada. {} cards adicionados.": "Importación cancelada. {} tarjetas añadidas.",
+    "{} cards importados em {:.1f}s.": "{} tarjetas importadas en {:.1f}s.",
+
+    # Adicionar cards em lotes
+    "Adicionar Cards": "Añadir Tarjetas",
+    "Adicionando cards...": "Añadiendo tarjetas...",
+    "Adicionando cards... {}/{}": "Añadiendo tarjetas... {}/{}",
+    "Erro ao adicionar cards: {}": "Error al añadir tarjetas: {}",
+    "Linhas não adicionadas (erro ao criar a nota): {}": "Líneas no añadidas (error al crear la nota): {}",
+    "{} linha(s) do arquivo não importada(s) por erro ao criar a nota.": "{} línea(s) del archivo no importada(s) por un error al crear la nota.",
+    "Operação cancelada. {} cards adicionados.": "Operación cancelada. {} tarjetas añadidas.",
+
+    # Operações em segundo plano
+    "Carregando cards do deck...": "Cargando tarjetas del mazo...",
+    "Calculando estatísticas...": "Calculando estadísticas...",
+    "Cancelar": "Cancelar",
+    "Cancelando...": "Cancelando...",
+    "Aguarde o fim da operação em andamento: {}": "Espere a que termine la operación en curso: {}",
+    "Ocorreu um erro: {}": "Ocurrió un error: {}",
+
+    # Duplicatas
+    "Verificando duplicatas...": "Buscando duplicados...",
+    "Duplicatas encontradas": "Duplicados encontrados",
+    "{} linha(s) já existem neste deck (marcadas na numeração). O que deseja fazer?": "{} línea(s) ya existen en este mazo (marcadas en la numeración). ¿Qué desea hacer?",
+    "Pular duplicatas": "Omitir duplicados",
+    "Adicionar mesmo assim": "Añadir de todos modos",
+    "Atualizar existentes": "Actualizar existentes",
+    "{} cards adicionados e {} atualizados.": "{} tarjetas añadidas y {} actualizadas.",
+
+    # Visualizador de cards
+    "Erro ao renderizar card {}:": "Error al renderizar la tarjeta {}:",
+
+    # Exportação retomável
+    "Existe uma exportação interrompida destes cards ({} de {}). Deseja continuar de onde parou?": "Hay una exportación interrumpida de estas tarjetas ({} de {}). ¿Desea continuar donde se detuvo?",
+    "Exportação interrompida. Ela pode ser continuada na próxima vez que você exportar estes cards.": "Exportación interrumpida. Podrá continuarse la próxima vez que exporte estas tarjetas.",
+
+    # Exportação ZIP
+    "Exportar ZIP": "Exportar ZIP",
+    "Exportar cards para um ZIP com HTML, pasta de mídia e MathJax, para uso offline": "Exportar tarjetas a un ZIP con HTML, carpeta de medios y MathJax, para uso sin conexión",
+    "Copiando mídia...": "Copiando medios...",
+    "Exportação cancelada.": "Exportación cancelada.",
+
+    # Paginação
+    "Página": "Página",
+    "de {}": "de {}",
+
+    # Ordenar por estatísticas de revisão
+    "Organizar os cards mostrados por uma estatística de revisão": "Ordenar las tarjetas mostradas por una estadística de repaso",
+    "Lapsos": "Lapsos",
+    "Revisões": "Repasos",
+    "Intervalo": "Intervalo",
+    "Facilidade": "Facilidad",
+    "Vencimento": "Vencimiento",
+    "Última Revisão": "Último Repaso",
+
+    # Modo de edição
+    "Salvando edições...": "Guardando ediciones...",
+    "{} card(s) atualizado(s)!": "¡{} tarjeta(s) actualizada(s)!",
+    "Alterações pendentes: {}": "Cambios pendientes: {}",
+    "{} nota(s) foram alteradas ou excluídas fora deste editor depois de mostradas e não foram sobrescritas (linhas: {}). Use 'Mostrar' novamente para carregar a versão atual.": "{} nota(s) se modificaron o eliminaron fuera de este editor después de mostrarse y no se sobrescribieron (líneas: {}). Use 'Mostrar' de nuevo para cargar la versión actual.",
+
+    # Índice de mídia
+    "Indexando mídia...": "Indexando medios...",
+
+    # Cópia de mídia
+    "Copiando mídia ({}/{})...": "Copiando medios ({}/{})...",
+    "Não foi possível copiar: {}": "No se pudo copiar: {}",
+    "[copiando {}: {}]": "[copiando {}: {}]",
+    "Ocorreu um erro ao copiar a mídia: {}": "Ocurrió un error al copiar los medios: {}",
 }
\ No newline at end of file
@@ -0,0 +1,117 @@
+# tokenizer.py
+
+import re
+
+# Delimitador usado quando nenhuma caixa de delimitador está marcada
+DEFAULT_DELIMITER = ';'
+
+
+class DelimiterTokenizer:
+    """
+    Divide linhas de cards nos delimitadores ativos, ignorando delimitadores
+    que estejam dentro de tags HTML (ex.: o ';' de style="color:red;").
+
+    O tokenizador é compilado uma única vez para um conjunto de delimitadores
+    e pode ser reutilizado em todas as linhas. Aceita delimitadores de vários
+    caracteres (" :: ", "->") e vários delimitadores ativos ao mesmo tempo.
+    """
+
+    def __init__(self, delimiters=None):
+        delimiters = [d for d in (delimiters or []) if d]
+        if not delimiters:
+            delimiters = [DEFAULT_DELIMITER]
+        # Remove repetidos mantendo a ordem; o mais longo primeiro para que
+        # " :: " tenha prioridade sobre ":" na alternância da regex.
+        self.delimiters = tuple(dict.fromkeys(delimiters))
+        ordered = sorted(self.delimiters, key=len, reverse=True)
+        alternation = '|'.join(re.escape(d) for d in ordered)
+        self._single = self.delimiters[0] if len(self.delimiters) == 1 else None
+        self._delimiter_re = re.compile(alternation)
+        # Linha só com texto e tags bem formadas (cada '<' fechado por um '>'
+        # antes do próximo '<', nenhum '>' solto). Nela, um delimitador está
+        # dentro de uma tag exatamente quando o próximo '<' ou '>' é um '>'.
+        self._well_formed_re = re.compile(r'[^<>]*(?:<[^<>]*>[^<>]*)*')
+        self._outside_tag_re = re.compile('(?:' + alternation + r')(?![^<>]*>)')
+        # Linhas com '<', como no parser antigo (caractere por caractere): uma
+        # tag vai do '<' até o primeiro '>' ou até o fim da linha, e o
+        # delimitador dentro dela é ignorado. Vale enquanto não houver '<'
+        # dentro de uma tag aberta; com '<' aninhados, o nível de tag é
+        # contado sinal a sinal.
+        self._tag_or_delimiter_re = re.compile(r'<[^>]*(?:>|$)|(' + alternation + ')')
+        self._nested_tag_re = re.compile(r'<[^>]*<')
+        self._tag_sign_or_delimiter_re = re.compile('(' + alternation + ')|[<>]')
+
+    def has_delimiter(self, line: str) -> bool:
+        """Retorna True se a linha contém algum dos delimitadores (fora ou dentro de tags)."""
+        if self._single is not None:
+            return self._single in line
+        return self._delimiter_re.search(line) is not None
+
+    def spans(self, line: str) -> list[tuple[int, int]]:
+        """
+        Retorna os intervalos (início, fim) de cada parte da linha, sem copiar
+        o texto. Os intervalos não são aparados (strip).
+        """
+        if not self.has_delimiter(line):
+            return [(0, len(line))]
+
+        spans = []
+        start = 0
+        if '<' not in line:
+            if self._single is not None:
+                step = len(self._single)
+                find = line.find
+                pos = find(self._single)
+                while pos != -1:
+                    spans.append((start, pos))
+                    start = pos + step
+                    pos = find(self._single, start)
+            else:
+                for match in self._delimiter_re.finditer(line):
+                    spans.append((start, match.start()))
+                    start = match.end()
+        elif self._well_formed_re.fullmatch(line):
+            for match in self._outside_tag_re.finditer(line):
+                spans.append((start, match.start()))
+                start = match.end()
+        elif self._nested_tag_re.search(line) is None:
+            # '>' soltos ou '<' sem fechamento, sem '<' dentro de tag aberta
+            for match in self._tag_or_delimiter_re.finditer(line):
+                if match.group(1) is None:
+                    continue  # É uma tag HTML, o delimitador dentro dela é ignorado
+                spans.append((start, match.start()))
+                start = match.end()
+        else:
+            # O nível sobe a cada '<' e desce a cada '>', nunca abaixo de zero
+            level = 0
+            for match in self._tag_sign_or_delimiter_re.finditer(line):
+                token = match.group(1)
+                if token is None:
+                    level = level + 1 if match.group(0) == '<' else max(0, level - 1)
+                elif level == 0:
+                    spans.append((start, match.start()))
+                    start = match.end()
+                else:
+                    # Dentro de uma tag o delimitador é texto (ex.: o '>' de "->" fecha a tag)
+                    for char in token:
+                        if char == '<':
+                            level += 1
+                        elif char == '>':
+                            level = max(0, level - 1)
+        spans.append((start, len(line)))
+        return spans
+
+    def split(self, line: str) -> list[str]:
+        """
+        Divide a linha em partes aparadas. Se a linha não tiver delimitador,
+        ela é retornada intacta numa lista de um elemento.
+        """
+        if not self.has_delimiter(line):
+            return [line]
+        if '<' not in line:
+            if self._single is not None:
+                return [part.strip() for part in line.split(self._single)]
+            return [part.strip() for part in self._delimiter_re.split(line)]
+        if self._well_formed_re.fullmatch(line):
+            return [part.strip() for part in self._outside_tag_re.split(line)]
+        return [line[a:b].strip() for a, b in self.spans(line)]
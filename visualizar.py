@@ -1,16 +1,16 @@
 # visualizar.py - CORREÇÃO DEFINITIVA COM SCROLL FORÇADO
 
-import os
-import re
-import base64
 import html
-import json
-from aqt import mw, gui_hooks
+import time
+from collections import OrderedDict
+from aqt import mw
 from aqt.qt import *
 from aqt.utils import showWarning
 from aqt.webview import AnkiWebView
 from aqt.theme import theme_manager
-from anki.utils import pointVersion
+from anki.utils import pointVersion, strip_html
+from .render_cache import render_cache
+from .preview_page import PreviewPage
 
 class ForceLabelButton(QPushButton):
     def __init__(self, text, text_color=Qt.GlobalColor.black, parent=None):
@@ -28,12 +28,55 @@ class ForceLabelButton(QPushButton):
         painter.setFont(font)
         painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, self.forced_text)
 
+# Memória máxima (aproximada, em caracteres de HTML) dos cards renderizados
+# mantidos pelo visualizador; os menos usados são descartados primeiro.
+MAX_RENDERED_CHARS = 16 * 1024 * 1024
+# Cards vizinhos ao selecionado renderizados com antecedência
+PREFETCH_RADIUS = 3
+SUMMARY_LENGTH = 80
+
+
+class CardListModel(QAbstractListModel):
+    """
+    Lista dos cards do visualizador. Guarda só as linhas de texto; o resumo
+    exibido (primeiro campo sem HTML) é calculado quando a linha aparece na
+    tela, e o card em si só é renderizado quando é selecionado.
+    """
+
+    def __init__(self, lines, tokenizer, translator, parent=None):
+        super().__init__(parent)
+        self.lines = lines
+        self.tokenizer = tokenizer
+        self._t = translator
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.lines)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            first_part = self.tokenizer.split(self.lines[index.row()])[0]
+            summary = " ".join(strip_html(first_part).split())[:SUMMARY_LENGTH]
+            return f"{index.row() + 1}. {summary}"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self._t("Card {}").format(index.row() + 1)
+        return None
+
+
 class VisualizarCards(QDialog):
     def __init__(self, parent, translator):
         super().__init__(None, Qt.WindowType.Window | Qt.WindowType.WindowMinimizeButtonHint | Qt.WindowType.WindowCloseButtonHint | Qt.WindowType.WindowMaximizeButtonHint)
         self.parent = parent
         self._t = translator
-        self.cards_data = []
+        self.lines = []
+        self.model = None
+        self.note_type = None
+        self.mapper = None
+        # Cards já renderizados: índice -> CardRender ou mensagem de erro (LRU)
+        self._rendered = OrderedDict()
+        self._rendered_chars = 0
+        self._prefetch_queue = []
         self.cards_visible = True
         self.setup_ui()
         self.load_and_display_cards()
@@ -66,8 +109,9 @@ class VisualizarCards(QDialog):
         
         self.splitter = QSplitter(Qt.Orientation.Horizontal)
         
-        self.card_list_widget = QListWidget()
-        self.card_list_widget.currentItemChanged.connect(self.update_card_preview)
+        # QListView com itens de altura fixa só consulta as linhas visíveis
+        self.card_list_widget = QListView()
+        self.card_list_widget.setUniformItemSizes(True)
         self.card_list_widget.setMaximumWidth(200)
         self.card_list_widget.setMinimumWidth(100)
         self.splitter.addWidget(self.card_list_widget)
@@ -75,6 +119,11 @@ class VisualizarCards(QDialog):
         self.card_preview_webview = AnkiWebView(self)
         self.card_preview_webview.setMinimumWidth(300)
         self.splitter.addWidget(self.card_preview_webview)
+        self.preview_page = PreviewPage(self.card_preview_webview, self, self._get_reviewer_scripts())
+
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.timeout.connect(self._prefetch_next)
         
         self.splitter.setSizes([200, 600])
         main_layout.addWidget(self.splitter)
@@ -95,94 +144,6 @@ class VisualizarCards(QDialog):
     def zoom_out(self):
         self.card_preview_webview.setZoomFactor(max(0.1, self.card_preview_webview.zoomFactor() - 0.1))
 
-    def generate_card_data(self):
-        self.cards_data.clear()
-        
-        linhas = self.parent.txt_entrada.toPlainText().strip().split('\n')
-        model = mw.col.models.by_name(self.parent.lista_notetypes.currentItem().text())
-        field_mappings = self.parent.field_mappings
-
-        mw.progress.start(label=self._t("Preparando pré-visualização dos cards..."), max=len(linhas))
-
-        for i, linha in enumerate(linhas):
-            mw.progress.update(value=i + 1)
-            linha = linha.strip()
-            if not linha:
-                continue
-            
-            try:
-                note = mw.col.new_note(model)
-                parts = self.parent._get_split_parts(linha)
-                
-                if not field_mappings:
-                    for idx, field_content in enumerate(parts):
-                        if idx < len(note.fields):
-                            note.fields[idx] = field_content.strip()
-                else:
-                    field_names = [f['name'] for f in model['flds']]
-                    for part_idx, field_content in enumerate(parts):
-                        target_field_name = field_mappings.get(str(part_idx))
-                        if target_field_name and target_field_name in field_names:
-                            field_idx = field_names.index(target_field_name)
-                            note.fields[field_idx] = field_content.strip()
-
-                card = note.ephemeral_card()
-                if not card: continue
-
-                question_html = mw.prepare_card_text_for_display(card.question())
-                answer_html = mw.prepare_card_text_for_display(card.answer())
-
-                script_pattern = re.compile(r"<script[^>]*>(.*?)</script>", re.DOTALL | re.IGNORECASE)
-                style_pattern = re.compile(r"<style[^>]*>(.*?)</style>", re.DOTALL | re.IGNORECASE)
-                
-                unique_scripts = set(script_pattern.findall(question_html) + script_pattern.findall(answer_html))
-                unique_styles = set(style_pattern.findall(question_html) + style_pattern.findall(answer_html))
-
-                question_html = script_pattern.sub("", style_pattern.sub("", question_html))
-                answer_html = script_pattern.sub("", style_pattern.sub("", answer_html))
-
-                question_html = gui_hooks.card_will_show(question_html, card, "clayoutQuestion")
-                answer_html = gui_hooks.card_will_show(answer_html, card, "clayoutAnswer")
-
-                body_class = theme_manager.body_classes_for_card_ord(card.ord, theme_manager.night_mode)
-
-                # --- INÍCIO DA CORREÇÃO DEFINITIVA ---
-                # Injetamos um estilo com '!important' para forçar a barra de rolagem,
-                # sobrescrevendo o 'overflow: hidden' do arquivo reviewer.css do Anki.
-                override_style = """
-                <style>
-                    html, body {
-                        overflow-y: auto !important;
-                        height: auto !important;
-                    }
-                </style>
-                """
-
-                final_html = f"""
-                {override_style}
-                <div class="preview-section" style="border: 1px solid #4a4a4a; border-radius: 8px; margin: 10px; overflow: hidden;">
-                    <div class="preview-header" style="background-color: #3a3a3a; padding: 5px 15px; font-weight: bold; border-bottom: 1px solid #4a4a4a;">{self._t("Frente do Cartão (Preview)")}</div>
-                    <div id="preview-front" class="preview-content" style="padding: 15px;">{question_html}</div>
-                </div>
-                <div class="preview-section" style="border: 1px solid #4a4a4a; border-radius: 8px; margin: 10px; overflow: hidden;">
-                    <div class="preview-header" style="background-color: #3a3a3a; padding: 5px 15px; font-weight: bold; border-bottom: 1px solid #4a4a4a;">{self._t("Verso do Cartão (Preview)")}</div>
-                    <div id="preview-back" class="preview-content" style="padding: 15px;">{answer_html}</div>
-                </div>
-                """
-                # --- FIM DA CORREÇÃO ---
-                
-                self.cards_data.append({
-                    "html": f'<div id="qa">{final_html}</div>',
-                    "body_class": body_class,
-                    "scripts": unique_scripts,
-                    "styles": unique_styles,
-                })
-
-            except Exception as e:
-                self.cards_data.append({"error": f"Erro ao renderizar card {i+1}:<br><pre>{html.escape(str(e))}</pre>"})
-        
-        mw.progress.finish()
-
     def load_and_display_cards(self):
         if not self.parent.txt_entrada.toPlainText().strip():
             showWarning(self._t("Digite conteúdo para visualizar!"))
@@ -192,58 +153,79 @@ class VisualizarCards(QDialog):
             showWarning(self._t("Selecione um tipo de nota para visualizar!"))
             self.close()
             return
-            
-        self.generate_card_data()
-        
-        if not self.cards_data:
+
+        self.lines = [linha.strip() for linha in self.parent.txt_entrada.toPlainText().split('\n') if linha.strip()]
+        if not self.lines:
             showWarning(self._t("Nenhum card válido para visualizar!"))
             self.close()
             return
-            
-        self.card_list_widget.clear()
-        self.card_list_widget.addItems([f"Card {i+1}" for i in range(len(self.cards_data))])
-        if self.cards_data:
-            self.card_list_widget.setCurrentRow(0)
-
-    def update_card_preview(self, current, previous):
-        if not current:
-            self.card_preview_webview.setHtml("")
-            return
 
-        index = self.card_list_widget.row(current)
-        if not (0 <= index < len(self.cards_data)):
+        self.note_type = mw.col.models.by_name(self.parent.lista_notetypes.currentItem().text())
+        self.mapper = self.parent._get_mapper(self.note_type)
+        self.model = CardListModel(self.lines, self.mapper.tokenizer, self._t, self)
+        self.card_list_widget.setModel(self.model)
+        self.card_list_widget.selectionModel().currentChanged.connect(self.update_card_preview)
+        self.card_list_widget.setCurrentIndex(self.model.index(0))
+
+    def _render(self, index):
+        """Renderiza (ou reaproveita) o card da linha `index`."""
+        data = self._rendered.get(index)
+        if data is not None:
+            self._rendered.move_to_end(index)
+            return data
+        try:
+            note = mw.col.new_note(self.note_type)
+            note.fields[:] = self.mapper.map_line(self.lines[index])
+            data = render_cache.get_display(note, theme_manager.night_mode)
+        except Exception as e:
+            data = self._t("Erro ao renderizar card {}:").format(index + 1) + f"<br><pre>{html.escape(str(e))}</pre>"
+        self._rendered[index] = data
+        self._rendered_chars += self._rendered_size(data)
+        # Descarta os menos usados até voltar ao limite de memória
+        while self._rendered_chars > MAX_RENDERED_CHARS and len(self._rendered) > 1:
+            _, old = self._rendered.popitem(last=False)
+            self._rendered_chars -= self._rendered_size(old)
+        return data
+
+    @staticmethod
+    def _rendered_size(data):
+        if isinstance(data, str):
+            return len(data)
+        return len(data.question) + len(data.answer) + sum(map(len, data.styles)) + sum(map(len, data.scripts))
+
+    def update_card_preview(self, current, previous=None):
+        if not current.isValid():
+            self.preview_page.show_message("", theme_manager.night_mode)
             return
 
-        data = self.cards_data[index]
-
-        if "error" in data:
-            self.card_preview_webview.setHtml(f"<html><body>{data['error']}</body></html>")
+        index = current.row()
+        if not (0 <= index < len(self.lines)):
             return
 
-        try:
-            self.card_preview_webview.loadFinished.disconnect()
-        except TypeError:
-            pass
-
-        def on_load_finished(ok):
-            if not ok: return
-            self.card_preview_webview.eval(f"document.body.className = '{data['body_class']}';")
-            for style_content in data['styles']:
-                escaped_style = json.dumps(style_content)
-                self.card_preview_webview.eval(f"var style = document.createElement('style'); style.type = 'text/css'; style.innerHTML = {escaped_style}; document.head.appendChild(style);")
-            for script in data['scripts']:
-                if script.strip():
-                    self.card_preview_webview.eval(script)
-            self.card_preview_webview.eval("if (typeof MathJax !== 'undefined') MathJax.typesetPromise();")
-
-        self.card_preview_webview.loadFinished.connect(on_load_finished)
-
-        self.card_preview_webview.stdHtml(
-            data['html'],
-            css=["css/reviewer.css"],
-            js=self._get_reviewer_scripts(),
-            context=self
-        )
+        started = time.perf_counter()
+        data = self._render(index)
+        if isinstance(data, str):
+            self.preview_page.show_message(data, theme_manager.night_mode)
+        else:
+            self.preview_page.show_card(
+                started, data.question, data.answer, data.styles, data.scripts, data.body_class,
+                theme_manager.night_mode, self._t("Frente do Cartão (Preview)"), self._t("Verso do Cartão (Preview)"),
+            )
+
+        # Vizinhos são renderizados depois, um por vez, enquanto a janela está ociosa
+        self._prefetch_queue = [
+            n for offset in range(1, PREFETCH_RADIUS + 1)
+            for n in (index + offset, index - offset)
+            if 0 <= n < len(self.lines) and n not in self._rendered
+        ]
+        self.prefetch_timer.start(100)
+
+    def _prefetch_next(self):
+        if not self._prefetch_queue:
+            return
+        self._render(self._prefetch_queue.pop(0))
+        if self._prefetch_queue:
+            self.prefetch_timer.start(0)
 
     def toggle_cards_visibility(self):
         self.cards_visible = not self.cards_visible